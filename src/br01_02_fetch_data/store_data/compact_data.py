@@ -0,0 +1,185 @@
+import sqlite3
+import pandas as pd
+
+# Hourly variables that get summarized when raw rows are compacted
+HOURLY_VARIABLES = [
+    'temperature_2m_C',
+    'relative_humidity_2m_percent',
+    'precipitation_mm',
+    'wind_speed_10m_kmh',
+    'wind_direction_10m_deg',
+    'wind_gusts_10m_kmh'
+]
+
+SUMMARY_TABLE = 'hourly_daily_summary'
+PROFILE_TABLE = 'hourly_diurnal_profile'
+
+
+def _table_exists(conn, table_name):
+    """
+    Check whether a table exists in the SQLite database.
+
+    :param conn: SQLite connection object.
+    :param table_name: Name of the table to look up.
+    :return: True if the table exists, False otherwise.
+    """
+    query = "SELECT name FROM sqlite_master WHERE type='table' AND name=?"
+    return conn.execute(query, (table_name,)).fetchone() is not None
+
+
+def summarize_hourly_days(hourly_df, variables=HOURLY_VARIABLES):
+    """
+    Summarize hourly rows into one row per day with min/max/mean/std/count per variable.
+
+    The std is the sample std (ddof=1) so it can be recombined with raw rows exactly
+    the way pandas computes it.
+
+    :param hourly_df: Hourly DataFrame indexed by timestamp.
+    :param variables: Hourly columns to summarize.
+    :return: DataFrame indexed by day with '<variable>_<stat>' columns.
+    """
+    grouped = hourly_df[variables].groupby(hourly_df.index.floor('D'))
+    stats = grouped.agg(['min', 'max', 'mean', 'std', 'count'])
+    stats.columns = [f"{variable}_{stat}" for variable, stat in stats.columns]
+    stats.index.name = 'date'
+    return stats
+
+
+def diurnal_profiles(hourly_df, variables=HOURLY_VARIABLES):
+    """
+    Build the 24-point diurnal profile (mean by hour of day) for every month in the data.
+
+    :param hourly_df: Hourly DataFrame indexed by timestamp.
+    :param variables: Hourly columns to profile.
+    :return: DataFrame with 'month', 'hour', 'count' and one mean column per variable.
+    """
+    # First day of the month, keeping the timezone of the index
+    month = hourly_df.index.normalize() - pd.to_timedelta(hourly_df.index.day - 1, unit='D')
+    grouped = hourly_df[variables].groupby([month, hourly_df.index.hour])
+    profile = grouped.mean()
+    profile['count'] = grouped.size()
+    profile.index.names = ['month', 'hour']
+    return profile.reset_index()
+
+
+def _merge_profiles(old, new, variables):
+    """
+    Merge two diurnal profile frames, weighting the hourly means by their counts.
+
+    :param old: Previously stored profile rows.
+    :param new: Freshly computed profile rows.
+    :param variables: Profiled variable columns.
+    :return: Combined profile with one row per (month, hour).
+    """
+    combined = pd.concat([old, new], ignore_index=True)
+    for variable in variables:
+        combined[variable] = combined[variable] * combined['count']
+    merged = combined.groupby(['month', 'hour'], as_index=False)[variables + ['count']].sum()
+    for variable in variables:
+        merged[variable] = merged[variable] / merged['count']
+    return merged
+
+
+def load_hourly_summary(conn):
+    """
+    Load the compacted daily summary tier of the hourly data.
+
+    :param conn: SQLite connection object.
+    :return: DataFrame indexed by day, or None if nothing has been compacted yet.
+    """
+    if not _table_exists(conn, SUMMARY_TABLE):
+        return None
+    summary = pd.read_sql(f"SELECT * FROM {SUMMARY_TABLE}", conn)
+    summary['date'] = pd.to_datetime(summary['date'])
+    return summary.set_index('date').sort_index()
+
+
+def compact_hourly_history(conn, keep_days=365, now=None, table_name='hourly_data',
+                           variables=HOURLY_VARIABLES, vacuum=False):
+    """
+    Replace raw hourly rows older than the retention window by compact daily summaries.
+
+    Raw rows from whole days before ``now - keep_days`` are summarized into the
+    daily summary table (min/max/mean/std/count per variable) and into monthly
+    24-point diurnal profiles, then deleted from the raw table, all in one transaction.
+    The summary is keyed on date: days that are already summarized (e.g. raw history
+    restored by a full refetch) are deleted from the raw table without being summarized
+    again, so running the job repeatedly never duplicates a day.
+
+    :param conn: SQLite connection object.
+    :param keep_days: Number of most recent days kept as raw hourly rows.
+    :param now: Reference timestamp for the retention window (defaults to the latest raw row).
+    :param table_name: Name of the raw hourly table.
+    :param variables: Hourly columns to summarize.
+    :param vacuum: Run VACUUM afterwards so the database file actually shrinks.
+    :return: Dict with the number of compacted rows and written summary days.
+    """
+    raw = pd.read_sql(f"SELECT rowid AS raw_rowid, * FROM {table_name}", conn)
+    if raw.empty:
+        return {'compacted_rows': 0, 'summary_days': 0}
+
+    raw['date'] = pd.to_datetime(raw['date'])
+    now = raw['date'].max() if now is None else pd.Timestamp(now)
+    if now.tzinfo is None and raw['date'].dt.tz is not None:
+        now = now.tz_localize(raw['date'].dt.tz)
+    cutoff = now.floor('D') - pd.Timedelta(days=keep_days)
+
+    old = raw[raw['date'] < cutoff]
+    if old.empty:
+        return {'compacted_rows': 0, 'summary_days': 0}
+    old = old.set_index('date')
+
+    # Days summarized by an earlier run (e.g. restored by a full refetch) are only deleted, not summarized twice
+    stored_summary = load_hourly_summary(conn)
+    summarized = stored_summary.index if stored_summary is not None else pd.DatetimeIndex([])
+    new_rows = old[~old.index.floor('D').isin(summarized)]
+
+    summary = summarize_hourly_days(new_rows, variables)
+    profile = diurnal_profiles(new_rows, variables)
+    if _table_exists(conn, PROFILE_TABLE):
+        stored = pd.read_sql(f"SELECT * FROM {PROFILE_TABLE}", conn, parse_dates=['month'])
+        profile = _merge_profiles(stored, profile, variables) if not new_rows.empty else stored
+
+    # Summary upsert, profile rewrite and raw delete are one transaction, so a failure leaves no day
+    # both summarized and raw
+    summary_columns = [f"{variable}_{stat}" for variable in variables for stat in ['min', 'max', 'mean', 'std', 'count']]
+    profile_columns = ['month', 'hour'] + variables + ['count']
+    with conn:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} "
+                     f"(date TIMESTAMP, {', '.join(f'{column} REAL' for column in summary_columns)})")
+        # Tables written by earlier versions have no key on date: drop duplicate days before adding it
+        conn.execute(f"DELETE FROM {SUMMARY_TABLE} WHERE rowid NOT IN (SELECT MAX(rowid) FROM {SUMMARY_TABLE} GROUP BY date)")
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{SUMMARY_TABLE}_date ON {SUMMARY_TABLE} (date)")
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {SUMMARY_TABLE} (date, {', '.join(summary_columns)}) "
+            f"VALUES ({', '.join(['?'] * (len(summary_columns) + 1))})",
+            [(str(date), *(None if pd.isna(value) else float(value) for value in row))
+             for date, row in zip(summary.index, summary[summary_columns].itertuples(index=False))])
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {PROFILE_TABLE} "
+                     f"(month TIMESTAMP, hour INTEGER, {', '.join(f'{variable} REAL' for variable in variables)}, count INTEGER)")
+        conn.execute(f"DELETE FROM {PROFILE_TABLE}")
+        conn.executemany(
+            f"INSERT INTO {PROFILE_TABLE} ({', '.join(profile_columns)}) VALUES ({', '.join(['?'] * len(profile_columns))})",
+            [(str(row[0]), int(row[1]), *(None if pd.isna(value) else float(value) for value in row[2:-1]), int(row[-1]))
+             for row in profile[profile_columns].itertuples(index=False)])
+        conn.executemany(f"DELETE FROM {table_name} WHERE rowid = ?",
+                         ((int(rowid),) for rowid in old['raw_rowid']))
+
+    if vacuum:
+        conn.execute("VACUUM")
+
+    return {'compacted_rows': len(old), 'summary_days': len(summary)}
+
+
+def main(): # pragma: no cover
+    """
+    *NOT INCLUDED INTO THE TEST COV* | Compact hourly history older than one year in the project database.
+    """
+    conn = sqlite3.connect(r"/workspaces/weather-scraper-analyzer/data/weather_data.db")
+    result = compact_hourly_history(conn, keep_days=365, vacuum=True)
+    print(f"Compacted {result['compacted_rows']} hourly rows into {result['summary_days']} daily summaries.")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main() # pragma: no cover
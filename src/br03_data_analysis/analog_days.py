@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+try:
+    from .seasons import SEASON_NAMES
+except ImportError:
+    from seasons import SEASON_NAMES
+
+# Daily variables used to describe a day (the dominant wind direction is added as sin/cos)
+FEATURE_COLUMNS = [
+    'temperature_2m_max_C',
+    'temperature_2m_min_C',
+    'temperature_2m_mean_C',
+    'precipitation_sum_mm',
+    'wind_speed_10m_max_kmh',
+    'wind_gusts_10m_max_kmh'
+]
+DIRECTION_COLUMN = 'wind_direction_10m_dominant_deg'
+
+
+class AnalogDayIndex:
+    """
+    Nearest-neighbour index answering "which past days looked like this one?".
+
+    Every day is turned into a standardized feature vector (temperatures, precipitation,
+    wind speed and gusts, plus the dominant wind direction encoded as sin/cos so 350° and 10°
+    are close). Vectors are stored in one KD-tree per (location, season) partition, so a
+    query limited to a season or a location only searches the matching trees.
+
+    New days go into a small per-partition buffer that is searched by brute force; the
+    partition tree is rebuilt once the buffer grows past `rebuild_threshold`, which keeps
+    ingestion incremental without degrading queries.
+
+    Attributes:
+        location_column (str): Column holding the location name (optional in the data).
+        rebuild_threshold (int): Buffered days per partition before its tree is rebuilt.
+        feature_mean (ndarray): Means used for standardization (fixed at build time).
+        feature_std (ndarray): Standard deviations used for standardization (fixed at build time).
+    """
+
+    def __init__(self, daily_data, location_column='location', rebuild_threshold=256):
+        """
+        Builds the index from daily weather data.
+
+        Args:
+            daily_data (DataFrame): Daily weather data indexed by date.
+            location_column (str): Column with the location name; all days share one location if missing.
+            rebuild_threshold (int): Buffered days per partition before its tree is rebuilt.
+        """
+        self.location_column = location_column
+        self.rebuild_threshold = rebuild_threshold
+        self.partitions = {}
+        self.vectors = {}
+        self.timezone = getattr(daily_data.index, 'tz', None)
+
+        data = daily_data.dropna(subset=FEATURE_COLUMNS + [DIRECTION_COLUMN])
+        raw = data[FEATURE_COLUMNS].to_numpy(dtype=float)
+        self.feature_mean = raw.mean(axis=0)
+        self.feature_std = raw.std(axis=0)
+        self.feature_std[self.feature_std == 0] = 1.0
+
+        for key, dates, vectors in self._partition(data):
+            self.partitions[key] = {
+                'dates': dates,
+                'vectors': vectors,
+                'tree': cKDTree(vectors),
+                'buffer_dates': [],
+                'buffer_vectors': []
+            }
+
+    def _to_vectors(self, data):
+        """
+        Converts daily rows into standardized feature vectors.
+
+        Args:
+            data (DataFrame): Daily rows with the feature columns.
+
+        Returns:
+            ndarray: Matrix of shape (rows, features).
+        """
+        scaled = (data[FEATURE_COLUMNS].to_numpy(dtype=float) - self.feature_mean) / self.feature_std
+        radians = np.deg2rad(data[DIRECTION_COLUMN].to_numpy(dtype=float))
+        return np.column_stack([scaled, np.sin(radians), np.cos(radians)])
+
+    def _partition(self, data):
+        """
+        Splits daily rows into (location, season) partitions and remembers every vector for date lookups.
+
+        Args:
+            data (DataFrame): Daily rows without missing features.
+
+        Yields:
+            tuple: (location, season) key, dates array and vectors matrix of the partition.
+        """
+        if data.empty:
+            return
+        vectors = self._to_vectors(data)
+        locations = data[self.location_column].to_numpy() if self.location_column in data.columns \
+            else np.full(len(data), None)
+        quarters = data.index.quarter.to_numpy()
+        dates = data.index.to_numpy()
+
+        for location, date, vector in zip(locations, dates, vectors):
+            self.vectors[(location, pd.Timestamp(date))] = vector
+
+        # Group rows by (location, quarter) with a sort instead of a Python loop over rows
+        group_codes = pd.factorize(locations, use_na_sentinel=False)[0] * 4 + (quarters - 1)
+        order = np.argsort(group_codes, kind='stable')
+        _, starts = np.unique(group_codes[order], return_index=True)
+        for positions in np.split(order, starts[1:]):
+            first = positions[0]
+            yield (locations[first], SEASON_NAMES[quarters[first]]), dates[positions], vectors[positions]
+
+    def add_days(self, new_days):
+        """
+        Adds newly ingested days to the index without rebuilding everything.
+
+        Args:
+            new_days (DataFrame): Daily weather rows with the same columns as the build data.
+        """
+        data = new_days.dropna(subset=FEATURE_COLUMNS + [DIRECTION_COLUMN])
+        for key, dates, vectors in self._partition(data):
+            partition = self.partitions.get(key)
+            if partition is None:
+                self.partitions[key] = {'dates': dates, 'vectors': vectors, 'tree': cKDTree(vectors),
+                                        'buffer_dates': [], 'buffer_vectors': []}
+                continue
+            partition['buffer_dates'].extend(dates)
+            partition['buffer_vectors'].extend(vectors)
+            if len(partition['buffer_dates']) >= self.rebuild_threshold:
+                partition['dates'] = np.concatenate([partition['dates'], partition['buffer_dates']])
+                partition['vectors'] = np.vstack([partition['vectors'], partition['buffer_vectors']])
+                partition['tree'] = cKDTree(partition['vectors'])
+                partition['buffer_dates'] = []
+                partition['buffer_vectors'] = []
+
+    def query(self, day, k=5, season=None, location=None):
+        """
+        Finds the k historical days most similar to the given weather.
+
+        Args:
+            day (Series or dict): Values for the feature columns and the dominant wind direction.
+            k (int): Number of similar days to return.
+            season (str, optional): Limit the search to one season ('Winter', 'Spring', 'Summer', 'Autumn').
+            location (str, optional): Limit the search to one location.
+
+        Returns:
+            DataFrame: Columns 'date', 'location', 'season' and 'distance', closest first.
+        """
+        vector = self._to_vectors(pd.DataFrame([day]))[0]
+        return self._search(vector, k, season, None if location is None else [location])
+
+    def query_date(self, date, k=5, season=None, reference_location=None, locations=None):
+        """
+        Finds the k historical days most similar to a day that is already in the index.
+
+        The day itself is left out of the results.
+
+        Args:
+            date (str or Timestamp): Date of the reference day.
+            k (int): Number of similar days to return.
+            season (str, optional): Limit the search to one season.
+            reference_location (str, optional): Location of the reference day; required when the index
+                holds more than one location.
+            locations (list, optional): Limit the search to these locations; all by default.
+
+        Returns:
+            DataFrame: Columns 'date', 'location', 'season' and 'distance', closest first.
+        """
+        date = pd.Timestamp(date)
+        if date.tzinfo is None and self.timezone is not None:
+            date = date.tz_localize(self.timezone)
+        if reference_location is None:
+            indexed = {key[0] for key in self.partitions}
+            if len(indexed) > 1:
+                raise ValueError("reference_location is required when the index holds several locations")
+            reference_location = next(iter(indexed), None)
+        vector = self.vectors.get((reference_location, date))
+        if vector is None:
+            raise ValueError(f"No indexed day on {date.date()} for location {reference_location!r}")
+        result = self._search(vector, k + 1, season, locations)
+        same_location = result['location'].isna() if reference_location is None \
+            else result['location'] == reference_location
+        result = result[~((result['date'] == date) & same_location)]
+        return result.head(k).reset_index(drop=True)
+
+    def _search(self, vector, k, season, locations):
+        """
+        Searches the matching partitions (trees and buffers) and merges the k best candidates.
+
+        Args:
+            vector (ndarray): Standardized query vector.
+            k (int): Number of neighbours to return.
+            season (str or None): Season filter.
+            locations (list or None): Location filter.
+
+        Returns:
+            DataFrame: Columns 'date', 'location', 'season' and 'distance', closest first.
+        """
+        distances, dates, keys = [], [], []
+        for key, partition in self.partitions.items():
+            if (locations is not None and key[0] not in locations) or (season is not None and key[1] != season):
+                continue
+            count = min(k, len(partition['dates']))
+            found, positions = partition['tree'].query(vector, k=count)
+            found, positions = np.atleast_1d(found), np.atleast_1d(positions)
+            distances.append(found)
+            dates.append(partition['dates'][positions])
+            keys.extend([key] * len(positions))
+
+            if partition['buffer_dates']:
+                buffered = np.linalg.norm(np.asarray(partition['buffer_vectors']) - vector, axis=1)
+                distances.append(buffered)
+                dates.append(np.asarray(partition['buffer_dates']))
+                keys.extend([key] * len(buffered))
+
+        if not distances:
+            return pd.DataFrame(columns=['date', 'location', 'season', 'distance'])
+
+        distances = np.concatenate(distances)
+        dates = np.concatenate(dates)
+        best = np.argsort(distances, kind='stable')[:k]
+        return pd.DataFrame({
+            'date': pd.to_datetime(dates[best]) if dates.dtype.kind == 'M' else dates[best],
+            'location': [keys[i][0] for i in best],
+            'season': [keys[i][1] for i in best],
+            'distance': distances[best]
+        })
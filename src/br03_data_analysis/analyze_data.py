@@ -1,9 +1,31 @@
 # Importing libraries
 import pandas as pd, sqlite3
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 
+# The stages import this module both as a package module and as a top-level module through sys.path
+try:
+    from .trend_statistics import trend_table
+    from .change_points import detect_regime_shifts
+    from .range_statistics import RangeStatisticsIndex
+    from .calendar_matrix import year_period_matrix
+    from .seasons import SEASON_NAMES
+except ImportError:
+    from trend_statistics import trend_table
+    from change_points import detect_regime_shifts
+    from range_statistics import RangeStatisticsIndex
+    from calendar_matrix import year_period_matrix
+    from seasons import SEASON_NAMES
+
+# The compacted hourly tier is written by the store_data stage
+try:
+    from ..br01_02_fetch_data.store_data.compact_data import load_hourly_summary
+except ImportError:
+    sys.path.append('/workspaces/weather-scraper-analyzer/src/br01_02_fetch_data/store_data')
+    from compact_data import load_hourly_summary
+
 # Setting up the connection to the database        
 conn = sqlite3.connect(r"/workspaces/weather-scraper-analyzer/data/weather_data.db")
 hourly_df = pd.read_sql(r"SELECT * FROM hourly_data", conn)
@@ -26,6 +48,9 @@ daily_df['date'] = pd.to_datetime(daily_df['date'])
 hourly_df = hourly_df.set_index('date')
 daily_df = daily_df.set_index('date')
 
+# Loading the compacted tier of the hourly data (daily summaries of raw hours that fell out of the retention window)
+hourly_summary_df = load_hourly_summary(conn)
+
 
 class WeatherAnalyzer:
     """
@@ -34,22 +59,28 @@ class WeatherAnalyzer:
     Attributes:
         hourly_data (DataFrame): DataFrame containing hourly weather data.
         daily_data (DataFrame): DataFrame containing daily weather data.
+        hourly_summary (DataFrame): Compacted daily summaries of older hourly data ('<variable>_<stat>' columns), or None.
+        range_indexes (dict): Cached range-statistics indexes per data source ('hourly' or 'daily').
         hourly_metrics (dict): Metrics for hourly data, including mean, max, min, and standard deviation.
         daily_metrics (dict): Metrics for daily data, including mean, max, min, and standard deviation.
         timeframe_mapping (dict): Maps descriptive timeframes ('week', 'month', 'season', 'year') to resampling codes.
         season_names (dict): Maps season numbers (1-4) to names ('Winter', 'Spring', etc.).
     """
 
-    def __init__(self, hourly_data, daily_data):
+    def __init__(self, hourly_data=None, daily_data=None, hourly_summary=None):
         """
         Initializes the WeatherAnalyzer with hourly and daily data.
 
         Args:
             hourly_data (DataFrame): Hourly weather data.
             daily_data (DataFrame): Daily weather data.
+            hourly_summary (DataFrame, optional): Compacted tier of the hourly data, one row per day with
+                '<variable>_min/_max/_mean/_std/_count' columns (see store_data/compact_data.py).
         """
         self.hourly_data = hourly_data
         self.daily_data = daily_data
+        self.hourly_summary = hourly_summary
+        self.range_indexes = {}
         # Setting the metrics
         self.hourly_metrics = {
             'temperature_2m_C': ['mean', 'max', 'min', 'std'],
@@ -74,12 +105,7 @@ class WeatherAnalyzer:
             'season': 'QE',
             'year': 'YE'
         }
-        self.season_names = {
-            1: 'Winter', 
-            2: 'Spring', 
-            3: 'Summer', 
-            4: 'Autumn'
-        }
+        self.season_names = SEASON_NAMES
 
     def aggregate_hourly(self, timeframe):
         """
@@ -92,8 +118,68 @@ class WeatherAnalyzer:
             DataFrame: Aggregated hourly data with specified metrics.
         """
         resample_code = self.timeframe_mapping.get(timeframe, timeframe)
+        if self.hourly_summary is not None and not self.hourly_summary.empty:
+            return self._aggregate_hourly_tiers(resample_code)
         return self.hourly_data.resample(resample_code).agg(self.hourly_metrics)
 
+    def _aggregate_hourly_tiers(self, resample_code):
+        """
+        Aggregates raw hourly rows together with the compacted daily summaries.
+
+        Both tiers are reduced to count, sum, sum of squares, min and max per period, which
+        add up exactly, so the result matches aggregating the original raw hours.
+
+        Args:
+            resample_code (str): Pandas resampling code.
+
+        Returns:
+            DataFrame: Aggregated hourly data with the same layout as `aggregate_hourly`.
+        """
+        # Raw rows are authoritative: summarized days that are also raw (e.g. after a full refetch) are skipped
+        summary = self.hourly_summary
+        if self.hourly_data is not None and not self.hourly_data.empty:
+            summary = summary[~summary.index.isin(self.hourly_data.index.floor('D'))]
+        results = {}
+        for parameter, metrics in self.hourly_metrics.items():
+            count = summary[f'{parameter}_count']
+            mean = summary[f'{parameter}_mean']
+            std = summary[f'{parameter}_std'].fillna(0)  # single-hour days have no std
+            summary_stats = pd.DataFrame({
+                'count': count,
+                'sum': count * mean,
+                'sumsq': (count - 1).clip(lower=0) * std ** 2 + count * mean ** 2,
+                'min': summary[f'{parameter}_min'],
+                'max': summary[f'{parameter}_max']
+            })
+
+            tiers = [summary_stats]
+            if self.hourly_data is not None and not self.hourly_data.empty:
+                raw = self.hourly_data[parameter]
+                tiers.append(pd.DataFrame({
+                    'count': raw.notna().astype(int),
+                    'sum': raw,
+                    'sumsq': raw ** 2,
+                    'min': raw,
+                    'max': raw
+                }))
+
+            stats = pd.concat(tiers).sort_index().resample(resample_code).agg(
+                {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'})
+            n = stats['count']
+            period_mean = stats['sum'] / n.where(n > 0)
+            variance = (stats['sumsq'] - n * period_mean ** 2) / (n - 1).where(n > 1)
+            combined = {
+                'mean': period_mean,
+                'max': stats['max'],
+                'min': stats['min'],
+                'std': np.sqrt(variance.clip(lower=0)),
+                'sum': stats['sum'].where(n > 0, 0.0),
+                'count': n
+            }
+            for metric in metrics:
+                results[(parameter, metric)] = combined[metric]
+        return pd.DataFrame(results)
+
     def aggregate_daily(self, timeframe):
         """
         Aggregates daily data based on the specified timeframe.
@@ -107,6 +193,45 @@ class WeatherAnalyzer:
         resample_code = self.timeframe_mapping.get(timeframe, timeframe)
         return self.daily_data.resample(resample_code).agg(self.daily_metrics)
 
+    def trend_statistics(self, period='month', variables=None, alpha=0.05):
+        """
+        Tests whether the yearly means of daily variables show a significant trend.
+
+        Runs the Mann-Kendall test and Sen's slope for every (location x variable x month/season)
+        series at once (see trend_statistics.py), instead of only plotting the means like `plot_trend`.
+
+        Args:
+            period (str): 'month', 'season' or 'year'.
+            variables (list, optional): Daily columns to test; defaults to all daily metrics.
+            alpha (float): Significance level for the 'trend' label.
+
+        Returns:
+            DataFrame: One row per series with Mann-Kendall statistics, p-value, Sen's slope (per year) and trend label.
+        """
+        if variables is None:
+            variables = [column for column in self.daily_metrics if column in self.daily_data.columns]
+        return trend_table(self.daily_data, variables, period=period, alpha=alpha)
+
+    def range_index(self, source='daily'):
+        """
+        Returns the range-statistics index for the hourly or daily data, building it on first use.
+
+        The index answers count/sum/mean/std/min/max for any [start, end) window (or thousands of windows
+        at once) without filtering the frame again, see range_statistics.py.
+
+        Args:
+            source (str): 'daily' or 'hourly'.
+
+        Returns:
+            RangeStatisticsIndex: Index over the metric columns of the chosen data.
+        """
+        if source not in self.range_indexes:
+            data, metrics = (self.daily_data, self.daily_metrics) if source == 'daily' \
+                else (self.hourly_data, self.hourly_metrics)
+            columns = [column for column in metrics if column in data.columns]
+            self.range_indexes[source] = RangeStatisticsIndex(data, columns)
+        return self.range_indexes[source]
+
     def display_aggregated_data(self):
         """
         Generates aggregated data for weekly, monthly, seasonal, and yearly timeframes.
@@ -366,25 +491,12 @@ class WeatherAnalyzer:
             PLOT
         """    
     def plot_trend(self, parameter, timeframe): # pragma: no cover
-        weekly_data = self.aggregate_daily('week')
-        monthly_data = self.aggregate_daily('month')
         seasonal_data = self.aggregate_daily('season')
         yearly_data = self.aggregate_daily('year')
 
         if timeframe == 'week':  # Weekly trend as a heatmap
-            # Filter to get only 'mean' for the specified parameter
-            weekly_data = weekly_data[(parameter, 'mean')].reset_index()
-            
-            # Rename columns for easy access
-            weekly_data.columns = ['date', 'value']
-            weekly_data['year'] = weekly_data['date'].dt.year
-            weekly_data['week'] = weekly_data['date'].dt.isocalendar().week  # Get ISO week number
-
-            # Aggregate by year and week to ensure unique values for each combination
-            weekly_data = weekly_data.groupby(['year', 'week'])['value'].mean().reset_index()
-
-            # Pivot table for the heatmap
-            heatmap_data = weekly_data.pivot(index='week', columns='year', values='value')
+            # (ISO week x year) matrix of weekly means
+            heatmap_data = year_period_matrix(self.daily_data[parameter], 'week')
 
             # Plotting the heatmap
             plt.figure(figsize=(15, 8))
@@ -395,20 +507,8 @@ class WeatherAnalyzer:
             plt.show()
 
         elif timeframe == 'month':  # Monthly trend as a heatmap
-            # Filter to get only 'mean' for the specified parameter
-            monthly_data = monthly_data[(parameter, 'mean')].reset_index()
-            
-            monthly_data.columns = ['date', 'value']  # Rename columns for easy access
-            monthly_data['year'] = monthly_data['date'].dt.year
-            monthly_data['month'] = monthly_data['date'].dt.month_name()
-
-            # Pivot table for the heatmap
-            heatmap_data = monthly_data.pivot(index='month', columns='year', values='value')
-
-            # Sort the months to ensure the heatmap shows January through December in order
-            month_order = ["January", "February", "March", "April", "May", "June", 
-                        "July", "August", "September", "October", "November", "December"]
-            heatmap_data = heatmap_data.reindex(month_order)
+            # (month x year) matrix of monthly means, January through December
+            heatmap_data = year_period_matrix(self.daily_data[parameter], 'month')
 
             # Plotting the heatmap
             plt.figure(figsize=(15, 8))
@@ -493,7 +593,7 @@ class ExtremeWeatherAnalyzer(WeatherAnalyzer):
     Inherits from:
         WeatherAnalyzer: A class for general weather data analysis and visualization.
     """
-    def __init__(self, hourly_data, daily_data):
+    def __init__(self, hourly_data=None, daily_data=None, hourly_summary=None):
         # calling the constructor of the parent class
         """
         Initialize the ExtremeWeatherAnalyzer with hourly and daily weather data.
@@ -501,22 +601,32 @@ class ExtremeWeatherAnalyzer(WeatherAnalyzer):
         Parameters:
             hourly_data (DataFrame): Hourly weather data.
             daily_data (DataFrame): Daily weather data.
+            hourly_summary (DataFrame, optional): Compacted tier of the hourly data.
         """
-        super().__init__(hourly_data, daily_data)
+        super().__init__(hourly_data, daily_data, hourly_summary)
     
     # Set fixed or percentile-based thresholds
-    def define_thresholds(self):
+    def define_thresholds(self, sketches=None):
         """
         Define thresholds for extreme weather events based on percentile values for temperature, precipitation, and wind speed.
-        
+
         High and low extremes are set at the 95th and 5th percentiles of each parameter.
+
+        Args:
+            sketches (dict, optional): Variable -> quantile sketch (e.g. QuantileSketchStore.sketches_for); when given,
+                the percentiles are read from the sketches instead of being computed over the full daily data.
         """
-        self.temperature_high = self.daily_data['temperature_2m_max_C'].quantile(0.95)
-        self.temperature_low = self.daily_data['temperature_2m_min_C'].quantile(0.05)
-        self.precipitation_high = self.daily_data['precipitation_sum_mm'].quantile(0.95)
-        self.precipitation_low = self.daily_data['precipitation_sum_mm'].quantile(0.05)
-        self.wind_speed_high = self.daily_data['wind_speed_10m_max_kmh'].quantile(0.95)
-        self.wind_speed_low = self.daily_data['wind_speed_10m_max_kmh'].quantile(0.05)
+        def percentile(column, q):
+            if sketches is not None:
+                return sketches[column].quantile(q)
+            return self.daily_data[column].quantile(q)
+
+        self.temperature_high = percentile('temperature_2m_max_C', 0.95)
+        self.temperature_low = percentile('temperature_2m_min_C', 0.05)
+        self.precipitation_high = percentile('precipitation_sum_mm', 0.95)
+        self.precipitation_low = percentile('precipitation_sum_mm', 0.05)
+        self.wind_speed_high = percentile('wind_speed_10m_max_kmh', 0.95)
+        self.wind_speed_low = percentile('wind_speed_10m_max_kmh', 0.05)
 
     def flag_extreme_events(self):
         """
@@ -548,25 +658,78 @@ class ExtremeWeatherAnalyzer(WeatherAnalyzer):
         Calculate the frequency of extreme weather events by year.
 
         Returns:
-            DataFrame: Frequency of each extreme weather event type by year.
+            DataFrame: Frequency of each extreme weather event type by year (indexed by location and
+            year when the data holds several locations).
         """
-        # Calculate the frequency of extreme events by year
-        extreme_events = self.daily_data.groupby(self.daily_data.index.year)[[
+        # Calculate the frequency of extreme events by year (and by location when the data has several)
+        keys = self.daily_data.index.year
+        if 'location' in self.daily_data.columns and self.daily_data['location'].nunique() > 1:
+            keys = [self.daily_data['location'], self.daily_data.index.year]
+        extreme_events = self.daily_data.groupby(keys)[[
             'extreme_high_temp', 'extreme_low_temp', 'extreme_high_precipitation', 'extreme_low_precipitation', 
             'extreme_high_wind_speed', 'extreme_low_wind_speed']].sum()
         
         return extreme_events
 
+    def detect_change_points(self, extreme_events=None, penalty=None, outlier_threshold=3.5):
+        """
+        Detect regime shifts and outlier years in the yearly frequency of every extreme event type.
+
+        All event types (and locations) are processed in one batched PELT call, see change_points.py.
+
+        Parameters:
+            extreme_events (DataFrame, optional): Output of `calculate_frequency`; computed if not given.
+            penalty (float, optional): Cost per change point (defaults to 3 * log(number of years)).
+            outlier_threshold (float): Robust z-score above which a year counts as an outlier.
+
+        Returns:
+            DataFrame: Detected change points and outlier years with their year, date and levels.
+        """
+        if extreme_events is None:
+            extreme_events = self.calculate_frequency()
+        return detect_regime_shifts(extreme_events.astype(float), penalty=penalty,
+                                    outlier_threshold=outlier_threshold)
+
+    def annotate_detected_events(self, extreme_events, columns): # pragma: no cover
+        """
+        Annotate the current plot with the change points and outlier years detected for the given event columns.
+
+        Parameters:
+            extreme_events (DataFrame): Frequency of extreme events by year.
+            columns (dict): Maps event columns to the label used in the annotation.
+
+        Note:
+            Excluded from testing as it draws on a plot.
+        """
+        detected = self.detect_change_points(extreme_events)
+        detected = detected[detected['event'].isin(list(columns))]
+        for _, row in detected.iterrows():
+            if row['kind'] == 'change_point':
+                text = f"{columns[row['event']]} regime shift ({row['year']})"
+            else:
+                text = f"{columns[row['event']]} outlier year ({row['year']})"
+            plt.annotate(
+                text, xy=(row['year'], row['value']),
+                xytext=(row['year'], row['value'] + 0.1 * extreme_events.to_numpy().max() + 1),
+                arrowprops=dict(facecolor='black', arrowstyle='->')
+            )
+
     def plot_high_extreme_events(self, extreme_events): # pragma: no cover
         """
         Plot frequency of high extreme weather events over time, including high temperatures, precipitation, and wind speeds.
 
         Parameters:
-            extreme_events (DataFrame): Frequency of extreme high events by year.
+            extreme_events (DataFrame): Frequency of extreme high events by year (one figure per
+                location when indexed by location and year).
 
         Note:
             Excluded from testing as it generates plots.
         """
+        if isinstance(extreme_events.index, pd.MultiIndex):
+            for location in extreme_events.index.unique(0):
+                print(f"Extreme high events in {location}")
+                self.plot_high_extreme_events(extreme_events.xs(location))
+            return
         plt.figure(figsize=(12, 8))
 
         # Scatter plot for extreme events (high)
@@ -584,20 +747,12 @@ class ExtremeWeatherAnalyzer(WeatherAnalyzer):
         extreme_events['extreme_high_wind_speed'].rolling(window=3).mean().plot(
             linestyle='--', color='purple', label='Smoothed high wind speed', ax=plt.gca()
         )
-        # Annotations for specific events
-        plt.annotate(
-            'Heatwave Year(2024)', xy=(2024, extreme_events['extreme_high_temp'].max()),
-            xytext=(2024, 45), arrowprops=dict(facecolor='black', arrowstyle='->')
-        )
-        
-        plt.annotate(
-            'High wind speed Year(2023)', xy=(2023, extreme_events['extreme_high_wind_speed'].max()),
-            xytext=(2023, 35), arrowprops=dict(facecolor='black', arrowstyle='->')
-        )
-        plt.annotate(
-            f"Heavy precipitation year(2010)", xy=(2010, extreme_events['extreme_high_precipitation'].max()),
-            xytext=(2010, 38), arrowprops=dict(facecolor='black', arrowstyle='->')
-        )
+        # Annotations for detected regime shifts and outlier years
+        self.annotate_detected_events(extreme_events, {
+            'extreme_high_temp': 'Heatwave',
+            'extreme_high_precipitation': 'Heavy precipitation',
+            'extreme_high_wind_speed': 'High wind speed'
+        })
         
         # Plot details
         plt.title('Frequency of High Extreme Weather Events Over Time')
@@ -612,11 +767,17 @@ class ExtremeWeatherAnalyzer(WeatherAnalyzer):
         Plot frequency of low extreme weather events over time, including low temperatures, precipitation, and wind speeds.
 
         Parameters:
-            extreme_events (DataFrame): Frequency of extreme low events by year.
+            extreme_events (DataFrame): Frequency of extreme low events by year (one figure per
+                location when indexed by location and year).
 
         Note:
             Excluded from testing as it generates plots.
         """
+        if isinstance(extreme_events.index, pd.MultiIndex):
+            for location in extreme_events.index.unique(0):
+                print(f"Extreme low events in {location}")
+                self.plot_low_extreme_events(extreme_events.xs(location))
+            return
         plt.figure(figsize=(12, 8))
 
         # Scatter plot for extreme events (low)
@@ -634,19 +795,12 @@ class ExtremeWeatherAnalyzer(WeatherAnalyzer):
         extreme_events['extreme_low_wind_speed'].rolling(window=3).mean().plot(
             linestyle='--', color='purple', label='Smoothed low wind speed', ax=plt.gca()
         )
-        # Annotations for specific events        
-        plt.annotate(
-            'Cold Wave Year(2003)', xy=(2003, extreme_events['extreme_low_temp'].max()),
-            xytext=(2003, 37), arrowprops=dict(facecolor='black', arrowstyle='->')
-        )
-        plt.annotate(
-            'Low precipitation year(all)', xy=(2010, extreme_events['extreme_low_precipitation'].max()),
-            xytext=(2010, 2), arrowprops=dict(facecolor='black', arrowstyle='->')
-        )
-        plt.annotate(
-            'Low speed wind year(2014)', xy=(2014, extreme_events['extreme_low_wind_speed'].max()),
-            xytext=(2014, 40), arrowprops=dict(facecolor='black', arrowstyle='->')
-        )
+        # Annotations for detected regime shifts and outlier years
+        self.annotate_detected_events(extreme_events, {
+            'extreme_low_temp': 'Cold wave',
+            'extreme_low_precipitation': 'Low precipitation',
+            'extreme_low_wind_speed': 'Low wind speed'
+        })
 
         # Plot details
         plt.title('Frequency of Low Extreme Weather Events Over Time')
@@ -689,7 +843,7 @@ The following code block is intended for demonstration purposes and should be ex
 because it includes extensive visualizations.
 """
 if __name__ == '__main__': # pragma: no cover
-    analyzer = WeatherAnalyzer()
+    analyzer = WeatherAnalyzer(hourly_df, daily_df, hourly_summary_df)
     print("It works before defining the variable extreme_weather_analyzer to the ExtremeWeatherAnalyzer class...")
     extreme_weather_analyzer = ExtremeWeatherAnalyzer(hourly_df, daily_df)
     
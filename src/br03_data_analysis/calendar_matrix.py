@@ -0,0 +1,161 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+
+DAY_NS = 24 * 3600 * 10 ** 9
+HOUR_NS = 3600 * 10 ** 9
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December"]
+
+# Matrices shared between callers (e.g. the same "actual suitability" heatmap for every model)
+MATRIX_CACHE_SIZE = 32
+_matrix_cache = OrderedDict()
+
+
+def clear_cache():
+    """
+    Empties the shared matrix cache.
+    """
+    _matrix_cache.clear()
+
+
+def _cached(key, series, build, cache):
+    """
+    Returns a cached matrix for the same series content and layout, or builds and caches it.
+
+    Args:
+        key (tuple): Layout of the matrix (kind and options).
+        series (Series): Source series; its index and values are hashed into the cache key.
+        build (callable): Builds the matrix when it is not cached.
+        cache (bool): Use the shared cache.
+
+    Returns:
+        DataFrame: The matrix (shared with other callers, so it must not be modified in place).
+    """
+    if not cache:
+        return build()
+    digest = hashlib.sha1(series.index.asi8.tobytes())
+    digest.update(series.to_numpy(dtype=float).tobytes())
+    key = key + (digest.hexdigest(),)
+    if key in _matrix_cache:
+        _matrix_cache.move_to_end(key)
+        return _matrix_cache[key]
+    matrix = build()
+    _matrix_cache[key] = matrix
+    if len(_matrix_cache) > MATRIX_CACHE_SIZE:
+        _matrix_cache.popitem(last=False)
+    return matrix
+
+
+def _cell_means(cells, values, size):
+    """
+    Mean of the values falling into each cell of a flattened matrix (NaN for empty cells).
+
+    Args:
+        cells (ndarray): Flat cell position of every value.
+        values (ndarray): Values (NaN values are ignored).
+        size (int): Number of cells.
+
+    Returns:
+        tuple: Cell means and cell counts.
+    """
+    valid = ~np.isnan(values)
+    sums = np.bincount(cells[valid], weights=values[valid], minlength=size)
+    counts = np.bincount(cells[valid], minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan), counts
+
+
+def _wall_clock_ns(index):
+    """
+    Nanosecond timestamps in the index's own wall-clock time.
+
+    Args:
+        index (DatetimeIndex): Timestamps (naive or time zone aware).
+
+    Returns:
+        ndarray: int64 nanoseconds.
+    """
+    return (index.tz_localize(None) if index.tz is not None else index).asi8
+
+
+def day_hour_matrix(series, cache=True):
+    """
+    Reshapes an hourly series into a (day x hour) matrix, e.g. for a heatmap of the best hours per day.
+
+    Equivalent to `pivot_table(index=index.date, columns=index.hour)` (mean of duplicate hours, days
+    without any value left out) but computed with integer arithmetic on the timestamps instead of one
+    Python date object per row. Missing hours stay NaN.
+
+    Args:
+        series (Series): Hourly values indexed by timestamp.
+        cache (bool): Reuse the matrix of an identical series built before.
+
+    Returns:
+        DataFrame: Days (dates) as rows, hours 0-23 as columns.
+    """
+    def build():
+        timestamps = _wall_clock_ns(series.index)
+        days = timestamps // DAY_NS
+        hours = (timestamps - days * DAY_NS) // HOUR_NS
+        first_day = days.min() if len(days) else 0
+        n_days = int(days.max() - first_day) + 1 if len(days) else 0
+
+        means, counts = _cell_means((days - first_day) * 24 + hours, series.to_numpy(dtype=float), n_days * 24)
+        matrix, observed = means.reshape(n_days, 24), counts.reshape(n_days, 24).sum(axis=1) > 0
+        dates = pd.to_datetime((first_day + np.arange(n_days)[observed]) * DAY_NS).date
+        return pd.DataFrame(matrix[observed], index=pd.Index(dates, name='date'), columns=pd.RangeIndex(24, name='hour'))
+
+    return _cached(('day_hour',), series, build, cache)
+
+
+def year_period_matrix(series, period='month', cache=True):
+    """
+    Reshapes a daily series into a (week or month x year) matrix of means, as in the plot_trend heatmaps.
+
+    For months every cell is the mean of the month's days. For weeks the days are first averaged per
+    Monday-Sunday week (like resample('W')) and every week is labelled with the year and ISO week number
+    of its Sunday; weeks sharing a label are averaged.
+
+    Args:
+        series (Series): Daily values indexed by date.
+        period (str): 'month' or 'week'.
+        cache (bool): Reuse the matrix of an identical series built before.
+
+    Returns:
+        DataFrame: Months (names, January-December) or ISO weeks as rows, years as columns.
+    """
+    if period not in ('month', 'week'):
+        raise ValueError(f"Unknown period '{period}', expected 'month' or 'week'.")
+
+    def build():
+        values = series.to_numpy(dtype=float)
+        if period == 'month':
+            index = series.index
+            first_year = int(index.year.min())
+            n_years = int(index.year.max()) - first_year + 1
+            cells = (index.month.to_numpy() - 1) * n_years + (index.year.to_numpy() - first_year)
+            means, _ = _cell_means(cells, values, 12 * n_years)
+            frame = pd.DataFrame(means.reshape(12, n_years), index=pd.Index(MONTH_NAMES, name='month'),
+                                 columns=pd.RangeIndex(first_year, first_year + n_years, name='year'))
+            return frame.dropna(axis=1, how='all')
+
+        # Days since 1970-01-01 (a Thursday) -> index of the Monday-Sunday week
+        days = _wall_clock_ns(series.index) // DAY_NS
+        weeks = (days + 3) // 7
+        first_week = weeks.min()
+        weekly, counts = _cell_means(weeks - first_week, values, int(weeks.max() - first_week) + 1)
+        present = np.flatnonzero(counts > 0)
+        sundays = pd.to_datetime(((present + first_week) * 7 + 3) * DAY_NS)
+        calendar = sundays.isocalendar()
+        week_numbers, years = calendar['week'].to_numpy(dtype=int), sundays.year.to_numpy()
+
+        first_year = int(years.min())
+        n_years = int(years.max()) - first_year + 1
+        means, _ = _cell_means((week_numbers - 1) * n_years + (years - first_year), weekly[present], 53 * n_years)
+        frame = pd.DataFrame(means.reshape(53, n_years), index=pd.RangeIndex(1, 54, name='week'),
+                             columns=pd.RangeIndex(first_year, first_year + n_years, name='year'))
+        return frame.dropna(axis=0, how='all').dropna(axis=1, how='all')
+
+    return _cached(('year_period', period), series, build, cache)
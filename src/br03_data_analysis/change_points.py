@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+
+
+def _segment_cost(sums, squares, lengths, cost, scale):
+    """
+    Cost of fitting one constant level to each segment (twice the negative log-likelihood).
+
+    Args:
+        sums (ndarray): Sum of the values in each segment.
+        squares (ndarray): Sum of the squared values in each segment.
+        lengths (ndarray): Number of values in each segment.
+        cost (str): 'poisson' for event counts, 'normal' for a mean shift with known variance.
+        scale (ndarray): Variance per series for the 'normal' cost, broadcastable to `sums`.
+
+    Returns:
+        ndarray: Cost of every segment, same shape as `sums`.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if cost == 'poisson':
+            mean = sums / lengths
+            return np.where(sums > 0, 2 * sums * (1 - np.log(mean)), 0.0)
+        if cost == 'normal':
+            return (squares - sums ** 2 / lengths) / scale
+    raise ValueError(f"Unknown cost '{cost}', expected 'poisson' or 'normal'.")
+
+
+def pelt(values, penalty=None, cost='poisson', min_size=2):
+    """
+    Penalized change-point detection (PELT) for many equally long series in one call.
+
+    The optimal-partitioning recursion runs once over time while every step is evaluated for all
+    series at once; segment costs come from cumulative sums, and the PELT pruning rule drops
+    candidate change points that can never be optimal again. Pruned candidates are masked rather
+    than removed, so every step still evaluates all earlier positions and the work is O(n^2) in the
+    series length, which is cheap for yearly counts.
+
+    Args:
+        values (ndarray): Matrix of shape (series, time).
+        penalty (float, optional): Cost added per change point; defaults to 3 * log(time) (MBIC-like).
+        cost (str): 'poisson' for event counts, 'normal' for a mean shift.
+        min_size (int): Minimum number of points in a segment.
+
+    Returns:
+        list: For every series, the sorted positions where a new segment starts.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    n_series, n = values.shape
+    penalty = 3 * np.log(n) if penalty is None else penalty
+    if n < 2 * min_size:
+        return [[] for _ in range(n_series)]
+
+    zeros = np.zeros((n_series, 1))
+    sums = np.hstack([zeros, np.cumsum(values, axis=1)])
+    squares = np.hstack([zeros, np.cumsum(values ** 2, axis=1)])
+    if cost == 'normal':
+        # Noise variance from the first differences, which is robust to the level shifts themselves
+        differences = np.diff(values, axis=1)
+        mad = np.median(np.abs(differences - np.median(differences, axis=1, keepdims=True)), axis=1)
+        scale = ((mad / 0.6745) ** 2 / 2)[:, None]
+        scale[scale == 0] = 1.0
+    else:
+        scale = np.ones((n_series, 1))
+
+    taus = np.arange(n + 1)
+    best = np.full((n_series, n + 1), np.inf)
+    best[:, 0] = -penalty
+    last = np.zeros((n_series, n + 1), dtype=int)
+    candidates = np.zeros((n_series, n + 1), dtype=bool)
+    candidates[:, 0] = True
+    rows = np.arange(n_series)
+
+    for t in range(min_size, n + 1):
+        allowed = candidates & (taus <= t - min_size)
+        segment = _segment_cost(sums[:, [t]] - sums, squares[:, [t]] - squares, np.maximum(t - taus, 1), cost, scale)
+        total = np.where(allowed, best + segment + penalty, np.inf)
+        choice = np.argmin(total, axis=1)
+        best[:, t] = total[rows, choice]
+        last[:, t] = choice
+        # PELT pruning: a candidate that is already worse than the optimum at t stays worse later on
+        candidates = np.where(allowed, best + segment <= best[:, [t]], candidates)
+        if t + min_size <= n:
+            candidates[:, t] = True
+
+    change_points = []
+    for row in rows:
+        positions, t = [], n
+        while t > 0:
+            t = int(last[row, t])
+            if t > 0:
+                positions.append(t)
+        change_points.append(sorted(positions))
+    return change_points
+
+
+def flag_outliers(values, window=5, threshold=3.5):
+    """
+    Flags isolated outlier points against a running median, for many series at once.
+
+    Args:
+        values (ndarray): Matrix of shape (series, time).
+        window (int): Width of the centred running median (odd).
+        threshold (float): Robust z-score above which a point is an outlier.
+
+    Returns:
+        tuple: Boolean outlier mask and the running median, both of shape (series, time).
+    """
+    half = window // 2
+    padded = np.pad(values, ((0, 0), (half, half)), mode='edge')
+    running_median = np.median(np.lib.stride_tricks.sliding_window_view(padded, window, axis=1), axis=2)
+    residuals = values - running_median
+    mad = np.median(np.abs(residuals - np.median(residuals, axis=1, keepdims=True)), axis=1, keepdims=True)
+    # Mostly-constant counts have a zero MAD; fall back to the Poisson scale of the running level
+    scale = np.where(mad > 0, mad / 0.6745, np.sqrt(np.maximum(running_median, 1.0)))
+    return np.abs(residuals) / scale > threshold, running_median
+
+
+def detect_regime_shifts(frequency, penalty=None, cost='poisson', min_size=2, outlier_threshold=3.5):
+    """
+    Detects change points and outlier years in yearly extreme-event frequencies.
+
+    Every column of `frequency` (and every location, when the index has a 'location' level) is one
+    series. Isolated outlier years are flagged first against a running median and replaced by it,
+    so a single extreme year is not mistaken for a regime; the cleaned series then all go through
+    `pelt` together.
+
+    Args:
+        frequency (DataFrame): Yearly counts as returned by ExtremeWeatherAnalyzer.calculate_frequency.
+        penalty (float, optional): Cost added per change point.
+        cost (str): 'poisson' or 'normal'.
+        min_size (int): Minimum number of years in a regime.
+        outlier_threshold (float): Robust z-score above which a year is flagged as an outlier.
+
+    Returns:
+        DataFrame: One row per detection with 'event', 'year', 'date', 'kind' ('change_point' or 'outlier'),
+        'value', 'level_before' and 'level_after' (plus 'location' for multi-location input).
+    """
+    has_location = isinstance(frequency.index, pd.MultiIndex)
+    if has_location:
+        # Rows become (location, event) series, columns the years
+        # (a location without data for a year simply had no flagged days that year)
+        matrix = frequency.stack(future_stack=True).unstack(1).fillna(0)
+        matrix.index.names = ['location', 'event']
+    else:
+        matrix = frequency.T
+        matrix.index.name = 'event'
+    years = matrix.columns.to_numpy()
+    values = matrix.to_numpy(dtype=float)
+
+    outliers, running_median = flag_outliers(values, threshold=outlier_threshold)
+    cleaned = np.where(outliers, running_median, values)
+
+    columns = (['location'] if has_location else []) + ['event', 'year', 'date', 'kind',
+                                                         'value', 'level_before', 'level_after']
+    records = []
+    for row, starts in enumerate(pelt(cleaned, penalty, cost, min_size)):
+        key = matrix.index[row] if has_location else (matrix.index[row],)
+        series = cleaned[row]
+        bounds = [0] + starts + [len(series)]
+        levels = np.zeros(len(series))
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            levels[start:end] = series[start:end].mean()
+
+        for previous, start in zip(bounds[:-2], bounds[1:-1]):
+            records.append(key + (int(years[start]), pd.Timestamp(year=int(years[start]), month=1, day=1),
+                                  'change_point', values[row, start], levels[previous], levels[start]))
+        for position in np.flatnonzero(outliers[row]):
+            records.append(key + (int(years[position]), pd.Timestamp(year=int(years[position]), month=1, day=1),
+                                  'outlier', values[row, position], levels[position], levels[position]))
+
+    return pd.DataFrame.from_records(records, columns=columns).sort_values(columns[:3], ignore_index=True)
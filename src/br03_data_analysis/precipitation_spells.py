@@ -0,0 +1,265 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from .seasons import SEASON_NAMES
+except ImportError:
+    from seasons import SEASON_NAMES
+
+
+def _period_columns(timestamps, by):
+    """
+    Period labels for a set of timestamps.
+
+    Args:
+        timestamps (DatetimeIndex): Timestamps to label.
+        by (str): 'year', 'season' or 'month'.
+
+    Returns:
+        dict: Column name -> label array ('year' plus 'season' or 'month' when requested).
+    """
+    if by == 'year':
+        return {'year': timestamps.year}
+    if by == 'season':
+        return {'year': timestamps.year, 'season': timestamps.quarter.map(SEASON_NAMES)}
+    if by == 'month':
+        return {'year': timestamps.year, 'month': timestamps.month}
+    raise ValueError(f"Unknown period '{by}', expected 'year', 'season' or 'month'.")
+
+
+class PrecipitationSpells:
+    """
+    Run-length encoded wet/dry spells of a precipitation series.
+
+    The series is encoded once into runs (start, length, wet/dry, precipitation total); all spell
+    statistics are then computed from the runs, which are far fewer than the rows because
+    precipitation is mostly zero. Runs never cross a gap in the timestamps, a missing value or a
+    change of location. Longest spells count in the period they start in; for the step-based statistics
+    (wet frequency, intensity) runs are split at month boundaries, so every step counts in its own period.
+
+    Attributes:
+        step (Timedelta): Spacing of the series (one hour or one day).
+        start (DatetimeIndex): Timestamp of the first step of every run.
+        length (ndarray): Number of steps in every run.
+        wet (ndarray): True for wet runs, False for dry runs.
+        total (ndarray): Precipitation summed over every run.
+        location (ndarray): Location of every run ('' when the data has no location column).
+        position (ndarray): Row of the first step of every run in the sorted data.
+        cumulative (ndarray): Cumulative precipitation over the sorted rows (missing values count as 0).
+    """
+
+    def __init__(self, data, column='precipitation_mm', wet_threshold=0.1, location_column='location', step=None):
+        """
+        Encodes the precipitation series into runs.
+
+        Args:
+            data (DataFrame): Hourly or daily weather data indexed by timestamp.
+            column (str): Precipitation column ('precipitation_mm' or 'precipitation_sum_mm').
+            wet_threshold (float): Minimum precipitation for a wet step (e.g. 0.1 mm/h or 1 mm/day).
+            location_column (str): Column with the location name, used when present.
+            step (Timedelta, optional): Spacing of the series; inferred from the timestamps if not given.
+        """
+        data = data.sort_index()
+        if location_column in data.columns:
+            data = data.sort_values(location_column, kind='stable')
+            locations = data[location_column].to_numpy()
+        else:
+            locations = np.full(len(data), '', dtype=object)
+        timestamps = data.index
+        values = data[column].to_numpy(dtype=float)
+
+        gaps = np.diff(timestamps.asi8)
+        if step is None:
+            step = pd.Timedelta(int(np.median(gaps[gaps > 0]))) if (gaps > 0).any() else pd.Timedelta(hours=1)
+        self.step = pd.Timedelta(step)
+
+        missing = np.isnan(values)
+        wet = values >= wet_threshold
+        # A new run starts where the state changes, after a time gap, at a location change or around missing values
+        boundary = np.ones(len(values), dtype=bool)
+        boundary[1:] = ((wet[1:] != wet[:-1]) | (gaps != self.step.value) | (missing[1:] != missing[:-1])
+                        | (locations[1:] != locations[:-1]))
+        starts = np.flatnonzero(boundary)
+        lengths = np.diff(np.append(starts, len(values)))
+        totals = np.add.reduceat(np.where(missing, 0.0, values), starts) if len(starts) else np.zeros(0)
+
+        keep = ~missing[starts]
+        # Cumulative precipitation gives the total of any part of a run
+        self.cumulative = np.concatenate([[0.0], np.cumsum(np.where(missing, 0.0, values))])
+        self.position = starts[keep]
+        self.start = timestamps[starts[keep]]
+        self.length = lengths[keep]
+        self.wet = wet[starts[keep]]
+        self.total = totals[keep]
+        self.location = locations[starts[keep]]
+        self.has_location = location_column in data.columns
+
+    def _runs(self, by):
+        """
+        The runs as a DataFrame, labelled with the period they start in.
+
+        Args:
+            by (str): 'year', 'season' or 'month'.
+
+        Returns:
+            tuple: DataFrame of runs and the list of grouping columns (location first when present).
+        """
+        periods = _period_columns(self.start, by)
+        runs = pd.DataFrame({'location': self.location, **periods, 'wet': self.wet, 'length': self.length,
+                             'start': self.start, 'total': self.total})
+        keys = (['location'] if self.has_location else []) + list(periods)
+        return runs, keys
+
+    def _pieces(self, by):
+        """
+        The runs split at month boundaries (which include every season and year boundary), each piece
+        labelled with the period it falls in.
+
+        Args:
+            by (str): 'year', 'season' or 'month'.
+
+        Returns:
+            tuple: DataFrame of pieces ('wet', 'length' in steps, 'total') and the list of grouping columns.
+        """
+        timezone = self.start.tz
+
+        def month_index(timestamps):
+            local = timestamps.tz_localize(None) if timezone is not None else timestamps
+            return local.year.to_numpy() * 12 + local.month.to_numpy() - 1
+
+        def month_start(months):
+            starts = pd.DatetimeIndex((months - 1970 * 12).astype('datetime64[M]').astype('datetime64[ns]'))
+            return starts.tz_localize(timezone) if timezone is not None else starts
+
+        first = month_index(self.start)
+        last = month_index(self.start + pd.to_timedelta(self.step.value * (self.length - 1)))
+        counts = last - first + 1
+        run = np.repeat(np.arange(len(counts)), counts)
+        months = first[run] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        # Steps of every run that fall between the start of its month piece and the start of the next month
+        step = self.step.value
+        run_start = self.start.asi8[run]
+        begin = np.maximum(run_start, month_start(months).asi8)
+        end = np.minimum(run_start + step * self.length[run], month_start(months + 1).asi8)
+        first_step = -((run_start - begin) // step)
+        last_step = -((run_start - end) // step)
+        keep = last_step > first_step
+        run, months, first_step, last_step = run[keep], months[keep], first_step[keep], last_step[keep]
+
+        position = self.position[run]
+        periods = _period_columns(month_start(months), by)
+        pieces = pd.DataFrame({'location': self.location[run], **periods, 'wet': self.wet[run],
+                               'length': last_step - first_step,
+                               'total': self.cumulative[position + last_step] - self.cumulative[position + first_step]})
+        keys = (['location'] if self.has_location else []) + list(periods)
+        return pieces, keys
+
+    def spell_length_distribution(self):
+        """
+        Number of dry and wet spells of every length.
+
+        Returns:
+            DataFrame: Spell length as index, 'dry' and 'wet' spell counts as columns.
+        """
+        size = int(self.length.max()) + 1 if len(self.length) else 1
+        distribution = pd.DataFrame({
+            'dry': np.bincount(self.length[~self.wet], minlength=size),
+            'wet': np.bincount(self.length[self.wet], minlength=size)
+        }, index=pd.RangeIndex(size, name='length'))
+        return distribution.iloc[1:]
+
+    def longest_spells(self, by='year'):
+        """
+        Longest dry and wet spell per period, with the date each of them started.
+
+        Args:
+            by (str): 'year', 'season' or 'month'.
+
+        Returns:
+            DataFrame: 'longest_dry', 'longest_dry_start', 'longest_wet' and 'longest_wet_start' per period.
+        """
+        runs, keys = self._runs(by)
+        longest = runs.sort_values('length', ascending=False, kind='stable').drop_duplicates(keys + ['wet'])
+        longest = longest.set_index(keys + ['wet'])[['length', 'start']].unstack('wet')
+        longest = longest.reindex(columns=pd.MultiIndex.from_product([['length', 'start'], [False, True]]))
+        return pd.DataFrame({
+            'longest_dry': longest[('length', False)],
+            'longest_dry_start': longest[('start', False)],
+            'longest_wet': longest[('length', True)],
+            'longest_wet_start': longest[('start', True)]
+        }).sort_index()
+
+    def wet_frequency(self, by='year'):
+        """
+        Fraction of observed steps that are wet (wet-day frequency for daily data, wet-hour frequency for hourly data).
+
+        Args:
+            by (str): 'year', 'season' or 'month'.
+
+        Returns:
+            Series: Wet fraction per period.
+        """
+        pieces, keys = self._pieces(by)
+        pieces['wet_steps'] = np.where(pieces['wet'], pieces['length'], 0)
+        grouped = pieces.groupby(keys)[['wet_steps', 'length']].sum()
+        return (grouped['wet_steps'] / grouped['length']).rename('wet_frequency')
+
+    def wet_day_frequency(self, by='year'):
+        """
+        Fraction of observed days with at least one wet step, computed from the runs' day spans.
+
+        For daily data this equals `wet_frequency`. For hourly data every run is mapped to the range of
+        days it covers, and a difference array over days marks observed and wet days, so only one value
+        per day (not per hour) is ever materialized.
+
+        Args:
+            by (str): 'year', 'season' or 'month'.
+
+        Returns:
+            Series: Wet-day fraction per period.
+        """
+        codes, locations = pd.factorize(self.location)
+        # Day positions on wall-clock days, so 23 and 25 hour days around DST changes count as one day
+        timezone = self.start.tz
+        start = self.start.tz_localize(None) if timezone is not None else self.start
+        end = self.start + self.step * (self.length - 1)
+        end = end.tz_localize(None) if timezone is not None else end
+        first_day = start.normalize()
+        origin = first_day.min()
+        first = ((first_day - origin) // pd.Timedelta(days=1)).to_numpy()
+        last = ((end.normalize() - origin) // pd.Timedelta(days=1)).to_numpy()
+        n_days = int(last.max()) + 1
+
+        observed = np.zeros((len(locations), n_days + 1))
+        wet = np.zeros((len(locations), n_days + 1))
+        np.add.at(observed, (codes, first), 1)
+        np.add.at(observed, (codes, last + 1), -1)
+        np.add.at(wet, (codes[self.wet], first[self.wet]), 1)
+        np.add.at(wet, (codes[self.wet], last[self.wet] + 1), -1)
+        observed = np.cumsum(observed, axis=1)[:, :-1] > 0
+        wet = np.cumsum(wet, axis=1)[:, :-1] > 0
+
+        location_codes, day_positions = np.nonzero(observed)
+        days = origin + pd.to_timedelta(day_positions, unit='D')
+        periods = _period_columns(pd.DatetimeIndex(days), by)
+        frame = pd.DataFrame({'location': locations[location_codes], **periods,
+                              'wet': wet[location_codes, day_positions]})
+        keys = (['location'] if self.has_location else []) + list(periods)
+        return frame.groupby(keys)['wet'].mean().rename('wet_day_frequency')
+
+    def intensity(self, by='year'):
+        """
+        Mean precipitation per wet step (e.g. mm per wet hour for hourly data).
+
+        Args:
+            by (str): 'year', 'season' or 'month'.
+
+        Returns:
+            Series: Precipitation intensity per period (NaN for periods without wet steps).
+        """
+        pieces, keys = self._pieces(by)
+        pieces['wet_total'] = np.where(pieces['wet'], pieces['total'], 0.0)
+        pieces['wet_steps'] = np.where(pieces['wet'], pieces['length'], 0)
+        grouped = pieces.groupby(keys)[['wet_total', 'wet_steps']].sum()
+        return (grouped['wet_total'] / grouped['wet_steps'].where(grouped['wet_steps'] > 0)).rename('intensity')
@@ -0,0 +1,310 @@
+import json
+import numpy as np
+import pandas as pd
+
+
+class KLLSketch:
+    """
+    Mergeable streaming quantile sketch (KLL).
+
+    Values are kept in levels of "compactors"; an item on level h stands for 2**h original values.
+    When a level is full it is sorted and every other item (random offset) moves one level up, so the
+    sketch keeps O(k) items no matter how many values it has seen. Two sketches merge by concatenating
+    their levels and compacting again, which makes per-location sketches combinable.
+
+    Error bound: a quantile returned by the sketch has a rank within about ±1.65% of the requested rank
+    (normalized rank error) with 99% confidence for k=200, and the error shrinks roughly as 1/k
+    (about ±0.35% for k=1000). The minimum and maximum are always exact.
+
+    Attributes:
+        k (int): Accuracy parameter (size of the top compactor).
+        n (int): Number of values seen.
+        levels (list): Arrays of retained items per level.
+        min_value (float): Smallest value seen.
+        max_value (float): Largest value seen.
+    """
+
+    def __init__(self, k=200, seed=None):
+        """
+        Creates an empty sketch.
+
+        Args:
+            k (int): Accuracy parameter; larger k means smaller error and more retained items.
+            seed (int, optional): Seed for the random compaction offsets (for reproducible results).
+        """
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.min_value = np.nan
+        self.max_value = np.nan
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        """
+        Capacity of a level; lower levels get geometrically smaller (factor 2/3) capacities.
+
+        Args:
+            level (int): Level number (0 is the level receiving new values).
+
+        Returns:
+            int: Maximum number of items the level holds before it is compacted.
+        """
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        """
+        Compacts full levels until the sketch fits in its total capacity.
+        """
+        while sum(len(items) for items in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            for level, items in enumerate(self.levels):
+                if len(items) < self._capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # With an odd number of items one stays behind so the weights stay exact
+                held = len(items) % 2
+                promoted = items[held:][self.rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = items[:held]
+                break
+
+    def update(self, values):
+        """
+        Adds a batch of values (NaN values are ignored).
+
+        Args:
+            values (array-like): New observations.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.n += values.size
+        self.min_value = np.nanmin([self.min_value, values.min()])
+        self.max_value = np.nanmax([self.max_value, values.max()])
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """
+        Merges another sketch into this one (e.g. to combine locations).
+
+        Args:
+            other (KLLSketch): Sketch to merge; it is left unchanged.
+
+        Returns:
+            KLLSketch: This sketch, for chaining.
+        """
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.min_value = np.nanmin([self.min_value, other.min_value])
+        self.max_value = np.nanmax([self.max_value, other.max_value])
+        self._compress()
+        return self
+
+    def _weighted_items(self):
+        """
+        Sorted retained items with their cumulative weights.
+
+        Returns:
+            tuple: Sorted items and their cumulative weights.
+        """
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs):
+        """
+        Approximate quantiles.
+
+        Args:
+            qs (array-like): Quantile levels between 0 and 1.
+
+        Returns:
+            ndarray: Approximate values at the requested quantiles (NaN for an empty sketch).
+        """
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        items, cumulative = self._weighted_items()
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+        result = items[np.minimum(positions, len(items) - 1)]
+        result = np.where(qs <= 0, self.min_value, result)
+        return np.where(qs >= 1, self.max_value, result)
+
+    def quantile(self, q):
+        """
+        Approximate quantile.
+
+        Args:
+            q (float): Quantile level between 0 and 1.
+
+        Returns:
+            float: Approximate value at quantile q.
+        """
+        return float(self.quantiles([q])[0])
+
+    def rank(self, value):
+        """
+        Approximate fraction of the values that are less than or equal to `value`.
+
+        Args:
+            value (float): Value to rank.
+
+        Returns:
+            float: Normalized rank between 0 and 1.
+        """
+        if self.n == 0:
+            return np.nan
+        items, cumulative = self._weighted_items()
+        position = np.searchsorted(items, value, side='right')
+        return float(cumulative[position - 1] / cumulative[-1]) if position > 0 else 0.0
+
+    def to_dict(self):
+        """
+        Serializes the sketch to a JSON-compatible dict.
+
+        Returns:
+            dict: Sketch state.
+        """
+        return {
+            'k': self.k,
+            'n': self.n,
+            'min': None if np.isnan(self.min_value) else float(self.min_value),
+            'max': None if np.isnan(self.max_value) else float(self.max_value),
+            'levels': [items.tolist() for items in self.levels]
+        }
+
+    @classmethod
+    def from_dict(cls, state, seed=None):
+        """
+        Restores a sketch serialized with `to_dict`.
+
+        Args:
+            state (dict): Sketch state.
+            seed (int, optional): Seed for future compactions.
+
+        Returns:
+            KLLSketch: The restored sketch.
+        """
+        sketch = cls(k=state['k'], seed=seed)
+        sketch.n = state['n']
+        sketch.min_value = np.nan if state['min'] is None else state['min']
+        sketch.max_value = np.nan if state['max'] is None else state['max']
+        sketch.levels = [np.asarray(items, dtype=float) for items in state['levels']] or [np.empty(0)]
+        return sketch
+
+
+class QuantileSketchStore:
+    """
+    Persistent per-(location, variable) quantile sketches kept in the SQLite database.
+
+    Every sketch remembers the last date it has ingested, so `update` only feeds rows appended since
+    the previous run. Sketches are saved as JSON in the `quantile_sketches` table.
+
+    Attributes:
+        conn (Connection): SQLite connection object.
+        table_name (str): Table holding the sketches.
+        k (int): Accuracy parameter of new sketches.
+        sketches (dict): (location, variable) -> KLLSketch.
+        watermarks (dict): (location, variable) -> last ingested timestamp.
+    """
+
+    def __init__(self, conn, table_name='quantile_sketches', k=200, seed=None):
+        """
+        Loads the stored sketches (if any).
+
+        Args:
+            conn (Connection): SQLite connection object.
+            table_name (str): Table holding the sketches.
+            k (int): Accuracy parameter of new sketches.
+            seed (int, optional): Seed for the compaction offsets of new sketches.
+        """
+        self.conn = conn
+        self.table_name = table_name
+        self.k = k
+        self.seed = seed
+        self.sketches = {}
+        self.watermarks = {}
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} "
+                     "(location TEXT, variable TEXT, last_date TEXT, sketch TEXT, PRIMARY KEY (location, variable))")
+        for location, variable, last_date, sketch in conn.execute(
+                f"SELECT location, variable, last_date, sketch FROM {table_name}"):
+            self.sketches[(location, variable)] = KLLSketch.from_dict(json.loads(sketch), seed=seed)
+            self.watermarks[(location, variable)] = pd.Timestamp(last_date)
+
+    def update(self, data, variables, location_column='location'):
+        """
+        Feeds rows newer than each sketch's watermark into the sketches and saves them.
+
+        Args:
+            data (DataFrame): Daily weather data indexed by date.
+            variables (list): Columns to sketch.
+            location_column (str): Column with the location name ('' is used when it is missing).
+
+        Returns:
+            int: Number of (row, variable) values fed into the sketches.
+        """
+        locations = data[location_column] if location_column in data.columns else pd.Series('', index=data.index)
+        ingested = 0
+        for location, rows in data.groupby(locations.to_numpy()):
+            for variable in variables:
+                key = (location, variable)
+                watermark = self.watermarks.get(key)
+                new_rows = rows if watermark is None else rows[rows.index > watermark]
+                if new_rows.empty:
+                    continue
+                sketch = self.sketches.setdefault(key, KLLSketch(k=self.k, seed=self.seed))
+                sketch.update(new_rows[variable].to_numpy())
+                self.watermarks[key] = new_rows.index.max()
+                ingested += len(new_rows)
+        self.save()
+        return ingested
+
+    def save(self):
+        """
+        Writes all sketches and watermarks to the database.
+        """
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {self.table_name} (location, variable, last_date, sketch) VALUES (?, ?, ?, ?)",
+            [(location, variable, str(self.watermarks[(location, variable)]), json.dumps(sketch.to_dict()))
+             for (location, variable), sketch in self.sketches.items()])
+        self.conn.commit()
+
+    def merged(self, variable, locations=None):
+        """
+        Sketch of one variable merged across locations.
+
+        Args:
+            variable (str): Variable name.
+            locations (list, optional): Locations to merge; defaults to all.
+
+        Returns:
+            KLLSketch: Merged sketch.
+        """
+        merged = KLLSketch(k=self.k, seed=self.seed)
+        for (location, name), sketch in self.sketches.items():
+            if name == variable and (locations is None or location in locations):
+                merged.merge(sketch)
+        return merged
+
+    def sketches_for(self, variables, locations=None):
+        """
+        Merged sketches for several variables, e.g. for ExtremeWeatherAnalyzer.define_thresholds.
+
+        Args:
+            variables (list): Variable names.
+            locations (list, optional): Locations to merge; defaults to all.
+
+        Returns:
+            dict: Variable -> merged KLLSketch.
+        """
+        return {variable: self.merged(variable, locations) for variable in variables}
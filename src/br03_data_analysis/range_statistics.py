@@ -0,0 +1,260 @@
+import numpy as np
+import pandas as pd
+
+
+class _BlockSparseTable:
+    """
+    Constant-time range minimum (or maximum) queries in linear memory.
+
+    The series is cut into blocks; every position stores the running min/max from its block start
+    (prefix) and to its block end (suffix), and a sparse table covers the per-block results. A range
+    spanning several blocks is answered from one suffix, one prefix and two sparse-table entries;
+    a range inside one block scans at most `block_size` values.
+    """
+
+    def __init__(self, values, function, fill, block_size):
+        """
+        Args:
+            values (ndarray): Matrix of shape (rows, columns), NaN for missing values.
+            function (ufunc): np.minimum or np.maximum.
+            fill (float): Neutral element used for NaN and padding (+inf for min, -inf for max).
+            block_size (int): Number of rows per block.
+        """
+        self.function = function
+        self.fill = fill
+        self.block_size = block_size
+        n, columns = values.shape
+        n_blocks = max(1, -(-n // block_size))
+
+        padded = np.full((n_blocks * block_size, columns), fill)
+        padded[:n] = np.where(np.isnan(values), fill, values)
+        blocks = padded.reshape(n_blocks, block_size, columns)
+
+        self.padded = padded
+        self.prefix = function.accumulate(blocks, axis=1).reshape(-1, columns)
+        self.suffix = function.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, columns)
+        self.table = [function.reduce(blocks, axis=1)]
+        width = 1
+        while 2 * width <= n_blocks:
+            previous = self.table[-1]
+            self.table.append(function(previous[:-width], previous[width:]))
+            width *= 2
+
+    def query(self, left, right):
+        """
+        Reduces every range [left, right) with the table's function.
+
+        Args:
+            left (ndarray): Inclusive start positions.
+            right (ndarray): Exclusive end positions (must be greater than `left`).
+
+        Returns:
+            ndarray: Matrix of shape (ranges, columns).
+        """
+        last = right - 1
+        first_block = left // self.block_size
+        last_block = last // self.block_size
+        result = self.function(self.suffix[left], self.prefix[last])
+
+        # Whole blocks strictly between the first and the last block
+        inner = last_block - first_block - 1
+        levels = np.floor(np.log2(np.maximum(inner, 1))).astype(int)
+        for level in np.unique(levels[inner > 0]):
+            selected = (inner > 0) & (levels == level)
+            table = self.table[level]
+            middle = self.function(table[first_block[selected] + 1], table[last_block[selected] - 2 ** level])
+            result[selected] = self.function(result[selected], middle)
+
+        # Ranges inside a single block: scan the (short) block directly
+        single = np.flatnonzero(first_block == last_block)
+        if single.size:
+            offsets = np.arange(self.block_size)
+            rows = (first_block[single] * self.block_size)[:, None] + offsets
+            inside = (rows >= left[single, None]) & (rows <= last[single, None])
+            window = np.where(inside[:, :, None], self.padded[rows], self.fill)
+            result[single] = self.function.reduce(window, axis=1)
+        return result
+
+
+class RangeStatisticsIndex:
+    """
+    Answers count, sum, mean, std, min and max of any [start, end) window in constant time.
+
+    Cumulative sums of the values, of their squares and of the non-missing counts give totals, means
+    and standard deviations from two lookups; min and max come from block sparse tables. Values are
+    shifted by their column mean before accumulating so the sum of squares keeps its precision.
+
+    Attributes:
+        index (DatetimeIndex): Sorted timestamps of the indexed rows.
+        columns (list): Indexed variables.
+    """
+
+    def __init__(self, data, columns=None, block_size=32):
+        """
+        Builds the index over a time-indexed DataFrame.
+
+        Args:
+            data (DataFrame): Weather data indexed by timestamp.
+            columns (list, optional): Numeric columns to index; defaults to all numeric columns.
+            block_size (int): Block size of the min/max tables.
+        """
+        data = data.sort_index()
+        self.columns = list(columns) if columns is not None else list(data.select_dtypes('number').columns)
+        self.index = data.index
+        values = data[self.columns].to_numpy(dtype=float)
+
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=0)
+        self.shift = np.where(counts > 0, np.nansum(values, axis=0) / np.maximum(counts, 1), 0.0)
+        centered = np.where(valid, values - self.shift, 0.0)
+
+        zeros = np.zeros((1, len(self.columns)))
+        self.count_prefix = np.vstack([zeros, np.cumsum(valid, axis=0)])
+        self.sum_prefix = np.vstack([zeros, np.cumsum(centered, axis=0)])
+        self.square_prefix = np.vstack([zeros, np.cumsum(centered ** 2, axis=0)])
+        self.minimum = _BlockSparseTable(values, np.minimum, np.inf, block_size)
+        self.maximum = _BlockSparseTable(values, np.maximum, -np.inf, block_size)
+
+    def _positions(self, timestamps):
+        """
+        Converts timestamps to row positions (first row at or after each timestamp).
+
+        Args:
+            timestamps (array-like): Timestamps or date strings.
+
+        Returns:
+            ndarray: Row positions.
+        """
+        timestamps = pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(timestamps)))
+        if timestamps.tz is None and self.index.tz is not None:
+            timestamps = timestamps.tz_localize(self.index.tz)
+        return self.index.searchsorted(timestamps, side='left')
+
+    def _components(self, left, right):
+        """
+        Additive components (count, shifted sum, shifted sum of squares, min, max) of every window.
+
+        Args:
+            left (ndarray): Inclusive start positions.
+            right (ndarray): Exclusive end positions.
+
+        Returns:
+            dict: Arrays of shape (windows, columns).
+        """
+        count = self.count_prefix[right] - self.count_prefix[left]
+        total = self.sum_prefix[right] - self.sum_prefix[left]
+        squares = self.square_prefix[right] - self.square_prefix[left]
+        minimum = np.full(count.shape, np.inf)
+        maximum = np.full(count.shape, -np.inf)
+        non_empty = right > left
+        if non_empty.any():
+            minimum[non_empty] = self.minimum.query(left[non_empty], right[non_empty])
+            maximum[non_empty] = self.maximum.query(left[non_empty], right[non_empty])
+        return {'count': count, 'sum': total, 'squares': squares, 'min': minimum, 'max': maximum}
+
+    def _finalize(self, components):
+        """
+        Turns additive components into the reported statistics.
+
+        Args:
+            components (dict): Output of `_components` (possibly pooled over several windows).
+
+        Returns:
+            DataFrame: One row per window, (variable, statistic) columns like WeatherAnalyzer aggregations.
+        """
+        count = components['count']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_shifted = components['sum'] / count
+            variance = (components['squares'] - components['sum'] * mean_shifted) / (count - 1)
+        empty = count == 0
+        statistics = {
+            'count': count,
+            'sum': np.where(empty, 0.0, components['sum'] + self.shift * count),
+            'mean': np.where(empty, np.nan, mean_shifted + self.shift),
+            'std': np.where(count > 1, np.sqrt(np.clip(variance, 0, None)), np.nan),
+            'min': np.where(empty, np.nan, components['min']),
+            'max': np.where(empty, np.nan, components['max'])
+        }
+        return pd.DataFrame({
+            (column, name): values[:, position]
+            for position, column in enumerate(self.columns)
+            for name, values in statistics.items()
+        })
+
+    def _as_table(self, row):
+        """
+        Reshapes one result row into a variables x statistics table, keeping the column order.
+
+        Args:
+            row (Series): One row of a `_finalize` result.
+
+        Returns:
+            DataFrame: Variables as rows, statistics as columns.
+        """
+        return row.unstack().reindex(index=self.columns, columns=['count', 'sum', 'mean', 'std', 'min', 'max'])
+
+    def query_batch(self, starts, ends):
+        """
+        Statistics for many [start, end) windows in one vectorized call.
+
+        Args:
+            starts (array-like): Window start timestamps (inclusive).
+            ends (array-like): Window end timestamps (exclusive).
+
+        Returns:
+            DataFrame: One row per window with (variable, statistic) columns.
+        """
+        left, right = self._positions(starts), self._positions(ends)
+        right = np.maximum(left, right)
+        return self._finalize(self._components(left, right))
+
+    def query(self, start, end):
+        """
+        Statistics for a single [start, end) window.
+
+        Args:
+            start (str or Timestamp): Window start (inclusive).
+            end (str or Timestamp): Window end (exclusive).
+
+        Returns:
+            DataFrame: Variables as rows, statistics ('count', 'sum', 'mean', 'std', 'min', 'max') as columns.
+        """
+        return self._as_table(self.query_batch([start], [end]).iloc[0])
+
+    def query_recurring(self, start, end, years=None, by_year=False):
+        """
+        Statistics for the same calendar window in every year, e.g. "3-17 July across all years".
+
+        Args:
+            start (str): First day of the window as 'MM-DD' (inclusive).
+            end (str): Day after the window as 'MM-DD' (exclusive); a window may wrap into the next year.
+            years (list, optional): Years to include; defaults to every year in the index.
+            by_year (bool): Return one row per year instead of pooling all years together.
+
+        Returns:
+            DataFrame: (variable, statistic) columns, one pooled row or one row per year.
+        """
+        years = np.unique(self.index.year) if years is None else np.asarray(years)
+        start_month, start_day = (int(part) for part in start.split('-'))
+        end_month, end_day = (int(part) for part in end.split('-'))
+        wraps = (end_month, end_day) <= (start_month, start_day)
+        starts = [pd.Timestamp(year=year, month=start_month, day=1) + pd.Timedelta(days=start_day - 1)
+                  for year in years]
+        ends = [pd.Timestamp(year=year + int(wraps), month=end_month, day=1) + pd.Timedelta(days=end_day - 1)
+                for year in years]
+
+        left, right = self._positions(starts), self._positions(ends)
+        components = self._components(left, np.maximum(left, right))
+        if by_year:
+            result = self._finalize(components)
+            result.index = pd.Index(years, name='year')
+            return result
+
+        pooled = {
+            'count': components['count'].sum(axis=0, keepdims=True),
+            'sum': components['sum'].sum(axis=0, keepdims=True),
+            'squares': components['squares'].sum(axis=0, keepdims=True),
+            'min': components['min'].min(axis=0, keepdims=True),
+            'max': components['max'].max(axis=0, keepdims=True)
+        }
+        return self._as_table(self._finalize(pooled).iloc[0])
@@ -0,0 +1,2 @@
+# Seasons by calendar quarter (Winter = January-March), shared by every analysis and scoring stage
+SEASON_NAMES = {1: 'Winter', 2: 'Spring', 3: 'Summer', 4: 'Autumn'}
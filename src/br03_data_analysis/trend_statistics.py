@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+from scipy.special import erfc
+
+try:
+    from .seasons import SEASON_NAMES
+except ImportError:
+    from seasons import SEASON_NAMES
+
+
+def _pairwise(values, chunk_size):
+    """
+    Yields chunks of series together with the differences over every (i < j) pair of years.
+
+    Args:
+        values (ndarray): Matrix of shape (series, years), NaN for missing years.
+        chunk_size (int): Number of series handled per chunk (bounds the memory of the pair tensors).
+
+    Yields:
+        tuple: Slice of the chunk, the chunk values, the (series, pairs) difference matrix
+            and the (first, second) column indices of every pair.
+    """
+    first, second = np.triu_indices(values.shape[1], k=1)
+    for start in range(0, values.shape[0], chunk_size):
+        chunk = values[start:start + chunk_size]
+        yield slice(start, start + chunk_size), chunk, chunk[:, second] - chunk[:, first], (first, second)
+
+
+def mann_kendall(values, chunk_size=4096):
+    """
+    Mann-Kendall trend test for many series at once.
+
+    All pair differences are computed as one array operation per chunk of series, so there is no
+    Python loop per series. Missing years are skipped pairwise and ties are corrected in the variance.
+
+    Args:
+        values (ndarray): Matrix of shape (series, years), NaN for missing years.
+        chunk_size (int): Number of series handled per chunk.
+
+    Returns:
+        dict: Arrays 'n', 's', 'var_s', 'z' and 'p_value' with one entry per series.
+    """
+    values = np.asarray(values, dtype=float)
+    n = np.sum(~np.isnan(values), axis=1)
+    s = np.zeros(values.shape[0])
+    ties = np.zeros(values.shape[0])
+
+    for rows, chunk, differences, _ in _pairwise(values, chunk_size):
+        s[rows] = np.nansum(np.sign(differences), axis=1)
+        # Each value that appears t times adds t(t-1)(2t+5) to the tie correction; summing
+        # (c - 1)(2c + 5) over values, where c counts the equal values, gives the same total
+        equal = chunk[:, :, None] == chunk[:, None, :]
+        counts = np.where(np.isnan(chunk), 1, equal.sum(axis=2))
+        ties[rows] = np.sum((counts - 1) * (2 * counts + 5), axis=1)
+
+    var_s = (n * (n - 1) * (2 * n + 5) - ties) / 18.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.where(s > 0, (s - 1) / np.sqrt(var_s), np.where(s < 0, (s + 1) / np.sqrt(var_s), 0.0))
+    z = np.where((n >= 3) & (var_s > 0), z, np.nan)
+    p_value = erfc(np.abs(z) / np.sqrt(2))
+    return {'n': n, 's': s, 'var_s': var_s, 'z': z, 'p_value': p_value}
+
+
+def sens_slope(values, x=None, chunk_size=4096):
+    """
+    Sen's slope (median of all pairwise slopes) for many series at once.
+
+    Args:
+        values (ndarray): Matrix of shape (series, years), NaN for missing years.
+        x (array-like, optional): Position of each column (e.g. the years); defaults to 0..years-1.
+        chunk_size (int): Number of series handled per chunk.
+
+    Returns:
+        ndarray: Slope per series, in units of `values` per unit of `x`.
+    """
+    values = np.asarray(values, dtype=float)
+    x = np.arange(values.shape[1], dtype=float) if x is None else np.asarray(x, dtype=float)
+    slopes = np.full(values.shape[0], np.nan)
+
+    for rows, _, differences, (first, second) in _pairwise(values, chunk_size):
+        with np.errstate(invalid='ignore'):
+            pair_slopes = differences / (x[second] - x[first])
+        valid = ~np.isnan(pair_slopes).all(axis=1)
+        chunk_slopes = slopes[rows]  # view into `slopes`
+        chunk_slopes[valid] = np.nanmedian(pair_slopes[valid], axis=1)
+    return slopes
+
+
+def trend_table(daily_data, variables, period='month', location_column='location', alpha=0.05):
+    """
+    Computes Mann-Kendall and Sen's slope statistics for every (location x variable x period) series.
+
+    Each series is the yearly mean of a variable within one calendar month, season, or the whole year.
+    All series are stacked into one (series x years) matrix and tested in a single vectorized pass.
+
+    Args:
+        daily_data (DataFrame): Daily weather data indexed by date.
+        variables (list): Daily columns to test.
+        period (str): 'month', 'season' or 'year'.
+        location_column (str): Column with the location name, used when present.
+        alpha (float): Significance level for the 'trend' label.
+
+    Returns:
+        DataFrame: One row per series with 'n_years', 'mk_s', 'mk_var', 'z', 'p_value', 'sen_slope' and 'trend'.
+    """
+    index = daily_data.index
+    if period == 'month':
+        period_key = index.month
+    elif period == 'season':
+        period_key = index.quarter.map(SEASON_NAMES)
+    elif period == 'year':
+        period_key = np.full(len(index), 'Year')
+    else:
+        raise ValueError(f"Unknown period '{period}', expected 'month', 'season' or 'year'.")
+
+    keys = [pd.Index(period_key, name='period'), pd.Index(index.year, name='year')]
+    if location_column in daily_data.columns:
+        keys.insert(0, pd.Index(daily_data[location_column], name='location'))
+
+    yearly = daily_data[variables].groupby(keys).mean()
+    yearly.columns.name = 'variable'
+    # Rows become (location, period, variable) series, columns the years
+    matrix = yearly.stack(future_stack=True).unstack('year')
+    order = [name for name in ['location', 'variable', 'period'] if name in matrix.index.names]
+    matrix = matrix.reorder_levels(order).sort_index()
+
+    mk = mann_kendall(matrix.to_numpy())
+    slope = sens_slope(matrix.to_numpy(), x=matrix.columns.to_numpy())
+
+    result = matrix.index.to_frame(index=False)
+    result['n_years'] = mk['n']
+    result['mk_s'] = mk['s']
+    result['mk_var'] = mk['var_s']
+    result['z'] = mk['z']
+    result['p_value'] = mk['p_value']
+    result['sen_slope'] = slope
+    result['trend'] = np.where(mk['p_value'] < alpha,
+                               np.where(mk['s'] > 0, 'increasing', 'decreasing'), 'no trend')
+    return result
@@ -2,99 +2,98 @@ import sys
 import pandas as pd
 import numpy as np
 import sqlite3
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.svm import SVC
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, mean_absolute_error
 import seaborn as sns
 import matplotlib.pyplot as plt
 from datetime import datetime
 
-# Importing WeatherAnalyzer from the analyze_data script
-sys.path.append('/workspaces/weather-scraper-analyzer/src/03-data_analysis')
-from analyze_data import WeatherAnalyzer
+# Making the shared analysis modules importable
+sys.path.append('/workspaces/weather-scraper-analyzer/src/br03_data_analysis')
+from model_evaluation import evaluate_models
+from hyperparameter_search import halving_forest_search
+from model_engines import select_models, parity_report, LARGE_DATA_THRESHOLD
+from feature_store import FeatureStore, EVENT_FEATURE_SPEC
+from model_registry import save_model, load_model
+from incremental_training import IncrementalTrainer
+from calendar_matrix import day_hour_matrix
+
+# Folder of the persisted models (load them with model_registry.BatchPredictor.load)
+MODEL_DIR = r"/workspaces/weather-scraper-analyzer/output/models"
 
 if __name__ == '__main__':
         
     # Setting up the connection to the database
     conn = sqlite3.connect(r"/workspaces/weather-scraper-analyzer/data/weather_data.db")
-    hourly_df = pd.read_sql(r"SELECT * FROM hourly_data", conn)
-    daily_df = pd.read_sql(r"SELECT * FROM daily_data", conn)
-
-    # Dropping the index column
-    hourly_df = hourly_df.drop(columns='index')
-    daily_df = daily_df.drop(columns='index')
-
-    # Convert 'date' columns to datetime
-    hourly_df['date'] = pd.to_datetime(hourly_df['date'])
-    daily_df['date'] = pd.to_datetime(daily_df['date'])
-
-    # Setting the date as index
-    hourly_df = hourly_df.set_index('date')
-    daily_df = daily_df.set_index('date')
-
-    # Initialize WeatherAnalyzer
-    analyzer = WeatherAnalyzer(hourly_df, daily_df)
-
-    # Example Feature Engineering Using WeatherAnalyzer
-    # Aggregating data to create features (e.g., weekly or monthly averages)
-    weekly_data = analyzer.aggregate_hourly('week')
-    monthly_data = analyzer.aggregate_daily('month')
-
-    # Creating new features based on weather conditions
-    hourly_df['temperature_threshold'] = (hourly_df['temperature_2m_C'] > 20) & (hourly_df['temperature_2m_C'] < 30)
-    hourly_df['humidity_threshold'] = (hourly_df['relative_humidity_2m_percent'] > 30) & (hourly_df['relative_humidity_2m_percent'] < 70)
-    hourly_df['wind_threshold'] = hourly_df['wind_speed_10m_kmh'] < 15
-    hourly_df['precipitation_threshold'] = hourly_df['precipitation_mm'] < 1
-
-    # Combine features to create a target variable for event suitability
-    hourly_df['event_suitability'] = (
-        hourly_df['temperature_threshold'] &
-        hourly_df['humidity_threshold'] &
-        hourly_df['wind_threshold'] &
-        hourly_df['precipitation_threshold']
-    ).astype(int)
+
+    # Out-of-core mode: stream the table in chunks into a partial_fit model instead of loading it;
+    # a saved model only trains on the rows ingested since its last run
+    if '--out-of-core' in sys.argv:
+        try:
+            trainer, _ = load_model(MODEL_DIR, "Incremental MLP", mmap_mode=None)
+            print(f"Incremental MLP - New rows trained: {trainer.update(conn)}")
+        except FileNotFoundError:
+            trainer = IncrementalTrainer().fit(conn, epochs=10)
+        metrics = trainer.evaluate(conn)
+        print(f"Incremental MLP - Model Accuracy: {metrics['accuracy']:.2f} "
+              f"(majority class: {metrics['majority_baseline']:.2f})")
+        print(f"Incremental MLP - Mean Absolute Error: {metrics['mae']:.2f}")
+        save_model(trainer, MODEL_DIR, "Incremental MLP", EVENT_FEATURE_SPEC['inputs'],
+                   metrics={'accuracy': metrics['accuracy'], 'mae': metrics['mae']})
+        sys.exit(0)
+
+    # Engineered features are cached per data version (a content hash of the rows) as memory-mapped
+    # columns: an unchanged table skips feature engineering, and only rows appended since the last run
+    # go through it
+    feature_store = FeatureStore(conn, r"/workspaces/weather-scraper-analyzer/data/feature_store")
+    print(f"Feature store: {feature_store.refresh()} ({feature_store.metadata['n_rows']} rows)")
+    hourly_df = feature_store.frame()
 
     start_time = datetime.now()
 
     # Splitting data into features (X) and target (y)
-    X = hourly_df[['temperature_2m_C', 'relative_humidity_2m_percent', 'wind_speed_10m_kmh', 'precipitation_mm']]
-    y = hourly_df['event_suitability']
+    X = hourly_df[EVENT_FEATURE_SPEC['inputs']]
+    y = hourly_df[EVENT_FEATURE_SPEC['target']]
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-    # List of models to test
-    models = {
-        "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42),
-        "Gradient Boosting": GradientBoostingClassifier(n_estimators=100, learning_rate=0.1, random_state=42),
-        "Logistic Regression": LogisticRegression(max_iter=1000, random_state=42),
-        "K-Nearest Neighbors": KNeighborsClassifier(n_neighbors=5),
-        "Support Vector Machine": SVC(kernel='rbf', C=1.0)
-    }
-
-    # Applying cross-validation and model evaluation
-    for model_name, model in models.items():
-        # Cross-validation scores
-        cv_scores = cross_val_score(model, X, y, cv=5)
+    # List of models to test: above LARGE_DATA_THRESHOLD training rows SVC and Gradient Boosting
+    # are replaced by engines that scale (Nystroem + linear SVM, histogram gradient boosting)
+    models = select_models(len(X_train), n_features=X.shape[1])
+    if len(X_train) > LARGE_DATA_THRESHOLD:
+        print("Large-data engines vs exact models:")
+        print(parity_report(X_train, y_train, X_test, y_test))
+
+    # Cross-validating all models at once: every (model, fold) fit and the final fit on the whole
+    # training set run in their own worker processes, with the peak memory of every fit
+    evaluation_report, fitted_models = evaluate_models(models, X_train, y_train, cv=5, track_memory=True)
+    print(evaluation_report[['mean_score', 'std_score', 'wall_time_s', 'cpu_time_s', 'peak_memory_mb']])
+
+    # Applying model evaluation
+    for model_name in models:
+        cv_scores = evaluation_report.loc[model_name, 'fold_scores']
         print(f"{model_name} - Cross-Validation Scores: {cv_scores}")
         print(f"{model_name} - Average Cross-Validation Score: {cv_scores.mean():.2f}\n")
 
-        # Training the model on the training set
-        model.fit(X_train, y_train)
+        # Model fitted on the whole training set
+        model = fitted_models[model_name]
 
         # Model Evaluation
-        y_pred = model.predict(X_test)
+        y_pred = model.predict(X_test.to_numpy())
         accuracy = accuracy_score(y_test, y_pred)
         mae = mean_absolute_error(y_test, y_pred)
 
         print(f"{model_name} - Model Accuracy: {accuracy:.2f}")
         print(f"{model_name} - Mean Absolute Error: {mae:.2f}\n")
 
+        # Persisting the model, so the dashboard and scoring stage can predict without training
+        save_model(model, MODEL_DIR, model_name, X.columns, data_version=feature_store.data_version,
+                   metrics={'cv_score': cv_scores.mean(), 'accuracy': accuracy, 'mae': mae})
+
         # Visualization 1: Heatmap of Predicted Event Suitability
-        hourly_df['predicted_suitability'] = model.predict(X)
-        suitability_pivot = hourly_df.pivot_table(values='predicted_suitability', index=hourly_df.index.date, columns=hourly_df.index.hour)
+        hourly_df['predicted_suitability'] = model.predict(X.to_numpy())
+        suitability_pivot = day_hour_matrix(hourly_df['predicted_suitability'], cache=False)
 
         plt.figure(figsize=(12, 8))
         sns.heatmap(suitability_pivot, cmap='YlGnBu', cbar_kws={'label': 'Predicted Event Suitability'})
@@ -104,7 +103,8 @@ if __name__ == '__main__':
         plt.show()
 
         # Visualization 2: Heatmap of Actual Event Suitability
-        actual_suitability_pivot = hourly_df.pivot_table(values='event_suitability', index=hourly_df.index.date, columns=hourly_df.index.hour)
+        # The actual suitability matrix is identical for every model, so it comes from the shared cache
+        actual_suitability_pivot = day_hour_matrix(hourly_df['event_suitability'])
 
         plt.figure(figsize=(12, 8))
         sns.heatmap(actual_suitability_pivot, cmap='YlGnBu', cbar_kws={'label': 'Actual Event Suitability'})
@@ -148,17 +148,24 @@ if __name__ == '__main__':
         'max_depth': [5, 10, 15],
         'min_samples_split': [2, 5, 10]
     }
-    grid_search_rf = GridSearchCV(RandomForestClassifier(random_state=42), param_grid_rf, cv=5)
-    grid_search_rf.fit(X_train, y_train)
-    print("Best Hyperparameters for Random Forest:", grid_search_rf.best_params_)
+    # Successive halving with warm-started forests instead of fitting all 27 combinations on every fold;
+    # the result is cached in the output folder, so re-runs on the same data skip the search
+    search_rf = halving_forest_search(X_train, y_train, param_grid_rf, cv=5, time_budget=600,
+                                      data_version=feature_store.data_version,
+                                      cache_dir='/workspaces/weather-scraper-analyzer/output/search_cache')
+    print("Best Hyperparameters for Random Forest:", search_rf['best_params'])
+    print(f"Search finished: {search_rf['completed']} | From cache: {search_rf['from_cache']}")
 
     # Evaluating the best Random Forest model
-    best_rf_model = grid_search_rf.best_estimator_
-    y_pred_best_rf = best_rf_model.predict(X_test)
+    best_rf_model = RandomForestClassifier(**search_rf['best_params'], random_state=42)
+    best_rf_model.fit(X_train.to_numpy(), y_train)
+    y_pred_best_rf = best_rf_model.predict(X_test.to_numpy())
     best_rf_accuracy = accuracy_score(y_test, y_pred_best_rf)
     best_rf_mae = mean_absolute_error(y_test, y_pred_best_rf)
     print(f"Optimized Random Forest - Accuracy: {best_rf_accuracy:.2f}")
     print(f"Optimized Random Forest - Mean Absolute Error: {best_rf_mae:.2f}\n")
+    save_model(best_rf_model, MODEL_DIR, "Optimized Random Forest", X.columns, data_version=feature_store.data_version,
+               metrics={'cv_score': search_rf['best_score'], 'accuracy': best_rf_accuracy, 'mae': best_rf_mae})
 
     # Feature Importance Analysis
     importances = best_rf_model.feature_importances_
@@ -174,7 +181,7 @@ if __name__ == '__main__':
     print(f"Started at: {start_time}.\nDuration: {end_time-start_time}")
     print(f"""Finished with all the new features comparing to the cell above:
             Cross-validation for model evaluation.
-            Hyperparameter tuning using GridSearchCV.
+            Hyperparameter tuning using successive halving.
             Feature importance analysis for the Random Forest model.
             Visualizations maintained for all models and their comparisons.""")
 
@@ -0,0 +1,269 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Event suitability features of 04-ML1: every threshold is (column, lower bound, upper bound), both exclusive
+# (None for an open bound); the target is the combination of all thresholds
+EVENT_FEATURE_SPEC = {
+    'inputs': ['temperature_2m_C', 'relative_humidity_2m_percent', 'wind_speed_10m_kmh', 'precipitation_mm'],
+    'thresholds': {
+        'temperature_threshold': ['temperature_2m_C', 20, 30],
+        'humidity_threshold': ['relative_humidity_2m_percent', 30, 70],
+        'wind_threshold': ['wind_speed_10m_kmh', None, 15],
+        'precipitation_threshold': ['precipitation_mm', None, 1]
+    },
+    'target': 'event_suitability'
+}
+
+
+def build_features(data, spec):
+    """
+    Computes the engineered feature columns of a feature spec.
+
+    Args:
+        data (DataFrame): Source rows with the spec's input columns.
+        spec (dict): Feature spec with 'inputs', 'thresholds' and 'target'.
+
+    Returns:
+        dict: Column name -> array (inputs as float64, thresholds and target as int8).
+    """
+    columns = {name: data[name].to_numpy(dtype=np.float64) for name in spec['inputs']}
+    target = np.ones(len(data), dtype=bool)
+    for name, (source, lower, upper) in spec['thresholds'].items():
+        values = data[source].to_numpy(dtype=np.float64)
+        flag = np.ones(len(data), dtype=bool)
+        if lower is not None:
+            flag &= values > lower
+        if upper is not None:
+            flag &= values < upper
+        columns[name] = flag.astype(np.int8)
+        target &= flag
+    columns[spec['target']] = target.astype(np.int8)
+    return columns
+
+
+class FeatureStore:
+    """
+    Versioned cache of engineered features, stored as memory-mapped column files.
+
+    The store for a (table, feature spec) pair lives in its own folder, named after a hash of the spec.
+    The data version is a content hash of the stored date and input columns, so the same rows give the
+    same version whether the store was built in one go or appended to. `refresh` reads only those
+    columns from the table and hashes them the same way: an unchanged table skips feature engineering,
+    rows appended after unchanged stored rows are the only ones read in full and engineered, and
+    anything else (deleted, rewritten or updated rows) triggers a full rebuild.
+
+    Attributes:
+        conn (Connection): SQLite connection object.
+        table_name (str): Source table.
+        spec (dict): Feature spec.
+        path (str): Folder holding the column files and metadata.json.
+        metadata (dict): Row count, last rowid, content hash and column dtypes of the stored features.
+    """
+
+    def __init__(self, conn, cache_dir, table_name='hourly_data', spec=EVENT_FEATURE_SPEC):
+        """
+        Opens (or prepares) the store for a table and feature spec.
+
+        Args:
+            conn (Connection): SQLite connection object.
+            cache_dir (str): Folder holding all feature stores.
+            table_name (str): Source table.
+            spec (dict): Feature spec (see EVENT_FEATURE_SPEC).
+        """
+        self.conn = conn
+        self.table_name = table_name
+        self.spec = spec
+        spec_hash = hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, f"{table_name}_{spec_hash}")
+        self.metadata = None
+        metadata_file = os.path.join(self.path, 'metadata.json')
+        if os.path.exists(metadata_file):
+            with open(metadata_file) as file:
+                self.metadata = json.load(file)
+
+    @property
+    def data_version(self):
+        """
+        Content hash of the stored rows and the spec, e.g. as a cache key for model searches.
+
+        Returns:
+            str: Version string (None before the first refresh).
+        """
+        if self.metadata is None:
+            return None
+        return f"{os.path.basename(self.path)}_{self.metadata['content_hash'][:16]}"
+
+    def refresh(self):
+        """
+        Brings the stored features up to date with the source table.
+
+        Returns:
+            str: 'cached' (nothing to do), 'appended' (only new rows engineered) or 'rebuilt'.
+        """
+        rowids, source = self._source_columns()
+        if self.metadata is not None and self.metadata.get('content_hash') is not None:
+            if self._content_hash(source) == self.metadata['content_hash']:
+                return 'cached'
+            n_rows = self.metadata['n_rows']
+            if 0 < n_rows < len(rowids) and self._content_hash(source, n_rows) == self.metadata['content_hash']:
+                self._append(int(rowids[n_rows - 1]))
+                self._save_content_hash()
+                return 'appended'
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path)
+        self.metadata = {'table': self.table_name, 'spec': self.spec, 'n_rows': 0, 'last_rowid': None,
+                         'content_hash': None, 'columns': {}, 'tz': None}
+        self._append(None)
+        self._save_content_hash()
+        return 'rebuilt'
+
+    def _hashed_names(self):
+        """
+        Columns covered by the content hash: the date and the spec's inputs (every other stored column
+        is derived from them).
+
+        Returns:
+            list: Column names.
+        """
+        return ['date'] + list(self.spec['inputs'])
+
+    def _source_columns(self):
+        """
+        Reads the hashed columns of the source table, converted as they are stored.
+
+        Returns:
+            ndarray: Rowids in table order.
+            dict: Column name -> array (the date as int64 nanoseconds, inputs as float64).
+        """
+        names = ', '.join(self.spec['inputs'])
+        data = pd.read_sql(f"SELECT rowid AS source_rowid, date, {names} FROM {self.table_name} ORDER BY rowid",
+                           self.conn)
+        columns = {name: data[name].to_numpy(dtype=np.float64) for name in self.spec['inputs']}
+        columns['date'] = pd.DatetimeIndex(pd.to_datetime(data['date'])).asi8
+        return data['source_rowid'].to_numpy(), columns
+
+    def _content_hash(self, columns, n_rows=None):
+        """
+        SHA-256 of the hashed columns, column by column.
+
+        Args:
+            columns (dict): Column name -> array (source columns or the stored memory maps).
+            n_rows (int, optional): Only hash the first rows.
+
+        Returns:
+            str: Hex digest.
+        """
+        digest = hashlib.sha256()
+        for name in self._hashed_names():
+            digest.update(np.ascontiguousarray(columns[name][:n_rows]).tobytes())
+        return digest.hexdigest()
+
+    def _save_content_hash(self):
+        """
+        Stores the content hash of the columns now in the store.
+        """
+        names = self._hashed_names()
+        stored = {name: self.column(name) if self.metadata['n_rows'] else np.empty(0) for name in names}
+        self.metadata['content_hash'] = self._content_hash(stored)
+        with open(os.path.join(self.path, 'metadata.json'), 'w') as file:
+            json.dump(self.metadata, file)
+
+    def _append(self, after_rowid):
+        """
+        Engineers the rows after `after_rowid` and appends them to the column files.
+
+        Args:
+            after_rowid (int, optional): Last rowid already stored (None to read the whole table).
+        """
+        query = f"SELECT rowid AS source_rowid, * FROM {self.table_name}"
+        if after_rowid is None:
+            data = pd.read_sql(query + " ORDER BY rowid", self.conn)
+        else:
+            data = pd.read_sql(query + " WHERE rowid > ? ORDER BY rowid", self.conn, params=(after_rowid,))
+        if data.empty:
+            return
+
+        dates = pd.DatetimeIndex(pd.to_datetime(data['date']))
+        columns = build_features(data, self.spec)
+        columns['date'] = dates.asi8
+        n_rows = self.metadata['n_rows']
+        for name, values in columns.items():
+            dtype = np.dtype(values.dtype)
+            file_name = os.path.join(self.path, f"{name}.bin")
+            with open(file_name, 'ab') as file:
+                # Drop anything written after the last consistent metadata (e.g. an interrupted append)
+                file.truncate(n_rows * dtype.itemsize)
+                file.write(np.ascontiguousarray(values).tobytes())
+            self.metadata['columns'][name] = dtype.str
+
+        self.metadata['n_rows'] = n_rows + len(data)
+        self.metadata['last_rowid'] = int(data['source_rowid'].iloc[-1])
+        self.metadata['tz'] = str(dates.tz) if dates.tz is not None else None
+        with open(os.path.join(self.path, 'metadata.json'), 'w') as file:
+            json.dump(self.metadata, file)
+
+    def column(self, name):
+        """
+        Read-only memory-mapped view of one stored column (no copy, no parsing).
+
+        Args:
+            name (str): Column name (an input, threshold, the target or 'date').
+
+        Returns:
+            memmap: Column values.
+        """
+        dtype = np.dtype(self.metadata['columns'][name])
+        if self.metadata['n_rows'] == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=dtype, mode='r',
+                         shape=(self.metadata['n_rows'],))
+
+    def dates(self):
+        """
+        Timestamps of the stored rows.
+
+        Returns:
+            DatetimeIndex: Dates in the source table's time zone.
+        """
+        dates = pd.DatetimeIndex(self.column('date').view('datetime64[ns]'), name='date')
+        return dates.tz_localize('UTC').tz_convert(self.metadata['tz']) if self.metadata['tz'] else dates
+
+    def matrix(self, names=None):
+        """
+        Feature matrix for training or scoring, assembled from the memory-mapped columns.
+
+        Args:
+            names (list, optional): Columns to stack; defaults to the spec's inputs.
+
+        Returns:
+            ndarray: Matrix of shape (rows, columns).
+        """
+        names = self.spec['inputs'] if names is None else names
+        return np.column_stack([self.column(name) for name in names])
+
+    def target(self):
+        """
+        Target column of the spec.
+
+        Returns:
+            memmap: Target values.
+        """
+        return self.column(self.spec['target'])
+
+    def frame(self, names=None):
+        """
+        Stored columns as a DataFrame indexed by date.
+
+        Args:
+            names (list, optional): Columns to include; defaults to every stored feature column.
+
+        Returns:
+            DataFrame: Feature columns indexed by date.
+        """
+        names = [name for name in self.metadata['columns'] if name != 'date'] if names is None else names
+        return pd.DataFrame({name: self.column(name) for name in names}, index=self.dates())
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import hashlib
+import numpy as np
+import pandas as pd
+from itertools import product
+from joblib import Parallel, delayed, hash as joblib_hash
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+
+def _evaluate_candidate(params, forest, X, y, train_index, test_index, resource, resource_value, random_state):
+    """
+    Fits and scores one candidate on one fold at the given resource level (runs inside a worker process).
+
+    Args:
+        params (dict): Random Forest parameters of the candidate.
+        forest (RandomForestClassifier, optional): Forest of the previous round (n_estimators resource only).
+        X (ndarray): Feature matrix.
+        y (ndarray): Target vector.
+        train_index (ndarray): Rows used for fitting.
+        test_index (ndarray): Rows used for scoring.
+        resource (str): 'n_estimators' or 'n_samples'.
+        resource_value (int): Number of trees or training rows for this round.
+        random_state (int): Seed of the forests and of the row subsampling.
+
+    Returns:
+        tuple: Accuracy on the fold and the forest to grow in the next round (None for 'n_samples').
+    """
+    if resource == 'n_estimators':
+        if forest is None:
+            forest = RandomForestClassifier(**params, warm_start=True, random_state=random_state)
+        # With warm_start the forest keeps its trees and only the missing ones are fitted
+        forest.set_params(n_estimators=resource_value)
+        forest.fit(X[train_index], y[train_index])
+        return forest.score(X[test_index], y[test_index]), forest
+
+    rows = np.random.default_rng(random_state).permutation(train_index)[:resource_value]
+    model = RandomForestClassifier(**params, random_state=random_state).fit(X[rows], y[rows])
+    return model.score(X[test_index], y[test_index]), None
+
+
+def _cache_path(cache_dir, X, y, param_grid, settings, data_version):
+    """
+    Cache file of a search, keyed by the data version, the grid and the search settings.
+
+    Args:
+        cache_dir (str): Folder holding the cached searches.
+        X (ndarray): Feature matrix (hashed when no data version is given).
+        y (ndarray): Target vector (hashed when no data version is given).
+        param_grid (dict): Parameter grid.
+        settings (dict): Other search settings that change the result.
+        data_version (str, optional): Version string of the data.
+
+    Returns:
+        str: Path of the JSON cache file.
+    """
+    version = data_version if data_version is not None else joblib_hash((X, y))
+    key = json.dumps({'data': version, 'grid': param_grid, 'settings': settings}, sort_keys=True, default=str)
+    return os.path.join(cache_dir, f"forest_search_{hashlib.sha256(key.encode()).hexdigest()[:16]}.json")
+
+
+def halving_forest_search(X, y, param_grid, cv=5, resource='n_estimators', factor=3, min_resource=None,
+                          n_jobs=-1, time_budget=None, cache_dir=None, data_version=None, random_state=42):
+    """
+    Successive-halving search over a Random Forest parameter grid.
+
+    All candidates start with a small resource (few trees or few training rows); after each round only
+    the best 1/factor of them continue with factor times more resource, until one candidate has been
+    evaluated with the full resource. All (candidate, fold) fits of a round run in parallel. With
+    resource='n_estimators' the forests are warm-started, so a surviving candidate only fits the
+    additional trees of each round; the 'n_estimators' values of the grid then only set the full
+    resource (their maximum).
+
+    Args:
+        X (DataFrame or ndarray): Feature matrix.
+        y (Series or ndarray): Target vector.
+        param_grid (dict): Parameter name -> list of values, as for GridSearchCV.
+        cv (int): Number of stratified folds.
+        resource (str): 'n_estimators' (grow forests) or 'n_samples' (grow the training rows).
+        factor (int): Fraction of candidates kept (1/factor) and resource growth per round.
+        min_resource (int, optional): Resource of the first round; derived from the number of rounds if not given.
+        n_jobs (int): Number of worker processes (-1 for all cores).
+        time_budget (float, optional): Wall-clock budget in seconds, checked before each round; when it
+            runs out the best candidate of the last completed round is returned.
+        cache_dir (str, optional): Folder for cached results; a cached (completed) search is returned without fitting.
+        data_version (str, optional): Version string of the data for the cache key; the data is hashed if not given.
+        random_state (int): Seed of the forests.
+
+    Returns:
+        dict: 'best_params', 'best_score', 'history' (DataFrame with one row per round and candidate),
+        'completed' (False if stopped by the time budget), 'elapsed_s' and 'from_cache'.
+    """
+    X = np.asarray(X.to_numpy() if isinstance(X, pd.DataFrame) else X, dtype=float)
+    y = np.asarray(y)
+    if resource not in ('n_estimators', 'n_samples'):
+        raise ValueError(f"Unknown resource '{resource}', expected 'n_estimators' or 'n_samples'.")
+
+    cache_file = None
+    if cache_dir is not None:
+        settings = {'cv': cv, 'resource': resource, 'factor': factor, 'min_resource': min_resource,
+                    'random_state': random_state}
+        cache_file = _cache_path(cache_dir, X, y, param_grid, settings, data_version)
+        if os.path.exists(cache_file):
+            with open(cache_file) as file:
+                cached = json.load(file)
+            cached['history'] = pd.DataFrame(cached['history'])
+            cached['from_cache'] = True
+            return cached
+
+    start = time.perf_counter()
+    folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+    grid = {name: values for name, values in param_grid.items() if not (resource == 'n_estimators' and name == 'n_estimators')}
+    candidates = [dict(zip(grid, values)) for values in product(*grid.values())]
+    if resource == 'n_estimators':
+        max_resource = max(param_grid.get('n_estimators', [100]))
+    else:
+        max_resource = min(len(train_index) for train_index, _ in folds)
+    n_rounds = int(np.ceil(np.log(len(candidates)) / np.log(factor))) + 1 if len(candidates) > 1 else 1
+    if min_resource is None:
+        min_resource = max(1, max_resource // factor ** (n_rounds - 1))
+
+    forests = {position: [None] * cv for position in range(len(candidates))}
+    alive = list(range(len(candidates)))
+    history, completed = [], True
+    best_position, best_score = alive[0], np.nan
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for round_number in range(n_rounds):
+            if time_budget is not None and round_number > 0 and time.perf_counter() - start > time_budget:
+                completed = False
+                break
+            last_round = round_number == n_rounds - 1
+            resource_value = max_resource if last_round else min(max_resource, min_resource * factor ** round_number)
+            results = parallel(
+                delayed(_evaluate_candidate)(candidates[position], forests[position][fold], X, y, train_index,
+                                             test_index, resource, resource_value, random_state)
+                for position in alive
+                for fold, (train_index, test_index) in enumerate(folds)
+            )
+            scores = {}
+            for job, (score, forest) in enumerate(results):
+                position, fold = alive[job // cv], job % cv
+                forests[position][fold] = forest
+                scores.setdefault(position, []).append(score)
+            mean_scores = {position: float(np.mean(values)) for position, values in scores.items()}
+            for position, score in mean_scores.items():
+                history.append({'round': round_number, resource: resource_value,
+                                'params': candidates[position], 'mean_score': score})
+
+            ranked = sorted(alive, key=lambda position: -mean_scores[position])
+            best_position, best_score = ranked[0], mean_scores[ranked[0]]
+            keep = max(1, int(np.ceil(len(alive) / factor)))
+            for position in ranked[keep:]:
+                del forests[position]
+            alive = ranked[:keep]
+
+    best_params = dict(candidates[best_position])
+    if resource == 'n_estimators':
+        best_params['n_estimators'] = max_resource
+    result = {'best_params': best_params, 'best_score': best_score, 'history': history,
+              'completed': completed, 'elapsed_s': time.perf_counter() - start, 'from_cache': False}
+    # A search cut short by the time budget is not cached, so a later run can finish it
+    if cache_file is not None and completed:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_file, 'w') as file:
+            json.dump(result, file, default=str)
+    result['history'] = pd.DataFrame(history)
+    return result
@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+try:
+    from .feature_store import build_features, EVENT_FEATURE_SPEC
+except ImportError:
+    from feature_store import build_features, EVENT_FEATURE_SPEC
+
+
+def is_test_row(rowids, test_size=0.2):
+    """
+    Stable train/test assignment from the row id, so every chunk (and every later run) agrees on it.
+
+    Args:
+        rowids (ndarray): SQLite rowids.
+        test_size (float): Fraction of rows held out for evaluation.
+
+    Returns:
+        ndarray: True for held-out rows.
+    """
+    # Multiplicative hashing spreads consecutive rowids (consecutive hours) evenly over both sets
+    hashed = (np.asarray(rowids, dtype=np.uint64) * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    return hashed < np.uint64(test_size * 2 ** 32)
+
+
+def iter_feature_chunks(conn, table_name='hourly_data', spec=EVENT_FEATURE_SPEC, chunk_size=50_000, after_rowid=None):
+    """
+    Streams engineered features from the database, one chunk of rows at a time.
+
+    Args:
+        conn (Connection): SQLite connection object.
+        table_name (str): Source table.
+        spec (dict): Feature spec (see feature_store.EVENT_FEATURE_SPEC).
+        chunk_size (int): Number of rows per chunk; memory use is bounded by it.
+        after_rowid (int, optional): Only rows with a larger rowid are read.
+
+    Yields:
+        tuple: Rowids, feature matrix and target of the chunk.
+    """
+    query = f"SELECT rowid AS source_rowid, * FROM {table_name} WHERE rowid > ? ORDER BY rowid"
+    for chunk in pd.read_sql(query, conn, params=(-1 if after_rowid is None else after_rowid,), chunksize=chunk_size):
+        if chunk.empty:
+            continue
+        columns = build_features(chunk, spec)
+        X = np.column_stack([columns[name] for name in spec['inputs']])
+        yield chunk['source_rowid'].to_numpy(), X, columns[spec['target']]
+
+
+class IncrementalTrainer:
+    """
+    Out-of-core training of a `partial_fit` model on chunks streamed from SQLite.
+
+    Features are standardized with running statistics (StandardScaler.partial_fit, during the first
+    epoch of `fit` only) before each chunk goes to the model. The default model is a small neural
+    network: the event target combines two-sided bands (e.g. 20 < temperature < 30) that a linear
+    model cannot separate. The trainer remembers the last rowid it has trained on, so `update` after
+    ingesting new data only streams the new rows. Rows are split into train and test sets by a hash
+    of their rowid, so the split never needs the whole table in memory. The trainer has `predict` and
+    `predict_proba`, so it can be saved with model_registry.save_model and served by BatchPredictor.
+
+    Attributes:
+        model (estimator): Classifier supporting partial_fit (MLPClassifier by default).
+        scaler (StandardScaler): Running feature scaler (frozen after the first epoch of `fit`).
+        spec (dict): Feature spec.
+        classes (ndarray): All target classes (partial_fit needs them up front).
+        test_size (float): Fraction of rows held out for evaluation.
+        last_rowid (int): Last rowid the model has been trained on (None before training).
+        n_trained (int): Number of training rows seen.
+    """
+
+    def __init__(self, model=None, spec=EVENT_FEATURE_SPEC, classes=(0, 1), test_size=0.2):
+        """
+        Args:
+            model (estimator, optional): Classifier supporting partial_fit.
+            spec (dict): Feature spec.
+            classes (tuple): All target classes.
+            test_size (float): Fraction of rows held out for evaluation.
+        """
+        self.model = model if model is not None else \
+            MLPClassifier(hidden_layer_sizes=(32, 16), learning_rate_init=0.01, random_state=42)
+        self.scaler = StandardScaler()
+        self.spec = spec
+        self.classes = np.asarray(classes)
+        self.test_size = test_size
+        self.last_rowid = None
+        self.n_trained = 0
+
+    def _train_chunk(self, rowids, X, y, new_rows=True, fit_scaler=False):
+        """
+        Updates the model (and optionally the scaler) with the training rows of one chunk.
+
+        Args:
+            rowids (ndarray): Rowids of the chunk.
+            X (ndarray): Feature matrix of the chunk.
+            y (ndarray): Target of the chunk.
+            new_rows (bool): Count the rows in n_trained (False on later epochs of `fit`).
+            fit_scaler (bool): Update the scaler statistics (first epoch of `fit` only).
+        """
+        train = ~is_test_row(rowids, self.test_size)
+        if train.any():
+            if fit_scaler:
+                self.scaler.partial_fit(X[train])
+            if new_rows:
+                self.n_trained += int(train.sum())
+            self.model.partial_fit(self.scaler.transform(X[train]), y[train], classes=self.classes)
+
+    def fit(self, conn, table_name='hourly_data', chunk_size=50_000, epochs=1):
+        """
+        Trains from scratch by streaming the whole table.
+
+        Args:
+            conn (Connection): SQLite connection object.
+            table_name (str): Source table.
+            chunk_size (int): Number of rows per chunk.
+            epochs (int): Number of passes over the table.
+
+        Returns:
+            IncrementalTrainer: This trainer, for chaining.
+        """
+        self.model = clone(self.model)
+        self.scaler = StandardScaler()
+        self.n_trained = 0
+        for epoch in range(epochs):
+            for rowids, X, y in iter_feature_chunks(conn, table_name, self.spec, chunk_size):
+                self._train_chunk(rowids, X, y, new_rows=epoch == 0, fit_scaler=epoch == 0)
+                self.last_rowid = int(rowids[-1])
+        return self
+
+    def update(self, conn, table_name='hourly_data', chunk_size=50_000):
+        """
+        Continues training with the rows ingested since the last fit or update (the scaler stays as fitted).
+
+        Args:
+            conn (Connection): SQLite connection object.
+            table_name (str): Source table.
+            chunk_size (int): Number of rows per chunk.
+
+        Returns:
+            int: Number of new rows streamed (training and test rows).
+        """
+        n_rows = 0
+        for rowids, X, y in iter_feature_chunks(conn, table_name, self.spec, chunk_size, self.last_rowid):
+            self._train_chunk(rowids, X, y)
+            self.last_rowid = int(rowids[-1])
+            n_rows += len(rowids)
+        return n_rows
+
+    def evaluate(self, conn, table_name='hourly_data', chunk_size=50_000):
+        """
+        Streaming evaluation on the held-out rows (up to the last trained rowid).
+
+        Args:
+            conn (Connection): SQLite connection object.
+            table_name (str): Source table.
+            chunk_size (int): Number of rows per chunk.
+
+        Returns:
+            dict: 'accuracy', 'majority_baseline' (accuracy of always predicting the most frequent class),
+            'mae', 'n_test' and the confusion counts 'tp', 'fp', 'tn', 'fn'.
+        """
+        counts = {'tp': 0, 'fp': 0, 'tn': 0, 'fn': 0}
+        absolute_error = 0.0
+        for rowids, X, y in iter_feature_chunks(conn, table_name, self.spec, chunk_size):
+            test = is_test_row(rowids, self.test_size)
+            if self.last_rowid is not None:
+                test &= rowids <= self.last_rowid
+            if not test.any():
+                continue
+            predicted, actual = self.predict(X[test]), y[test]
+            absolute_error += float(np.abs(predicted - actual).sum())
+            counts['tp'] += int(((predicted == 1) & (actual == 1)).sum())
+            counts['fp'] += int(((predicted == 1) & (actual == 0)).sum())
+            counts['tn'] += int(((predicted == 0) & (actual == 0)).sum())
+            counts['fn'] += int(((predicted == 0) & (actual == 1)).sum())
+        n_test = sum(counts.values())
+        majority = max(counts['tp'] + counts['fn'], counts['tn'] + counts['fp'])
+        return {'accuracy': (counts['tp'] + counts['tn']) / n_test if n_test else np.nan,
+                'majority_baseline': majority / n_test if n_test else np.nan,
+                'mae': absolute_error / n_test if n_test else np.nan, 'n_test': n_test, **counts}
+
+    def predict(self, X):
+        """
+        Predicts classes for a raw (unscaled) feature matrix.
+
+        Args:
+            X (ndarray): Feature matrix with the spec's input columns.
+
+        Returns:
+            ndarray: Predicted classes.
+        """
+        return self.model.predict(self.scaler.transform(np.asarray(X, dtype=float)))
+
+    def predict_proba(self, X):
+        """
+        Predicts class probabilities for a raw (unscaled) feature matrix.
+
+        Args:
+            X (ndarray): Feature matrix with the spec's input columns.
+
+        Returns:
+            ndarray: Probabilities of shape (rows, classes).
+        """
+        return self.model.predict_proba(self.scaler.transform(np.asarray(X, dtype=float)))
@@ -0,0 +1,134 @@
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC, LinearSVC
+
+# Above this many training rows the large-data engines replace the exact ones
+LARGE_DATA_THRESHOLD = 50_000
+
+# Models whose large-data engine differs from the exact one
+SUBSTITUTED_MODELS = ["Gradient Boosting", "Support Vector Machine"]
+
+
+def exact_models(random_state=42):
+    """
+    The model zoo of 04-ML1 with the exact (small-data) engines.
+
+    Args:
+        random_state (int): Seed of the randomized models.
+
+    Returns:
+        dict: Model name -> unfitted estimator.
+    """
+    return {
+        "Random Forest": RandomForestClassifier(n_estimators=100, random_state=random_state),
+        "Gradient Boosting": GradientBoostingClassifier(n_estimators=100, learning_rate=0.1, random_state=random_state),
+        "Logistic Regression": LogisticRegression(max_iter=1000, random_state=random_state),
+        "K-Nearest Neighbors": KNeighborsClassifier(n_neighbors=5),
+        "Support Vector Machine": SVC(kernel='rbf', C=1.0)
+    }
+
+
+def large_data_models(random_state=42, n_components=300, n_features=4):
+    """
+    The same model zoo with engines that scale to hundreds of thousands of rows.
+
+    - Gradient Boosting: multithreaded histogram gradient boosting (binned features, same iterations and learning rate).
+    - Support Vector Machine: Nystroem approximation of the RBF kernel followed by a linear SVM, so training
+      is linear in the number of rows. Unlike the exact SVC, which gets the raw features, this pipeline
+      standardizes them first and uses gamma = 1 / n_features (the value of gamma='scale' on standardized
+      features), so the two kernels differ in width per feature; parity_report measures the effect.
+
+    K-Nearest Neighbors keeps the exact engine: on a few features its 'auto' algorithm already picks
+    a tree index.
+
+    Args:
+        random_state (int): Seed of the randomized models.
+        n_components (int): Number of Nystroem landmark points.
+        n_features (int): Number of input features (sets the kernel width).
+
+    Returns:
+        dict: Model name -> unfitted estimator.
+    """
+    models = exact_models(random_state)
+    models.update({
+        "Gradient Boosting": HistGradientBoostingClassifier(max_iter=100, learning_rate=0.1, random_state=random_state),
+        "Support Vector Machine": make_pipeline(
+            StandardScaler(),
+            Nystroem(kernel='rbf', gamma=1.0 / n_features, n_components=n_components, random_state=random_state),
+            LinearSVC(C=1.0, random_state=random_state)
+        )
+    })
+    return models
+
+
+def select_models(n_rows, n_features=4, threshold=LARGE_DATA_THRESHOLD, random_state=42):
+    """
+    Picks the exact engines for small data and the large-data engines above the row threshold.
+
+    Args:
+        n_rows (int): Number of training rows.
+        n_features (int): Number of input features.
+        threshold (int): Row count above which the large-data engines are used.
+        random_state (int): Seed of the randomized models.
+
+    Returns:
+        dict: Model name -> unfitted estimator.
+    """
+    if n_rows > threshold:
+        return large_data_models(random_state, n_features=n_features)
+    return exact_models(random_state)
+
+
+def parity_report(X_train, y_train, X_test, y_test, model_names=None, sample_size=20_000, random_state=42):
+    """
+    Compares the accuracy and runtime of the large-data engines with the exact models.
+
+    Both engines are trained on the same random sample of at most `sample_size` training rows (the
+    exact SVC would not finish on the full data) and scored on the full test set.
+
+    Args:
+        X_train (DataFrame or ndarray): Training features.
+        y_train (Series or ndarray): Training target.
+        X_test (DataFrame or ndarray): Test features.
+        y_test (Series or ndarray): Test target.
+        model_names (list, optional): Models to compare; defaults to the substituted ones.
+        sample_size (int): Maximum number of training rows used for the comparison.
+        random_state (int): Seed of the sample and of the models.
+
+    Returns:
+        DataFrame: One row per model with 'exact_accuracy', 'large_accuracy', 'accuracy_difference',
+        and fit / predict times in seconds for both engines.
+    """
+    X_train, X_test = np.asarray(X_train, dtype=float), np.asarray(X_test, dtype=float)
+    y_train, y_test = np.asarray(y_train), np.asarray(y_test)
+    rows = np.random.default_rng(random_state).permutation(len(X_train))[:sample_size]
+    X_sample, y_sample = X_train[rows], y_train[rows]
+
+    model_names = SUBSTITUTED_MODELS if model_names is None else model_names
+    engines = {'exact': exact_models(random_state),
+               'large': large_data_models(random_state, n_features=X_train.shape[1])}
+    records = []
+    for model_name in model_names:
+        record = {'model': model_name}
+        for engine, models in engines.items():
+            model = models[model_name]
+            start = time.perf_counter()
+            model.fit(X_sample, y_sample)
+            record[f'{engine}_fit_s'] = time.perf_counter() - start
+            start = time.perf_counter()
+            record[f'{engine}_accuracy'] = accuracy_score(y_test, model.predict(X_test))
+            record[f'{engine}_predict_s'] = time.perf_counter() - start
+        record['accuracy_difference'] = record['large_accuracy'] - record['exact_accuracy']
+        records.append(record)
+
+    columns = ['exact_accuracy', 'large_accuracy', 'accuracy_difference',
+               'exact_fit_s', 'large_fit_s', 'exact_predict_s', 'large_predict_s']
+    return pd.DataFrame.from_records(records, index='model')[columns]
@@ -0,0 +1,104 @@
+import os
+import time
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, dump, load
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+
+
+def _fit_fold(model_name, model, X, y, train_index, test_index, fold, scoring, track_memory):
+    """
+    Fits one model on one cross-validation fold (runs inside a worker process).
+
+    Args:
+        model_name (str): Name of the model.
+        model (estimator): Unfitted scikit-learn estimator.
+        X (ndarray): Memory-mapped feature matrix shared by all workers.
+        y (ndarray): Memory-mapped target vector.
+        train_index (ndarray): Rows used for fitting.
+        test_index (ndarray or None): Rows used for scoring; None for the final refit on all rows.
+        fold (int): Fold number (the number of folds for the final fit on all rows).
+        scoring (callable): Metric called as scoring(y_true, y_pred).
+        track_memory (bool): Measure the peak memory allocated during the fit with tracemalloc.
+
+    Returns:
+        dict: Model name, fold, score, fitted estimator, wall time, CPU time and peak memory (MB).
+    """
+    if track_memory:
+        tracemalloc.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    model.fit(X[train_index], y[train_index])
+    score = np.nan if test_index is None else scoring(y[test_index], model.predict(X[test_index]))
+
+    wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    peak_memory = np.nan
+    if track_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return {'model': model_name, 'fold': fold, 'score': score, 'estimator': model,
+            'wall_time_s': wall_time, 'cpu_time_s': cpu_time, 'peak_memory_mb': peak_memory}
+
+
+def evaluate_models(models, X, y, cv=5, n_jobs=-1, scoring=accuracy_score, track_memory=False, temp_folder=None):
+    """
+    Cross-validates several models with all (model, fold) fits running in parallel worker processes.
+
+    The feature matrix and target are dumped once to a temporary folder and memory-mapped, so the
+    workers read the same pages instead of each receiving a pickled copy. Folds are stratified
+    like `cross_val_score` does for classifiers. The final fit of every model on all rows runs in
+    the same worker pool as the folds; the fold estimators only serve to score the model.
+
+    Args:
+        models (dict): Model name -> unfitted scikit-learn estimator.
+        X (DataFrame or ndarray): Feature matrix.
+        y (Series or ndarray): Target vector.
+        cv (int): Number of folds.
+        n_jobs (int): Number of worker processes (-1 for all cores).
+        scoring (callable): Metric called as scoring(y_true, y_pred); defaults to accuracy.
+        track_memory (bool): Measure the peak memory of every fit with tracemalloc (off by default, as
+            tracing slows the fits down).
+        temp_folder (str, optional): Folder for the memory-mapped arrays; defaults to the system temp folder.
+
+    Returns:
+        DataFrame: One row per model with 'mean_score', 'std_score', 'fold_scores', 'wall_time_s' and
+        'cpu_time_s' (summed over folds) and 'peak_memory_mb' (largest fold, NaN unless tracked).
+        dict: Model name -> estimator fitted on all rows.
+    """
+    X = np.ascontiguousarray(X.to_numpy() if isinstance(X, pd.DataFrame) else X, dtype=float)
+    y = np.asarray(y)
+    folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+
+    with tempfile.TemporaryDirectory(dir=temp_folder) as folder:
+        dump(X, os.path.join(folder, 'X.joblib'))
+        dump(y, os.path.join(folder, 'y.joblib'))
+        X_shared = load(os.path.join(folder, 'X.joblib'), mmap_mode='r')
+        y_shared = load(os.path.join(folder, 'y.joblib'), mmap_mode='r')
+
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_fold)(model_name, clone(model), X_shared, y_shared, train_index, test_index,
+                               fold, scoring, track_memory)
+            for model_name, model in models.items()
+            for fold, (train_index, test_index) in enumerate(folds + [(np.arange(len(y)), None)])
+        )
+        del X_shared, y_shared
+
+    # The last job of every model is its fit on all rows
+    estimators = {result['model']: result['estimator'] for result in results if result['fold'] == cv}
+    folds_frame = pd.DataFrame([result for result in results if result['fold'] < cv]).drop(columns='estimator')
+    grouped = folds_frame.sort_values('fold').groupby('model', sort=False)
+    report = pd.DataFrame({
+        'mean_score': grouped['score'].mean(),
+        'std_score': grouped['score'].std(ddof=0),
+        'fold_scores': grouped['score'].apply(np.array),
+        'wall_time_s': grouped['wall_time_s'].sum(),
+        'cpu_time_s': grouped['cpu_time_s'].sum(),
+        'peak_memory_mb': grouped['peak_memory_mb'].max()
+    }).reindex(list(models))
+    report.index.name = 'model'
+    return report, estimators
+
@@ -0,0 +1,199 @@
+import os
+import json
+import joblib
+import sklearn
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+
+
+def _model_folder(model_dir, name):
+    """
+    Folder of a saved model, e.g. 'Random Forest' -> <model_dir>/random_forest.
+
+    Args:
+        model_dir (str): Folder holding all saved models.
+        name (str): Model name.
+
+    Returns:
+        str: Path of the model's folder.
+    """
+    return os.path.join(model_dir, name.lower().replace(' ', '_'))
+
+
+def save_model(model, model_dir, name, features, data_version=None, metrics=None):
+    """
+    Saves a fitted model with its metadata.
+
+    The model is dumped uncompressed, so its numpy arrays (e.g. the tree nodes of a forest) can be
+    memory-mapped by `load_model` instead of being read and copied.
+
+    Args:
+        model (estimator): Fitted scikit-learn estimator.
+        model_dir (str): Folder holding all saved models.
+        name (str): Model name.
+        features (list): Feature columns the model expects, in order.
+        data_version (str, optional): Version of the training data (e.g. FeatureStore.data_version).
+        metrics (dict, optional): Evaluation metrics (e.g. accuracy, MAE, cross-validation score).
+
+    Returns:
+        str: Path of the model's folder.
+    """
+    folder = _model_folder(model_dir, name)
+    os.makedirs(folder, exist_ok=True)
+    joblib.dump(model, os.path.join(folder, 'model.joblib'))
+    metadata = {
+        'name': name,
+        'estimator': type(model).__name__,
+        'features': list(features),
+        'data_version': data_version,
+        'metrics': {key: float(value) for key, value in (metrics or {}).items()},
+        'sklearn_version': sklearn.__version__,
+        'saved_at': datetime.now(timezone.utc).isoformat()
+    }
+    with open(os.path.join(folder, 'metadata.json'), 'w') as file:
+        json.dump(metadata, file, indent=2)
+    return folder
+
+
+def load_model(model_dir, name, mmap_mode='r'):
+    """
+    Loads a saved model and its metadata.
+
+    Args:
+        model_dir (str): Folder holding all saved models.
+        name (str): Model name.
+        mmap_mode (str, optional): joblib memory-map mode for the model's arrays ('r' by default, None to read them).
+
+    Returns:
+        tuple: The fitted estimator and its metadata dict.
+    """
+    folder = _model_folder(model_dir, name)
+    with open(os.path.join(folder, 'metadata.json')) as file:
+        metadata = json.load(file)
+    return joblib.load(os.path.join(folder, 'model.joblib'), mmap_mode=mmap_mode), metadata
+
+
+def list_models(model_dir):
+    """
+    Metadata of every saved model.
+
+    Args:
+        model_dir (str): Folder holding all saved models.
+
+    Returns:
+        DataFrame: One row per model, indexed by name.
+    """
+    records = []
+    for folder in sorted(os.listdir(model_dir)) if os.path.isdir(model_dir) else []:
+        metadata_file = os.path.join(model_dir, folder, 'metadata.json')
+        if os.path.exists(metadata_file):
+            with open(metadata_file) as file:
+                metadata = json.load(file)
+            records.append({**{key: value for key, value in metadata.items() if key != 'metrics'},
+                            **metadata['metrics']})
+    return pd.DataFrame.from_records(records, index='name') if records else pd.DataFrame()
+
+
+class BatchPredictor:
+    """
+    Vectorized inference with a persisted model, without any training.
+
+    Rows are scored in large chunks so memory stays bounded for long ranges while every call to the
+    model still works on many rows at once.
+
+    Attributes:
+        model (estimator): Fitted scikit-learn estimator.
+        features (list): Feature columns the model expects, in order.
+        metadata (dict): Metadata of the saved model.
+        chunk_size (int): Number of rows scored per call to the model.
+    """
+
+    def __init__(self, model, features, metadata=None, chunk_size=65536):
+        """
+        Args:
+            model (estimator): Fitted scikit-learn estimator.
+            features (list): Feature columns the model expects, in order.
+            metadata (dict, optional): Metadata of the saved model.
+            chunk_size (int): Number of rows scored per call to the model.
+        """
+        self.model = model
+        self.features = list(features)
+        self.metadata = metadata or {}
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def load(cls, model_dir, name, chunk_size=65536):
+        """
+        Creates a predictor from a saved model (memory-mapped).
+
+        Args:
+            model_dir (str): Folder holding all saved models.
+            name (str): Model name.
+            chunk_size (int): Number of rows scored per call to the model.
+
+        Returns:
+            BatchPredictor: Predictor for the saved model.
+        """
+        model, metadata = load_model(model_dir, name)
+        return cls(model, metadata['features'], metadata, chunk_size)
+
+    def _score(self, X, probability):
+        """
+        Scores a feature matrix chunk by chunk.
+
+        Args:
+            X (ndarray): Matrix of shape (rows, features).
+            probability (bool): Return the probability of the positive class instead of the label.
+
+        Returns:
+            ndarray: One prediction per row.
+        """
+        method = self.model.predict_proba if probability else self.model.predict
+        chunks = [method(X[start:start + self.chunk_size]) for start in range(0, len(X), self.chunk_size)]
+        if not chunks:
+            return np.empty(0)
+        result = np.concatenate(chunks)
+        return result[:, 1] if probability else result
+
+    def predict_frame(self, data, probability=False):
+        """
+        Scores new hourly rows.
+
+        Args:
+            data (DataFrame): Rows with the model's feature columns.
+            probability (bool): Return the probability of the positive class instead of the label.
+
+        Returns:
+            Series: Predictions indexed like `data`.
+        """
+        X = data[self.features].to_numpy(dtype=float)
+        return pd.Series(self._score(X, probability), index=data.index, name='prediction')
+
+    def predict_range(self, feature_store, start=None, end=None, probability=False):
+        """
+        Scores the rows of a feature store between two dates, straight from its memory-mapped columns.
+
+        Args:
+            feature_store (FeatureStore): Store holding the model's feature columns (sorted by date).
+            start (str or Timestamp, optional): First timestamp (inclusive); defaults to the first row.
+            end (str or Timestamp, optional): Last timestamp (exclusive); defaults to after the last row.
+            probability (bool): Return the probability of the positive class instead of the label.
+
+        Returns:
+            Series: Predictions indexed by date.
+        """
+        dates = feature_store.dates()
+
+        def position(timestamp, default):
+            if timestamp is None:
+                return default
+            timestamp = pd.Timestamp(timestamp)
+            if timestamp.tz is None and dates.tz is not None:
+                timestamp = timestamp.tz_localize(dates.tz)
+            return dates.searchsorted(timestamp, side='left')
+
+        first, last = position(start, 0), position(end, len(dates))
+        columns = [feature_store.column(name)[first:last] for name in self.features]
+        X = np.column_stack(columns) if columns else np.empty((0, 0))
+        return pd.Series(self._score(X, probability), index=dates[first:last], name='prediction')
@@ -9,17 +9,25 @@ import matplotlib.dates as mdates
 import psutil
 
 # Importing WeatherAnalyzer from the analyze_data script
-sys.path.append('/workspaces/weather-scraper-analyzer/src/03-data_analysis')
+sys.path.append('/workspaces/weather-scraper-analyzer/src/br03_data_analysis')
 from analyze_data import WeatherAnalyzer
+from forecast_runner import run_forecasts
+from resource_monitor import ResourceMonitor
+from forecast_cache import ForecastCache
+from harmonic_forecast import HarmonicForecaster, fit_harmonic_model, compare_engines
+from backtesting import backtest
 
 def log_resource_usage(step):
     """
     Log and display resource usage (CPU and memory).
 
+    The CPU usage is measured since the previous call instead of blocking for a sampling interval;
+    use ResourceMonitor for a continuous record of a whole run.
+
     Args:
         step (str): Description of the step in the process for logging.
     """
-    cpu_usage = psutil.cpu_percent(interval=1)
+    cpu_usage = psutil.cpu_percent(interval=None)
     memory_info = psutil.virtual_memory()
     memory_usage = memory_info.percent
     print(f"[{step}] CPU Usage: {cpu_usage}% | Memory Usage: {memory_usage}%")
@@ -56,6 +64,26 @@ def fit_prophet_model(series, variable_name):
 
     return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']], variable_name
 
+def fit_prophet_backtest(series, variable_name, periods=365):
+    """
+    Fit a Prophet model for one backtest cutoff, without the resource log and the printed table of
+    fit_prophet_model (a backtest runs dozens of fits).
+
+    Args:
+        series (pd.Series): The time series data up to the cutoff.
+        variable_name (str): Name of the variable being forecasted.
+        periods (int): Number of days to forecast (the backtest horizon).
+
+    Returns:
+        pd.DataFrame: Forecasted values with confidence intervals.
+        str: Variable name.
+    """
+    df = series.reset_index()
+    df.columns = ['ds', 'y']
+    model = Prophet().fit(df)
+    forecast = model.predict(model.make_future_dataframe(periods=periods))
+    return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']], variable_name
+
 def main():
     """
     Main function to execute the weather data analysis and forecast process.
@@ -80,26 +108,59 @@ def main():
         "Wind Speed": daily_df['wind_speed_10m_max_kmh'].dropna()
     }
 
-    # Log initial resource usage and measure start time
+    # Sample resource usage in the background (including the worker processes) and measure start time
+    monitor = ResourceMonitor(interval=0.5).start()
     start_time = datetime.now()
-    log_resource_usage("Start of the process")
-
-    # Fit Prophet model for each variable and store results
-    prophet_results = {}
-    for var_name, series in variables.items():
-        prophet_results[var_name] = fit_prophet_model(series, var_name)
 
-    # Log final resource usage and measure end time
+    # Hold-out accuracy and fit time of both engines on the last year of every variable
+    if '--compare' in sys.argv:
+        with monitor.stage("Engine comparison"):
+            print(compare_engines(variables, {"Prophet": fit_prophet_model, "Harmonic": fit_harmonic_model}))
+
+    # Rolling-origin backtest of both engines (one year ahead, a cutoff every half year); fits of
+    # earlier runs are cached, so only new cutoffs are fitted
+    if '--backtest' in sys.argv:
+        with monitor.stage("Backtesting"):
+            metrics, _, jobs = backtest(variables, {"Prophet": fit_prophet_backtest, "Harmonic": fit_harmonic_model},
+                                        horizon=365, cache_dir=r"/workspaces/weather-scraper-analyzer/output/backtest_cache")
+        if metrics.empty:
+            print("Not enough history for a backtest cutoff")
+        else:
+            print(jobs.groupby(['engine', 'status'])['wall_time_s'].agg(['count', 'sum']))
+            # Average the metrics over 30-day horizon buckets for display
+            buckets = (metrics.index.get_level_values('horizon_days') - 1) // 30 * 30 + 30
+            print(metrics.groupby([metrics.index.get_level_values('engine'), metrics.index.get_level_values('variable'),
+                                   buckets.rename('horizon_days')])[['mae', 'rmse', 'coverage']].mean())
+            metrics.to_csv(r"/workspaces/weather-scraper-analyzer/output/ML2_backtest_metrics.csv")
+
+    engine = "Harmonic" if '--harmonic' in sys.argv else "Prophet"
+    if engine == "Harmonic":
+        # Fit all variables together with the batched harmonic regression (no Stan, analytic intervals)
+        with monitor.stage("Harmonic fitting"):
+            forecasts = HarmonicForecaster().fit(variables).predict(periods=5 * 365)
+    else:
+        # Fit Prophet models for all variables in parallel worker processes (one series per job);
+        # unchanged series reuse their cached forecast, changed series warm-start from the cached model
+        forecast_cache = ForecastCache(r"/workspaces/weather-scraper-analyzer/output/forecast_cache", periods=5 * 365)
+        with monitor.stage("Prophet fitting"):
+            forecasts, timings = run_forecasts(variables, forecast_cache)
+
+    # Report resource usage per stage and measure end time
     end_time = datetime.now()
+    monitor.stop()
     print(f"Model fitting duration: {end_time - start_time}")
-    log_resource_usage("End of the process")
+    if engine == "Prophet":
+        print(timings)
+        print(forecast_cache.report()[['n_observations', 'status', 'fitted_at']])
+    print(monitor.summary())
+    monitor.export(r"/workspaces/weather-scraper-analyzer/output/ML2_resource_usage.csv")
 
     # Plot forecast results for each variable
-    for var_name, (forecast, _) in prophet_results.items():
+    for var_name, forecast in forecasts.groupby('variable', sort=False):
         plt.figure(figsize=(14, 7))
         plt.plot(forecast['ds'], forecast['yhat'], color='green', label="Forecast")
         plt.fill_between(forecast['ds'], forecast['yhat_lower'], forecast['yhat_upper'], color='green', alpha=0.3, label="Confidence Interval")
-        plt.title(f"Prophet Forecast for {var_name} (2025 to 2030)")
+        plt.title(f"{engine} Forecast for {var_name} (2025 to 2030)")
         plt.xlabel("Date")
         plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
         plt.gca().xaxis.set_major_locator(mdates.YearLocator(1))  # Show every year
@@ -0,0 +1,227 @@
+import os
+import re
+import time
+import inspect
+import hashlib
+import functools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from .forecast_cache import series_version
+except ImportError:
+    from forecast_cache import series_version
+
+
+def cutoff_grid(series, horizon=365, initial=None, period=None):
+    """
+    Rolling-origin cutoffs for a series, spaced `period` days apart and ending one horizon before the
+    last date (as Prophet's cross_validation).
+
+    Args:
+        series (Series): Daily time series.
+        horizon (int): Number of days forecasted after each cutoff.
+        initial (int, optional): Minimum number of training days before the first cutoff (3 horizons by default).
+        period (int, optional): Days between two cutoffs (half a horizon by default).
+
+    Returns:
+        list: Cutoff dates, oldest first (empty when the series is too short).
+    """
+    initial = 3 * horizon if initial is None else initial
+    period = max(horizon // 2, 1) if period is None else period
+    index = pd.DatetimeIndex(series.dropna().index)
+    if index.empty:
+        return []
+    first, cutoff = index[0] + pd.Timedelta(days=initial), index[-1] - pd.Timedelta(days=horizon)
+    cutoffs = []
+    while cutoff >= first:
+        cutoffs.append(cutoff)
+        cutoff -= pd.Timedelta(days=period)
+    return cutoffs[::-1]
+
+
+def engine_version(fit_function):
+    """
+    Version string of a fit function from its code and configuration: the source of the function (or
+    of the callable's class and its attributes), plus the bound arguments of a functools.partial.
+
+    Args:
+        fit_function (callable): Fit function of an engine.
+
+    Returns:
+        str: 16 hex characters that change when the engine's code or configuration changes.
+    """
+    if isinstance(fit_function, functools.partial):
+        parts = [engine_version(fit_function.func), repr(fit_function.args), repr(sorted(fit_function.keywords.items()))]
+    elif inspect.isfunction(fit_function) or inspect.ismethod(fit_function):
+        parts = [fit_function.__module__, fit_function.__qualname__, inspect.getsource(fit_function)]
+    else:
+        parts = [type(fit_function).__qualname__, inspect.getsource(type(fit_function)),
+                 repr(sorted(vars(fit_function).items()))]
+    return hashlib.sha256('\n'.join(parts).encode()).hexdigest()[:16]
+
+
+def _cache_file(cache_dir, engine, version, name, cutoff, horizon, train):
+    """
+    Cache file of one backtest fit; the engine version and the content hash of the training data are
+    part of the name, so a changed engine or revised history invalidates it while new data after the
+    cutoff does not.
+
+    Args:
+        cache_dir (str): Cache folder.
+        engine (str): Engine name.
+        version (str): Engine version (see engine_version).
+        name (str): Series name.
+        cutoff (Timestamp): Cutoff date.
+        horizon (int): Number of forecasted days.
+        train (Series): Training data up to the cutoff.
+
+    Returns:
+        str: Path of the pickled forecast.
+    """
+    slug = lambda text: re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+    file_name = f"{cutoff:%Y%m%d}_h{horizon}_{version}_{series_version(train)[:16]}.pkl"
+    return os.path.join(cache_dir, slug(engine), slug(name), file_name)
+
+
+def _run_backtest_job(job, train, fit_function, horizon):
+    """
+    Fits one engine on the data up to one cutoff (runs inside a worker process).
+
+    Args:
+        job (tuple): Engine name, series key and cutoff.
+        train (Series): Training data up to the cutoff.
+        fit_function (callable): Called as fit_function(train, name), returning (forecast, name).
+        horizon (int): Number of forecasted days kept.
+
+    Returns:
+        tuple: The job, the forecast of the horizon (None if the fit failed or the forecast does not cover
+        the horizon), the wall time and the error.
+    """
+    _, key, cutoff = job
+    name = ' - '.join(key) if isinstance(key, tuple) else key
+    start, forecast, error = time.perf_counter(), None, None
+    try:
+        forecast, _ = fit_function(train, name)
+        forecast = forecast[(forecast['ds'] > cutoff) & (forecast['ds'] <= cutoff + pd.Timedelta(days=horizon))]
+        forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].reset_index(drop=True)
+        covered = forecast['ds'].nunique()
+        if covered < horizon:
+            forecast, error = None, f"Forecast covers {covered} of {horizon} horizon days"
+    except Exception as exception:
+        error = f"{type(exception).__name__}: {exception}"
+    return job, forecast, time.perf_counter() - start, error
+
+
+def horizon_metrics(predictions, key_columns=('variable',)):
+    """
+    MAE, RMSE and interval coverage per engine, series and horizon day.
+
+    Args:
+        predictions (DataFrame): Backtest predictions with 'engine', the key columns, 'cutoff', 'ds',
+            'y', 'yhat', 'yhat_lower' and 'yhat_upper'.
+        key_columns (tuple): Series key columns.
+
+    Returns:
+        DataFrame: Indexed by engine, key columns and 'horizon_days', with 'mae', 'rmse', 'coverage'
+        and 'n' (number of forecasts scored).
+    """
+    y, yhat = predictions['y'].to_numpy(dtype=float), predictions['yhat'].to_numpy(dtype=float)
+    scored = pd.DataFrame({
+        'engine': predictions['engine'].to_numpy(),
+        **{column: predictions[column].to_numpy() for column in key_columns},
+        'horizon_days': ((predictions['ds'] - predictions['cutoff']) / pd.Timedelta(days=1)).to_numpy().astype(int),
+        'absolute_error': np.abs(yhat - y),
+        'squared_error': (yhat - y) ** 2,
+        'covered': ((y >= predictions['yhat_lower'].to_numpy()) & (y <= predictions['yhat_upper'].to_numpy())).astype(float)
+    })
+    grouped = scored.groupby(['engine', *key_columns, 'horizon_days'])
+    metrics = grouped[['absolute_error', 'squared_error', 'covered']].mean()
+    metrics['n'] = grouped.size()
+    metrics['squared_error'] = np.sqrt(metrics['squared_error'])
+    return metrics.rename(columns={'absolute_error': 'mae', 'squared_error': 'rmse', 'covered': 'coverage'})
+
+
+def backtest(series_map, engines, horizon=365, initial=None, period=None, cache_dir=None, max_workers=None,
+             engine_versions=None):
+    """
+    Rolling-origin backtest of forecast engines, fitted in parallel worker processes.
+
+    Every (engine, series, cutoff) fit is an independent job that only ships the data up to its cutoff.
+    With a cache folder, the forecast of each job is stored under the engine version and a hash of its
+    training data, so extending the grid (more cutoffs, more series, new data at the end) only fits
+    the new jobs. A job whose forecast does not cover the whole horizon fails and is not cached.
+    Forecasts are compared with the actual values after the cutoff, which are re-read every run.
+
+    Args:
+        series_map (dict): Variable name (or (location, variable) tuple) -> daily time series.
+        engines (dict): Engine name -> fit function with the fit_prophet_model interface
+            (series, name) -> (forecast, name); forecasts must extend at least `horizon` days.
+        horizon (int): Number of days forecasted after each cutoff.
+        initial (int, optional): Minimum number of training days before the first cutoff.
+        period (int, optional): Days between two cutoffs.
+        cache_dir (str, optional): Folder caching the forecast of every job.
+        max_workers (int, optional): Maximum number of worker processes; defaults to the CPU count.
+        engine_versions (dict, optional): Engine name -> version string used in the cache key instead of
+            engine_version(fit function), e.g. to include a library version.
+
+    Returns:
+        DataFrame: Metrics per engine, series and horizon day (see horizon_metrics).
+        DataFrame: All scored predictions (engine, key columns, cutoff, ds, y, yhat, yhat_lower, yhat_upper).
+        DataFrame: One row per job with 'status' ('cached', 'fitted' or 'failed'), 'wall_time_s' and 'error'.
+    """
+    has_location = any(isinstance(key, tuple) for key in series_map)
+    key_columns = ['location', 'variable'] if has_location else ['variable']
+
+    versions = {engine: (engine_versions or {}).get(engine) or engine_version(fit_function)
+                for engine, fit_function in engines.items()}
+    jobs, forecasts, records = {}, {}, []
+    for key, series in series_map.items():
+        series = series.dropna()
+        name = ' - '.join(key) if isinstance(key, tuple) else key
+        for cutoff in cutoff_grid(series, horizon, initial, period):
+            train = series[series.index <= cutoff]
+            for engine in engines:
+                job = (engine, key, cutoff)
+                path = _cache_file(cache_dir, engine, versions[engine], name, cutoff, horizon, train) if cache_dir else None
+                if path is not None and os.path.exists(path):
+                    forecasts[job] = pd.read_pickle(path)
+                    records.append({'job': job, 'status': 'cached', 'wall_time_s': 0.0, 'error': None})
+                else:
+                    jobs[job] = (train, path)
+
+    if jobs:
+        cpu_count = os.cpu_count() or 1
+        workers = max(1, min(max_workers or cpu_count, cpu_count, len(jobs)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_backtest_job, job, train, engines[job[0]], horizon)
+                       for job, (train, _) in jobs.items()]
+            for future in as_completed(futures):
+                job, forecast, wall_time, error = future.result()
+                records.append({'job': job, 'status': 'failed' if error else 'fitted', 'wall_time_s': wall_time, 'error': error})
+                if forecast is not None:
+                    forecasts[job] = forecast
+                    path = jobs[job][1]
+                    if path is not None:
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        forecast.to_pickle(path)
+
+    # Attach the actual values and the labels of every job
+    frames = []
+    for (engine, key, cutoff), forecast in forecasts.items():
+        actual = series_map[key].dropna()
+        labels = dict(zip(key_columns, key if isinstance(key, tuple) else (key,)))
+        frame = forecast.assign(engine=engine, cutoff=cutoff, **labels)
+        frame['y'] = actual.reindex(pd.DatetimeIndex(frame['ds'])).to_numpy()
+        frames.append(frame)
+    columns = ['engine', *key_columns, 'cutoff', 'ds', 'y', 'yhat', 'yhat_lower', 'yhat_upper']
+    predictions = pd.concat(frames, ignore_index=True)[columns].dropna(subset=['y']) if frames else pd.DataFrame(columns=columns)
+    predictions = predictions.sort_values(columns[:4]).reset_index(drop=True)
+
+    job_frame = pd.DataFrame([{'engine': record['job'][0],
+                               **dict(zip(key_columns, record['job'][1] if isinstance(record['job'][1], tuple) else (record['job'][1],))),
+                               'cutoff': record['job'][2], 'status': record['status'],
+                               'wall_time_s': record['wall_time_s'], 'error': record['error']} for record in records],
+                             columns=['engine', *key_columns, 'cutoff', 'status', 'wall_time_s', 'error'])
+    return horizon_metrics(predictions, key_columns), predictions, job_frame.sort_values(['engine', *key_columns, 'cutoff'], ignore_index=True)
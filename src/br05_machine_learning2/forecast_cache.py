@@ -0,0 +1,205 @@
+import os
+import re
+import json
+import hashlib
+import pandas as pd
+from datetime import datetime, timezone
+from prophet import Prophet
+from prophet.serialize import model_to_json, model_from_json
+
+
+def series_version(series):
+    """
+    Content hash of a time series (timestamps and values).
+
+    Args:
+        series (Series): Time series indexed by date.
+
+    Returns:
+        str: Hex digest identifying the data.
+    """
+    digest = hashlib.sha256(pd.DatetimeIndex(series.index).asi8.tobytes())
+    digest.update(series.to_numpy(dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def stan_init(model):
+    """
+    Fitted parameters of a Prophet model in the form Prophet.fit(init=...) expects.
+
+    Args:
+        model (Prophet): Fitted model.
+
+    Returns:
+        dict: Initial values for the optimizer ('k', 'm', 'sigma_obs', 'delta', 'beta').
+    """
+    init = {name: model.params[name][0][0] for name in ['k', 'm', 'sigma_obs']}
+    init.update({name: model.params[name][0] for name in ['delta', 'beta']})
+    return init
+
+
+class ForecastCache:
+    """
+    Disk cache of fitted Prophet models and their forecasts, keyed by series name and data version.
+
+    Fitted models are keyed on the data and the Prophet arguments only; the horizon is applied at
+    predict time, so a different number of forecast days reuses the cached model.
+
+    - Unchanged series (same content hash and Prophet arguments) are not refitted: the cached forecast
+      is returned, or the cached model predicts the new horizon.
+    - Changed series (e.g. a few new days) are refitted with the optimizer started from the previous
+      model's parameters, which converges in far fewer iterations than a cold start.
+    - New series, or a warm start that does not fit the new model (e.g. different seasonalities), are
+      fitted from scratch.
+
+    The cache is callable like fit_prophet_model (series, name) -> (forecast, name), so it can be passed
+    to run_forecasts as the fit function; it only holds its folder, so it pickles cheaply to workers.
+    The status of every series is kept in its metadata (see `report`).
+
+    Attributes:
+        cache_dir (str): Folder holding one sub-folder per series.
+        periods (int): Number of days to forecast.
+        prophet_kwargs (dict): Arguments for Prophet().
+    """
+
+    def __init__(self, cache_dir, periods=5 * 365, prophet_kwargs=None):
+        """
+        Args:
+            cache_dir (str): Folder holding one sub-folder per series.
+            periods (int): Number of days to forecast.
+            prophet_kwargs (dict, optional): Arguments for Prophet().
+        """
+        self.cache_dir = cache_dir
+        self.periods = periods
+        self.prophet_kwargs = prophet_kwargs or {}
+
+    def _folder(self, name):
+        """
+        Folder of a series, e.g. 'Wind Speed' -> <cache_dir>/wind_speed.
+
+        Args:
+            name (str): Series name.
+
+        Returns:
+            str: Path of the series' folder.
+        """
+        return os.path.join(self.cache_dir, re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_'))
+
+    def _settings(self):
+        """
+        Settings that change the fitted model.
+
+        Returns:
+            dict: Prophet arguments.
+        """
+        return {'prophet_kwargs': self.prophet_kwargs}
+
+    def metadata(self, name):
+        """
+        Metadata of a cached series.
+
+        Args:
+            name (str): Series name.
+
+        Returns:
+            dict: Data version, settings, forecast days, number of observations, last status and fit time
+            (None if not cached).
+        """
+        metadata_file = os.path.join(self._folder(name), 'metadata.json')
+        if not os.path.exists(metadata_file):
+            return None
+        with open(metadata_file) as file:
+            return json.load(file)
+
+    def forecast(self, series, name):
+        """
+        Forecast for a series, reusing the cache where possible.
+
+        Args:
+            series (Series): Daily values indexed by date.
+            name (str): Series name (e.g. 'Temperature' or 'Timisoara - Temperature').
+
+        Returns:
+            tuple: Forecast with 'ds', 'yhat', 'yhat_lower' and 'yhat_upper', and the status
+            ('cached', 'cached_model' for a new horizon from the cached model, 'warm_start' or 'cold_start').
+        """
+        folder = self._folder(name)
+        version = series_version(series)
+        metadata = self.metadata(name)
+        same_settings = metadata is not None and metadata['settings'] == self._settings()
+        previous = None
+        if same_settings:
+            if metadata['data_version'] == version and metadata.get('periods') == self.periods:
+                return pd.read_pickle(os.path.join(folder, 'forecast.pkl')), 'cached'
+            with open(os.path.join(folder, 'model.json')) as file:
+                previous = model_from_json(file.read())
+
+        if previous is not None and metadata['data_version'] == version:
+            model, status = previous, 'cached_model'
+        else:
+            model, status = self._fit(series, previous)
+
+        future = model.make_future_dataframe(periods=self.periods)
+        forecast = model.predict(future)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+
+        os.makedirs(folder, exist_ok=True)
+        if status != 'cached_model':
+            with open(os.path.join(folder, 'model.json'), 'w') as file:
+                file.write(model_to_json(model))
+        forecast.to_pickle(os.path.join(folder, 'forecast.pkl'))
+        fitted_at = metadata['fitted_at'] if status == 'cached_model' else datetime.now(timezone.utc).isoformat()
+        with open(os.path.join(folder, 'metadata.json'), 'w') as file:
+            json.dump({'name': name, 'data_version': version, 'settings': self._settings(), 'periods': self.periods,
+                       'n_observations': len(series), 'status': status, 'fitted_at': fitted_at}, file, indent=2)
+        return forecast, status
+
+    def _fit(self, series, previous=None):
+        """
+        Fits a Prophet model, warm-started from a previous model when its parameters fit.
+
+        Args:
+            series (Series): Daily values indexed by date.
+            previous (Prophet, optional): Previously fitted model of the series.
+
+        Returns:
+            tuple: Fitted model and the status ('warm_start' or 'cold_start').
+        """
+        df = series.reset_index()
+        df.columns = ['ds', 'y']
+        if previous is not None:
+            try:
+                return Prophet(**self.prophet_kwargs).fit(df, init=stan_init(previous)), 'warm_start'
+            except Exception:
+                # The previous parameters do not match the new model's shapes; fit from scratch
+                pass
+        return Prophet(**self.prophet_kwargs).fit(df), 'cold_start'
+
+    def __call__(self, series, variable_name):
+        """
+        Fit function interface of fit_prophet_model, for run_forecasts (the status goes to the metadata).
+
+        Args:
+            series (Series): Daily values indexed by date.
+            variable_name (str): Series name.
+
+        Returns:
+            tuple: Forecast and the variable name.
+        """
+        forecast, _ = self.forecast(series, variable_name)
+        return forecast, variable_name
+
+    def report(self):
+        """
+        Metadata of every cached series.
+
+        Returns:
+            DataFrame: One row per series with its data version, observations, last status and fit time.
+        """
+        records = []
+        for folder in sorted(os.listdir(self.cache_dir)) if os.path.isdir(self.cache_dir) else []:
+            metadata_file = os.path.join(self.cache_dir, folder, 'metadata.json')
+            if os.path.exists(metadata_file):
+                with open(metadata_file) as file:
+                    metadata = json.load(file)
+                records.append({key: value for key, value in metadata.items() if key != 'settings'})
+        return pd.DataFrame.from_records(records, index='name') if records else pd.DataFrame()
@@ -0,0 +1,76 @@
+import os
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def _run_job(key, series, fit_function):
+    """
+    Fits one forecasting job (runs inside a worker process).
+
+    Args:
+        key (str or tuple): Variable name, or (location, variable).
+        series (Series): The job's own time series.
+        fit_function (callable): Called as fit_function(series, name), returning (forecast, name)
+            like fit_prophet_model.
+
+    Returns:
+        tuple: The key, the forecast (None if the job failed) and a dict with the job's timing.
+    """
+    name = ' - '.join(key) if isinstance(key, tuple) else key
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    forecast, error = None, None
+    try:
+        forecast, _ = fit_function(series, name)
+    except Exception as exception:
+        error = f"{type(exception).__name__}: {exception}"
+    timing = {'n_observations': len(series), 'wall_time_s': time.perf_counter() - wall_start,
+              'cpu_time_s': time.process_time() - cpu_start, 'worker_pid': os.getpid(), 'error': error}
+    return key, forecast, timing
+
+
+def run_forecasts(series_map, fit_function, max_workers=None):
+    """
+    Fits independent forecasting jobs (one per variable and location) in a pool of worker processes.
+
+    Every job only ships its own series to its worker. The number of workers is capped by the CPU
+    count and by the number of jobs. A failing job does not stop the others; its error is reported in
+    the timing frame and it has no forecast rows.
+
+    Args:
+        series_map (dict): Variable name (or (location, variable) tuple) -> time series.
+        fit_function (callable): Called as fit_function(series, name), returning (forecast, name), where
+            forecast has 'ds', 'yhat', 'yhat_lower' and 'yhat_upper' columns (e.g. fit_prophet_model).
+        max_workers (int, optional): Maximum number of worker processes; defaults to the CPU count.
+
+    Returns:
+        DataFrame: Tidy forecasts, one row per job and date ('location' when the keys are tuples, 'variable',
+        'ds', 'yhat', 'yhat_lower', 'yhat_upper').
+        DataFrame: One row per job with 'n_observations', 'wall_time_s', 'cpu_time_s', 'worker_pid' and 'error'.
+    """
+    has_location = any(isinstance(key, tuple) for key in series_map)
+    key_columns = ['location', 'variable'] if has_location else ['variable']
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(max_workers or cpu_count, cpu_count, len(series_map)))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_run_job, key, series, fit_function): position
+                   for position, (key, series) in enumerate(series_map.items())}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    # Jobs finish in any order; report them in the order of series_map
+    forecasts, timings = [], []
+    for position in sorted(results):
+        key, forecast, timing = results[position]
+        labels = dict(zip(key_columns, key if isinstance(key, tuple) else (key,)))
+        timings.append({**labels, **timing})
+        if forecast is not None:
+            forecasts.append(forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].assign(**labels))
+
+    columns = key_columns + ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+    forecast_frame = pd.concat(forecasts, ignore_index=True)[columns] if forecasts else pd.DataFrame(columns=columns)
+    timing_frame = pd.DataFrame(timings, columns=key_columns + ['n_observations', 'wall_time_s', 'cpu_time_s',
+                                                                'worker_pid', 'error'])
+    return forecast_frame, timing_frame
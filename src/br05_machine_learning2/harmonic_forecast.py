@@ -0,0 +1,188 @@
+import time
+import numpy as np
+import pandas as pd
+from scipy.stats import t as student_t
+
+
+def harmonic_design(ds, origin, yearly_order=10, weekly_order=3):
+    """
+    Regression design matrix with a linear trend and Fourier seasonal terms (as Prophet's defaults).
+
+    Args:
+        ds (DatetimeIndex): Dates of the rows.
+        origin (Timestamp): Date where the trend is zero.
+        yearly_order (int): Number of yearly sine/cosine pairs (0 disables yearly seasonality).
+        weekly_order (int): Number of weekly sine/cosine pairs (0 disables weekly seasonality).
+
+    Returns:
+        ndarray: Matrix of shape (dates, 2 + 2 * (yearly_order + weekly_order)).
+    """
+    days = (pd.DatetimeIndex(ds) - origin) / pd.Timedelta(days=1)
+    days = np.asarray(days, dtype=float)
+    columns = [np.ones_like(days), days / 365.25]
+    for period, order in [(365.25, yearly_order), (7.0, weekly_order)]:
+        if order:
+            angles = 2 * np.pi * np.outer(days / period, np.arange(1, order + 1))
+            columns.extend([np.sin(angles), np.cos(angles)])
+    return np.column_stack(columns)
+
+
+class HarmonicForecaster:
+    """
+    Trend + Fourier seasonality linear model fitted to many daily series at once.
+
+    Series sharing the same dates are solved together: one least-squares solve with a column per series,
+    so the cost of the decomposition is paid once per group of dates rather than once per series. The
+    prediction intervals are the analytic OLS intervals, yhat +/- t * sigma * sqrt(1 + x (X'X)^-1 x'),
+    so no sampling is needed. This is much faster than Prophet for long-range daily climatology, at the
+    price of a single linear trend instead of Prophet's changepoints.
+
+    As in Prophet, with the default 'auto' orders yearly seasonality is only used for series spanning at
+    least two years and weekly seasonality for series spanning at least two weeks; shorter histories
+    cannot pin down the cycles, and extrapolating them would explode.
+
+    Attributes:
+        yearly_order (int or str): Number of yearly sine/cosine pairs, or 'auto'.
+        weekly_order (int or str): Number of weekly sine/cosine pairs, or 'auto'.
+        interval_width (float): Coverage of the prediction intervals (0.8 as Prophet).
+        groups (list): Fitted groups of series sharing the same dates (dicts with the keys, dates, seasonal
+            orders, coefficients, residual standard deviations and (X'X)^-1).
+    """
+
+    def __init__(self, yearly_order='auto', weekly_order='auto', interval_width=0.8):
+        """
+        Args:
+            yearly_order (int or str): Number of yearly sine/cosine pairs ('auto': 10 with two years of data).
+            weekly_order (int or str): Number of weekly sine/cosine pairs ('auto': 3 with two weeks of data).
+            interval_width (float): Coverage of the prediction intervals.
+        """
+        self.yearly_order = yearly_order
+        self.weekly_order = weekly_order
+        self.interval_width = interval_width
+        self.groups = []
+
+    def _orders(self, index):
+        """
+        Seasonal orders for a history, resolving 'auto' from its span.
+
+        Args:
+            index (DatetimeIndex): Dates of the history.
+
+        Returns:
+            tuple: Yearly and weekly order.
+        """
+        span_days = (index[-1] - index[0]) / pd.Timedelta(days=1) if len(index) else 0
+        yearly = (10 if span_days >= 730 else 0) if self.yearly_order == 'auto' else self.yearly_order
+        weekly = (3 if span_days >= 14 else 0) if self.weekly_order == 'auto' else self.weekly_order
+        return yearly, weekly
+
+    def fit(self, series_map):
+        """
+        Fits all series, solving those with identical dates in one batch.
+
+        Args:
+            series_map (dict): Variable name (or (location, variable) tuple) -> daily time series.
+
+        Returns:
+            HarmonicForecaster: This forecaster, for chaining.
+        """
+        by_dates = {}
+        for key, series in series_map.items():
+            series = series.dropna()
+            index = pd.DatetimeIndex(series.index)
+            by_dates.setdefault(index.asi8.tobytes(), (index, []))[1].append((key, series.to_numpy(dtype=float)))
+
+        self.groups = []
+        for index, members in by_dates.values():
+            origin, orders = index[0], self._orders(index)
+            X = harmonic_design(index, origin, *orders)
+            Y = np.column_stack([values for _, values in members])
+            coefficients, _, rank, _ = np.linalg.lstsq(X, Y, rcond=None)
+            residual_dof = max(len(index) - rank, 1)
+            sigma = np.sqrt(((Y - X @ coefficients) ** 2).sum(axis=0) / residual_dof)
+            self.groups.append({'keys': [key for key, _ in members], 'ds': index, 'origin': origin, 'orders': orders,
+                                'coefficients': coefficients, 'sigma': sigma,
+                                'xtx_inv': np.linalg.pinv(X.T @ X), 'residual_dof': residual_dof})
+        return self
+
+    def predict(self, periods=5 * 365, include_history=True):
+        """
+        Forecasts every fitted series.
+
+        Args:
+            periods (int): Number of days to forecast after each series' last date.
+            include_history (bool): Include the fitted values for the history, as Prophet's
+                make_future_dataframe does.
+
+        Returns:
+            DataFrame: Tidy forecasts as run_forecasts ('location' when the keys are tuples, 'variable',
+            'ds', 'yhat', 'yhat_lower', 'yhat_upper').
+        """
+        has_location = any(isinstance(key, tuple) for group in self.groups for key in group['keys'])
+        key_columns = ['location', 'variable'] if has_location else ['variable']
+        frames = []
+        for group in self.groups:
+            future = pd.date_range(group['ds'][-1] + pd.Timedelta(days=1), periods=periods, freq='D')
+            ds = group['ds'].append(future) if include_history else future
+            X = harmonic_design(ds, group['origin'], *group['orders'])
+            yhat = X @ group['coefficients']
+            leverage = np.einsum('ij,jk,ik->i', X, group['xtx_inv'], X)
+            quantile = student_t.ppf(0.5 + self.interval_width / 2, group['residual_dof'])
+            half_width = quantile * np.outer(np.sqrt(1 + leverage), group['sigma'])
+            for position, key in enumerate(group['keys']):
+                labels = dict(zip(key_columns, key if isinstance(key, tuple) else (key,)))
+                frames.append(pd.DataFrame({'ds': ds, 'yhat': yhat[:, position],
+                                            'yhat_lower': yhat[:, position] - half_width[:, position],
+                                            'yhat_upper': yhat[:, position] + half_width[:, position]}).assign(**labels))
+        columns = key_columns + ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+        return pd.concat(frames, ignore_index=True)[columns] if frames else pd.DataFrame(columns=columns)
+
+
+def fit_harmonic_model(series, variable_name, periods=5 * 365):
+    """
+    Drop-in replacement for fit_prophet_model using the harmonic regression.
+
+    Args:
+        series (Series): The time series data to fit.
+        variable_name (str): Name of the variable being forecasted.
+        periods (int): Number of days to forecast.
+
+    Returns:
+        DataFrame: Forecasted values with confidence intervals ('ds', 'yhat', 'yhat_lower', 'yhat_upper').
+        str: Variable name.
+    """
+    forecast = HarmonicForecaster().fit({variable_name: series}).predict(periods)
+    return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']], variable_name
+
+
+def compare_engines(series_map, engines, horizon=365):
+    """
+    Hold-out comparison of forecast engines: each engine is fitted on all but the last `horizon` days
+    of every series and scored on those days.
+
+    Args:
+        series_map (dict): Variable name -> daily time series.
+        engines (dict): Engine name -> fit function with the fit_prophet_model interface
+            (series, name) -> (forecast, name); the forecast must cover the held-out days.
+        horizon (int): Number of held-out days at the end of each series.
+
+    Returns:
+        DataFrame: One row per series and engine with 'mae', 'rmse', 'coverage' (share of held-out
+        values inside the interval), 'mean_interval_width' and 'fit_time_s'.
+    """
+    records = []
+    for name, series in series_map.items():
+        series = series.dropna()
+        train, test = series.iloc[:-horizon], series.iloc[-horizon:]
+        for engine, fit_function in engines.items():
+            start = time.perf_counter()
+            forecast, _ = fit_function(train, name)
+            fit_time = time.perf_counter() - start
+            scored = forecast.set_index('ds').reindex(pd.DatetimeIndex(test.index))
+            error = scored['yhat'].to_numpy() - test.to_numpy()
+            inside = (test.to_numpy() >= scored['yhat_lower'].to_numpy()) & (test.to_numpy() <= scored['yhat_upper'].to_numpy())
+            records.append({'variable': name, 'engine': engine, 'mae': np.nanmean(np.abs(error)),
+                            'rmse': np.sqrt(np.nanmean(error ** 2)), 'coverage': inside.mean(),
+                            'mean_interval_width': (scored['yhat_upper'] - scored['yhat_lower']).mean(),
+                            'fit_time_s': fit_time})
+    return pd.DataFrame(records).set_index(['variable', 'engine'])
@@ -0,0 +1,213 @@
+import os
+import sys
+import time
+import threading
+import psutil
+import pandas as pd
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class ResourceMonitor:
+    """
+    Samples CPU and memory usage in a background thread, tagged with the stage that is running.
+
+    Unlike a blocking `psutil.cpu_percent(interval=1)` call, sampling costs the monitored code nothing:
+    the thread wakes up every `interval` seconds, and CPU percentages are measured over the time since
+    the previous sample. Child processes (e.g. forecasting workers or Stan) are included in the process
+    CPU and RSS figures. psutil measures CPU since the previous call on the same object, so samples
+    taken by the thread and by stage boundaries in the main thread are serialized by a lock. The
+    OS high-water mark of the RSS is recorded too; it covers the whole process lifetime, so it is not
+    a per-stage peak, but it shows spikes that fell between two samples.
+
+    Attributes:
+        interval (float): Seconds between two samples.
+        include_children (bool): Add child processes to the process CPU and RSS.
+        samples (list): Recorded samples (dicts).
+        stages (list): (stage, start, end) of every finished stage, as seconds since the monitor started.
+    """
+
+    def __init__(self, interval=0.5, include_children=True):
+        """
+        Args:
+            interval (float): Seconds between two samples.
+            include_children (bool): Add child processes to the process CPU and RSS.
+        """
+        self.interval = interval
+        self.include_children = include_children
+        self.samples = []
+        self.stages = []
+        self.process = psutil.Process(os.getpid())
+        self._children = {}
+        self._current_stage = None
+        self._start = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _lifetime_peak_rss_mb(self):
+        """
+        Peak RSS of this process (and of its finished children) since it started, as reported by the OS.
+
+        Returns:
+            float: Peak memory in MB (NaN where the resource module is not available).
+        """
+        if resource is None:
+            return float('nan')
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if self.include_children:
+            peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+    def sample(self):
+        """
+        Records one sample immediately (also called by the background thread).
+
+        Returns:
+            dict: The recorded sample.
+        """
+        with self._lock:
+            return self._sample()
+
+    def _sample(self):
+        """
+        Takes and records one sample; the caller holds the lock.
+
+        Returns:
+            dict: The recorded sample.
+        """
+        cpu = self.process.cpu_percent(interval=None)
+        rss = self.process.memory_info().rss
+        if self.include_children:
+            for child in self.process.children(recursive=True):
+                # psutil measures CPU between calls on the same Process object, so children are kept
+                child = self._children.setdefault(child.pid, child)
+                try:
+                    cpu += child.cpu_percent(interval=None)
+                    rss += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    self._children.pop(child.pid, None)
+        record = {
+            'time_s': time.perf_counter() - self._start if self._start is not None else 0.0,
+            'stage': self._current_stage,
+            'process_cpu_percent': cpu,
+            'system_cpu_percent': psutil.cpu_percent(interval=None),
+            'rss_mb': rss / 1024 ** 2,
+            'lifetime_peak_rss_mb': self._lifetime_peak_rss_mb(),
+            'system_memory_percent': psutil.virtual_memory().percent
+        }
+        self.samples.append(record)
+        return record
+
+    def _run(self):
+        """
+        Sampling loop of the background thread.
+        """
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        """
+        Starts the background sampling thread.
+
+        Returns:
+            ResourceMonitor: This monitor, for chaining.
+        """
+        self._start = time.perf_counter()
+        # The first CPU reading only sets the reference point
+        self.process.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='resource-monitor', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the background sampling thread after a final sample.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+            self.sample()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Tags all samples taken inside the `with` block with a stage name.
+
+        A sample is taken when the stage starts and when it ends, so even stages shorter than the
+        interval appear in the summary.
+
+        Args:
+            name (str): Stage name, e.g. "Prophet fit".
+        """
+        previous = self._current_stage
+        self._current_stage = name
+        start = time.perf_counter() - self._start if self._start is not None else 0.0
+        self.sample()
+        try:
+            yield self
+        finally:
+            self.sample()
+            end = time.perf_counter() - self._start if self._start is not None else 0.0
+            self.stages.append((name, start, end))
+            self._current_stage = previous
+
+    def to_frame(self):
+        """
+        All samples as a time series.
+
+        Returns:
+            DataFrame: One row per sample.
+        """
+        with self._lock:
+            return pd.DataFrame(self.samples, columns=['time_s', 'stage', 'process_cpu_percent', 'system_cpu_percent',
+                                                       'rss_mb', 'lifetime_peak_rss_mb', 'system_memory_percent'])
+
+    def summary(self):
+        """
+        Per-stage summary of the samples.
+
+        Returns:
+            DataFrame: Per stage the duration, number of samples, mean and max process CPU, max system CPU,
+            max sampled RSS (the stage's peak) and the OS-reported lifetime peak RSS at the end of the stage.
+        """
+        samples = self.to_frame()
+        durations = pd.DataFrame(self.stages, columns=['stage', 'start_s', 'end_s'])
+        durations = durations.assign(duration_s=durations['end_s'] - durations['start_s']).groupby('stage')['duration_s'].sum()
+        grouped = samples.dropna(subset=['stage']).groupby('stage', sort=False)
+        return pd.DataFrame({
+            'duration_s': durations,
+            'n_samples': grouped.size(),
+            'mean_process_cpu_percent': grouped['process_cpu_percent'].mean(),
+            'max_process_cpu_percent': grouped['process_cpu_percent'].max(),
+            'max_system_cpu_percent': grouped['system_cpu_percent'].max(),
+            'max_rss_mb': grouped['rss_mb'].max(),
+            'lifetime_peak_rss_mb': grouped['lifetime_peak_rss_mb'].max()
+        }).reindex(list(dict.fromkeys(name for name, _, _ in self.stages)))
+
+    def export(self, path):
+        """
+        Writes the samples to a CSV or JSON file (chosen by the extension).
+
+        Args:
+            path (str): Output file ('.json' for JSON records, anything else for CSV).
+        """
+        samples = self.to_frame()
+        if str(path).endswith('.json'):
+            samples.to_json(path, orient='records')
+        else:
+            samples.to_csv(path, index=False)
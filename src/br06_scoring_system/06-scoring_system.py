@@ -2,11 +2,19 @@ import sqlite3
 import pandas as pd
 import matplotlib.pyplot as plt
 import sys
+import os
 from datetime import datetime
 
 # Importing WeatherAnalyzer from the analyze_data script
 sys.path.append('/workspaces/weather-scraper-analyzer/src/br03_data_analysis')
 from analyze_data import WeatherAnalyzer
+from score_store import ScoreStore
+from best_days_index import BestDaysIndex
+from scenario_sweep import config_grid, config_row, sweep
+from window_scoring import window_scores, best_windows
+from hourly_scoring import score_hour_windows, hourly_coverage
+sys.path.append('/workspaces/weather-scraper-analyzer/src/br01_02_fetch_data/store_data')
+from compact_data import load_hourly_summary
 
 # Connect to SQLite database and load daily weather data
 with sqlite3.connect(r"/workspaces/weather-scraper-analyzer/data/weather_data.db") as conn:
@@ -35,50 +43,27 @@ ideal_conditions = {
     "wind_speed": 10  # Ideal wind speed in km/h
 }
 
-# Function to calculate event suitability score
-def calculate_score(temperature, precipitation, wind_speed):
-    # Normalize temperature: higher score if within the ideal range
-    if ideal_conditions["temperature"][0] <= temperature <= ideal_conditions["temperature"][1]:
-        temp_score = 1
-    else:
-        temp_score = max(0, min(1, 1 - abs(temperature - ideal_conditions["temperature"][0]) / 
-                               (ideal_conditions["temperature"][1] - ideal_conditions["temperature"][0])))
-
-    # Normalize precipitation: higher score if there's no precipitation
-    precip_score = 1 if precipitation <= ideal_conditions["precipitation"] else 0
-
-    # Normalize wind speed: higher score if wind speed is close to the ideal
-    wind_score = max(0, min(1, 1 - abs(wind_speed - ideal_conditions["wind_speed"]) / ideal_conditions["wind_speed"]))
-
-    # Composite score calculation using weights
-    score = (temp_score * weather_weights["temperature"] +
-             precip_score * weather_weights["precipitation"] +
-             wind_score * weather_weights["wind_speed"])
-    return score * 100  # Scale score to be out of 100
-
-# Calculate scores for historical data
-scores = []
-for index, row in daily_df.iterrows():
-    try:
-        temperature = row["temperature_2m_mean_C"]
-        precipitation = row["precipitation_sum_mm"]
-        wind_speed = row["wind_speed_10m_max_kmh"]
-
-        # Skip rows with missing values
-        if pd.isnull(temperature) or pd.isnull(precipitation) or pd.isnull(wind_speed):
-            continue
-
-        # Calculate the event suitability score
-        score = calculate_score(temperature, precipitation, wind_speed)
-        scores.append({"date": index, "score": score})
-    except Exception as e:
-        print(f"Error processing row {index}: {e}")
-
-# Convert scores to a DataFrame
-scores_df = pd.DataFrame(scores)
-
-# Save scores to a CSV file for further use
-scores_df.to_csv(r"/workspaces/weather-scraper-analyzer/output/event_suitability_scores.csv", index=False)
+# Scores are materialized in the database per scoring configuration: only new or changed days are
+# scored, and a changed configuration is scored in full under its own version
+score_store = ScoreStore(conn)
+refresh = score_store.refresh(daily_df, weights=weather_weights, ideal_conditions=ideal_conditions)
+print(f"Scoring config {refresh['config_version']}: {refresh['scored']} days scored, "
+      f"{refresh['unchanged']} unchanged, {refresh['removed']} removed")
+scores_df = score_store.scores(refresh['config_version'])[['score']].reset_index()
+
+# Save scores to a CSV file for further use; the configuration version of the export is kept next to
+# it, so the file is only rewritten when the scores or the configuration changed
+scores_path = r"/workspaces/weather-scraper-analyzer/output/event_suitability_scores.csv"
+version_path = scores_path + ".version"
+exported_version = None
+if os.path.exists(version_path):
+    with open(version_path) as file:
+        exported_version = file.read().strip()
+if refresh['scored'] or refresh['removed'] or exported_version != refresh['config_version'] \
+        or not os.path.exists(scores_path):
+    scores_df.to_csv(scores_path, index=False)
+    with open(version_path, 'w') as file:
+        file.write(refresh['config_version'])
 
 # Analyze historical scores
 print("Descriptive statistics for event suitability scores:")
@@ -90,6 +75,45 @@ monthly_avg_scores = scores_df.groupby('month')['score'].mean()
 print("\nAverage Event Suitability Score by Month:")
 print(monthly_avg_scores)
 
+# Best days queries over any date range (and location set) without re-sorting the scores
+best_days = BestDaysIndex(scores_df.set_index('date'))
+print("\nTop 10 days for events:")
+print(best_days.top_k(10))
+print("\nBest 3 days of each month:")
+print(best_days.top_k_by_month(3))
+print(f"\nGood event days (score >= 70): {best_days.count_at_least(70).sum()}")
+
+# Sensitivity of the scores to the weights and ideal conditions, compared with the configuration above
+# (weights are relative: config_grid normalizes every combination to sum to 1)
+configs = config_grid(temperature_weight=[0.2, 0.3, 0.4, 0.5, 0.6], precipitation_weight=[0.2, 0.3, 0.4],
+                      temperature_low=[15, 16, 17, 18, 19, 20], temperature_high=[23, 25, 27], wind_speed=[5, 10, 15, 20])
+sensitivity, top_day_share = sweep(daily_df, configs, reference=config_row(weather_weights, ideal_conditions))
+print(f"\nScenario sweep over {len(configs)} scoring configurations:")
+print(sensitivity.sort_values('spearman').head(10))
+print("\nDays most often among the top 10 across configurations:")
+print(top_day_share.head(10))
+
+# Multi-day events: score every 3-day window and pick the best slot per month and per season
+windows = window_scores(scores_df.set_index('date'), window=3)
+print("\nBest 3-day window of each month:")
+print(best_windows(windows, by='month'))
+print("\nBest 3-day windows of each season (ranked by their worst day):")
+print(best_windows(windows, by='season', top=3, rank_by='min_score'))
+
+# Time-of-day windows scored on the hourly data (local time), e.g. an evening concert or a morning fair;
+# only raw hours can be scored, so the report is limited to the days that have not been compacted
+hourly_df = pd.read_sql(r"SELECT * FROM hourly_data", conn).drop(columns='index')
+hourly_df = hourly_df.set_index(pd.to_datetime(hourly_df['date'])).drop(columns='date')
+coverage = hourly_coverage(hourly_df, load_hourly_summary(conn))
+print(f"\nHour windows scored from {coverage['first_day']:%Y-%m-%d} to {coverage['last_day']:%Y-%m-%d} "
+      f"({coverage['raw_days']} days of raw hourly data, {coverage['compacted_days']} compacted days left out)")
+hour_window_scores = score_hour_windows(hourly_df, windows=[(18, 23), (9, 13)], timezone="Europe/Bucharest")
+print("\nAverage hour window score by month:")
+print(hour_window_scores.assign(month=hour_window_scores['date'].dt.month)
+      .pivot_table(index='month', columns='window', values='score', aggfunc='mean'))
+print("\nBest evenings (18:00-23:00):")
+print(hour_window_scores[hour_window_scores['window'] == '18-23'].nlargest(10, 'score'))
+
 # Visualize scores
 plt.figure(figsize=(12, 6))
 plt.plot(scores_df['date'], scores_df['score'], label="Event Suitability Score", color='green')
@@ -0,0 +1,310 @@
+import heapq
+import numpy as np
+import pandas as pd
+
+
+class _ArgmaxSparseTable:
+    """
+    Constant-time range argmax: table[level][i] is the position of the largest value in
+    [i, i + 2 ** level); a range is covered by two overlapping power-of-two windows.
+    Ties go to the earlier position.
+    """
+
+    def __init__(self, values):
+        """
+        Args:
+            values (ndarray): Scores in date order.
+        """
+        self.values = values
+        self.table = [np.arange(len(values))]
+        width = 1
+        while 2 * width <= len(values):
+            previous = self.table[-1]
+            self.table.append(self._better(previous[:-width], previous[width:]))
+            width *= 2
+
+    def _better(self, first, second):
+        """
+        Element-wise position of the larger value (the first one on ties).
+
+        Args:
+            first (ndarray or int): Positions.
+            second (ndarray or int): Positions later than `first`.
+
+        Returns:
+            ndarray or int: Positions of the larger values.
+        """
+        return np.where(self.values[second] > self.values[first], second, first)
+
+    def argmax(self, left, right):
+        """
+        Position of the largest value in [left, right) (must be non-empty).
+
+        Args:
+            left (int): Inclusive start position.
+            right (int): Exclusive end position.
+
+        Returns:
+            int: Position of the best value.
+        """
+        level = (right - left).bit_length() - 1
+        return int(self._better(self.table[level][left], self.table[level][right - 2 ** level]))
+
+
+class _MergeSortTree:
+    """
+    Counts values at or above a threshold in any position range in O(log^2 n).
+
+    Level j holds the values sorted inside aligned segments of 2 ** j positions; a range splits into
+    O(log n) aligned segments, each answered by a binary search.
+    """
+
+    def __init__(self, values):
+        """
+        Args:
+            values (ndarray): Scores in date order.
+        """
+        size = 1 << max(len(values) - 1, 0).bit_length()
+        padded = np.full(size, -np.inf)
+        padded[:len(values)] = values
+        self.levels = [padded]
+        width = 1
+        while width < size:
+            width *= 2
+            self.levels.append(np.sort(padded.reshape(-1, width), axis=1).ravel())
+
+    def count_at_least(self, left, right, threshold):
+        """
+        Number of values >= threshold in [left, right).
+
+        Args:
+            left (int): Inclusive start position.
+            right (int): Exclusive end position.
+            threshold (float): Lowest counted value.
+
+        Returns:
+            int: Count of values.
+        """
+        count, level = 0, 0
+        while left < right:
+            width = 1 << level
+            if left & 1:
+                segment = self.levels[level][left * width:(left + 1) * width]
+                count += width - int(np.searchsorted(segment, threshold, side='left'))
+                left += 1
+            if right & 1:
+                right -= 1
+                segment = self.levels[level][right * width:(right + 1) * width]
+                count += width - int(np.searchsorted(segment, threshold, side='left'))
+            left, right, level = left >> 1, right >> 1, level + 1
+        return count
+
+
+class BestDaysIndex:
+    """
+    Query index over daily suitability scores: best days, top-k days and the number of days above a
+    threshold for any date range and set of locations, without re-sorting the scores.
+
+    Per location, a sparse table answers the best day of a range in constant time. Top-k splits ranges
+    around the best day found so far and keeps the candidate ranges of all locations in one heap, so a
+    query costs O((k + locations) log(k + locations)). Threshold counts use a merge-sort tree in O(log^2 n).
+    Date ranges are [start, end), as in RangeStatisticsIndex.
+
+    Attributes:
+        locations (list): Indexed locations (a single None location if the scores have no location column).
+        has_location (bool): Whether the scores have a location column.
+    """
+
+    def __init__(self, scores, score_column='score', location_column='location'):
+        """
+        Builds the index from scored days.
+
+        Args:
+            scores (DataFrame): Scores indexed by date (e.g. scoring_engine.score_frame output).
+            score_column (str): Column with the score.
+            location_column (str): Column with the location name (optional in the data).
+        """
+        scores = scores[scores[score_column].notna()]
+        self.has_location = location_column in scores.columns
+        groups = scores.groupby(location_column, sort=True) if self.has_location else [(None, scores)]
+        self._dates, self._values, self._argmax, self._counts = {}, {}, {}, {}
+        for location, group in groups:
+            group = group.sort_index()
+            values = group[score_column].to_numpy(dtype=float)
+            self._dates[location] = pd.DatetimeIndex(group.index)
+            self._values[location] = values
+            self._argmax[location] = _ArgmaxSparseTable(values)
+            self._counts[location] = _MergeSortTree(values)
+        self.locations = list(self._dates)
+        self._location_order = {location: position for position, location in enumerate(self.locations)}
+
+    @classmethod
+    def from_csv(cls, path, score_column='score', location_column='location'):
+        """
+        Builds the index from a scores CSV such as event_suitability_scores.csv ('date', 'score' and
+        optionally 'location').
+
+        Args:
+            path (str): CSV file.
+            score_column (str): Column with the score.
+            location_column (str): Column with the location name (optional in the file).
+
+        Returns:
+            BestDaysIndex: The index.
+        """
+        scores = pd.read_csv(path, parse_dates=['date']).set_index('date')
+        return cls(scores, score_column, location_column)
+
+    def _range(self, location, start, end):
+        """
+        Position range of [start, end) in one location's dates (the whole history for None bounds).
+
+        Args:
+            location (str): Location.
+            start (str or Timestamp, optional): First date (inclusive).
+            end (str or Timestamp, optional): End date (exclusive).
+
+        Returns:
+            tuple: Inclusive start and exclusive end positions.
+        """
+        dates = self._dates[location]
+
+        def position(timestamp, default):
+            if timestamp is None:
+                return default
+            timestamp = pd.Timestamp(timestamp)
+            if timestamp.tz is None and dates.tz is not None:
+                timestamp = timestamp.tz_localize(dates.tz)
+            return int(dates.searchsorted(timestamp, side='left'))
+
+        return position(start, 0), position(end, len(dates))
+
+    def _selected(self, locations):
+        """
+        Locations of a query (all by default).
+
+        Args:
+            locations (list, optional): Location names.
+
+        Returns:
+            list: Indexed locations to query.
+        """
+        if locations is None:
+            return self.locations
+        unknown = set(locations) - set(self.locations)
+        if unknown:
+            raise KeyError(f"Unknown locations: {sorted(unknown)}")
+        return list(locations)
+
+    def _frame(self, rows):
+        """
+        Result rows as a DataFrame.
+
+        Args:
+            rows (list): (location, date, score) tuples.
+
+        Returns:
+            DataFrame: 'location' (if the scores have locations), 'date' and 'score' columns.
+        """
+        frame = pd.DataFrame(rows, columns=['location', 'date', 'score'])
+        return frame if self.has_location else frame.drop(columns='location')
+
+    def top_k(self, k=10, start=None, end=None, locations=None):
+        """
+        The k best-scoring days in [start, end) over the given locations, best first
+        (ties in date order).
+
+        Args:
+            k (int): Number of days.
+            start (str or Timestamp, optional): First date (inclusive).
+            end (str or Timestamp, optional): End date (exclusive).
+            locations (list, optional): Locations to include; all by default.
+
+        Returns:
+            DataFrame: Up to k rows with the location, date and score.
+        """
+        heap = []
+
+        def push(location, left, right):
+            if left < right:
+                best = self._argmax[location].argmax(left, right)
+                # Ties: earlier date first, then location order
+                heapq.heappush(heap, (-self._values[location][best], self._dates[location][best],
+                                      self._location_order[location], best, left, right))
+
+        for location in self._selected(locations):
+            push(location, *self._range(location, start, end))
+        rows = []
+        while heap and len(rows) < k:
+            score, date, location_position, best, left, right = heapq.heappop(heap)
+            location = self.locations[location_position]
+            rows.append((location, date, -score))
+            push(location, left, best)
+            push(location, best + 1, right)
+        return self._frame(rows)
+
+    def best_day(self, start=None, end=None, locations=None):
+        """
+        The best-scoring day in [start, end) over the given locations.
+
+        Args:
+            start (str or Timestamp, optional): First date (inclusive).
+            end (str or Timestamp, optional): End date (exclusive).
+            locations (list, optional): Locations to include; all by default.
+
+        Returns:
+            Series: Location (if any), date and score of the best day (None if the range is empty).
+        """
+        best = self.top_k(1, start, end, locations)
+        return best.iloc[0] if len(best) else None
+
+    def count_at_least(self, threshold, start=None, end=None, locations=None):
+        """
+        Number of days scoring at least `threshold` in [start, end), per location.
+
+        Args:
+            threshold (float): Lowest counted score (e.g. 70 for "good event" days).
+            start (str or Timestamp, optional): First date (inclusive).
+            end (str or Timestamp, optional): End date (exclusive).
+            locations (list, optional): Locations to include; all by default.
+
+        Returns:
+            Series: Count per location (a single 'all' entry when the scores have no location).
+        """
+        counts = {location if self.has_location else 'all':
+                  self._counts[location].count_at_least(*self._range(location, start, end), threshold)
+                  for location in self._selected(locations)}
+        return pd.Series(counts, name='days', dtype=int)
+
+    def top_k_by_month(self, k=3, start=None, end=None, locations=None):
+        """
+        The k best days of every calendar month in [start, end).
+
+        Args:
+            k (int): Number of days per month.
+            start (str or Timestamp, optional): First date (inclusive); defaults to the first indexed date.
+            end (str or Timestamp, optional): End date (exclusive); defaults to after the last indexed date.
+            locations (list, optional): Locations to include; all by default.
+
+        Returns:
+            DataFrame: Rows of every month's top-k, with a 'month' period column.
+        """
+        selected = self._selected(locations)
+        columns = (['location'] if self.has_location else []) + ['date', 'score', 'month']
+        with_data = [location for location in selected if len(self._dates[location])]
+        if not with_data:
+            return pd.DataFrame(columns=columns)
+        first = min(self._dates[location][0] for location in with_data)
+        last = max(self._dates[location][-1] for location in with_data)
+        if start is not None:
+            first = pd.Timestamp(start)
+            first = first.tz_localize(last.tz) if first.tz is None and last.tz is not None else first
+        if end is not None:
+            last = pd.Timestamp(end)
+            last = (last.tz_localize(first.tz) if last.tz is None and first.tz is not None else last) - pd.Timedelta(days=1)
+        frames = []
+        for month_start in pd.date_range(first.to_period('M').to_timestamp(), last, freq='MS', tz=first.tz):
+            month_end = month_start + pd.offsets.MonthBegin(1)
+            month = self.top_k(k, max(month_start, first), min(month_end, last + pd.Timedelta(days=1)), selected)
+            frames.append(month.assign(month=month_start.strftime('%Y-%m')))
+        return pd.concat(frames, ignore_index=True)[columns] if frames else pd.DataFrame(columns=columns)
@@ -0,0 +1,181 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+try:
+    from .scoring_engine import temperature_score, precipitation_score, wind_score, humidity_score
+except ImportError:
+    from scoring_engine import temperature_score, precipitation_score, wind_score, humidity_score
+
+# Weights of the sub-scores of an hour window
+HOURLY_WEIGHTS = {
+    "temperature": 0.35,
+    "precipitation": 0.3,
+    "wind_speed": 0.2,
+    "humidity": 0.15
+}
+
+# Ideal conditions: temperature range in °C, no rain in the window, wind speed in km/h, humidity range in %
+HOURLY_IDEAL_CONDITIONS = {
+    "temperature": (18, 25),
+    "precipitation": 0,
+    "wind_speed": 10,
+    "humidity": (30, 60)
+}
+
+# Hourly columns scored for each condition
+HOURLY_COLUMNS = {
+    "temperature": "temperature_2m_C",
+    "precipitation": "precipitation_mm",
+    "wind_speed": "wind_speed_10m_kmh",
+    "humidity": "relative_humidity_2m_percent"
+}
+
+
+def day_hour_cube(hourly, columns=HOURLY_COLUMNS, location_column='location', timezone=None):
+    """
+    Lays the hourly series of every location out as (locations, days, 24) arrays, one per condition.
+
+    Args:
+        hourly (DataFrame): Hourly data indexed by timestamp.
+        columns (dict): Column of each condition.
+        location_column (str): Column with the location name (optional in the data).
+        timezone (str, optional): Time zone the hours of day refer to (e.g. 'Europe/Bucharest'); naive
+            timestamps are taken as UTC. On daylight-saving changes the skipped hour is missing and the
+            repeated hour keeps its last value.
+
+    Returns:
+        dict: Condition -> array of shape (locations, days, 24), NaN for missing hours.
+        DatetimeIndex: The calendar days.
+        ndarray: The location names (a single '' when the data has no location column).
+    """
+    times = pd.DatetimeIndex(hourly.index)
+    if timezone is not None:
+        times = (times.tz_localize('UTC') if times.tz is None else times).tz_convert(timezone)
+    local = times.tz_localize(None) if times.tz is not None else times
+    days = local.normalize()
+    calendar = pd.date_range(days.min(), days.max(), freq='D')
+    day_positions = ((days - calendar[0]) // pd.Timedelta(days=1)).to_numpy()
+    locations = hourly[location_column].to_numpy() if location_column in hourly.columns else np.full(len(hourly), '')
+    location_names, location_positions = np.unique(locations, return_inverse=True)
+
+    cubes = {}
+    for name, column in columns.items():
+        cube = np.full((len(location_names), len(calendar), 24), np.nan)
+        cube[location_positions, day_positions, local.hour] = hourly[column].to_numpy(dtype=float)
+        cubes[name] = cube
+    return cubes, calendar, location_names
+
+
+def hourly_coverage(hourly, summary=None):
+    """
+    Days covered by the raw hourly data, checked against the compacted hourly history.
+
+    Hour windows can only be scored on raw hours; compacted days keep one summary row per day, so they
+    get no window score. A warning names how many summarized days are left out.
+
+    Args:
+        hourly (DataFrame): Hourly data indexed by timestamp.
+        summary (DataFrame, optional): Daily summaries of the compacted hours indexed by day
+            (compact_data.load_hourly_summary); None when nothing has been compacted.
+
+    Returns:
+        dict: 'first_day' and 'last_day' of the raw hours, the number of 'raw_days' and of
+        'compacted_days' (summarized days without raw hours).
+    """
+    times = pd.DatetimeIndex(hourly.index)
+    days = (times.tz_localize(None) if times.tz is not None else times).normalize().unique()
+    compacted = 0
+    if summary is not None and len(summary):
+        compacted = int((~pd.DatetimeIndex(summary.index).normalize().unique().isin(days)).sum())
+    coverage = {'first_day': days.min() if len(days) else None, 'last_day': days.max() if len(days) else None,
+                'raw_days': len(days), 'compacted_days': compacted}
+    if compacted:
+        warnings.warn(f"Hour windows only cover the raw hourly data ({len(days)} days); "
+                      f"{compacted} compacted days have daily summaries only and are not scored")
+    return coverage
+
+
+def _window_hours(start, end):
+    """
+    Hour offsets of a window from the start of its day; windows ending at or before their start hour
+    wrap into the next day (e.g. 22-02 covers 22:00 to 02:00).
+
+    Args:
+        start (int): First hour (0-23).
+        end (int): Hour at which the window ends (exclusive, 1-24).
+
+    Returns:
+        ndarray: Offsets in hours, possibly beyond 23.
+    """
+    if not (0 <= start <= 23 and 0 <= end <= 24):
+        raise ValueError(f"Invalid hour window ({start}, {end})")
+    length = end - start if end > start else end + 24 - start
+    return start + np.arange(length)
+
+
+def score_hour_windows(hourly, windows=((18, 23),), weights=HOURLY_WEIGHTS, ideal_conditions=HOURLY_IDEAL_CONDITIONS,
+                       columns=HOURLY_COLUMNS, location_column='location', timezone=None, dropna=True):
+    """
+    Scores time-of-day windows (e.g. an evening concert from 18:00 to 23:00) on every day and location.
+
+    The hourly history is reshaped once into days x 24 matrices and the hourly sub-scores are computed
+    for all hours in one pass; each window then gathers its hours from the flattened matrices and
+    reduces them along the hour axis. Temperature, wind and humidity sub-scores are averaged over the
+    window's hours; precipitation scores the window's total (1 for a dry window, 0 otherwise). A window
+    with a missing hour gets no score. Only days with raw hours can be scored: days compacted into daily
+    summaries (compact_data.compact_hourly_history) are not covered, see hourly_coverage.
+
+    Args:
+        hourly (DataFrame): Hourly data indexed by timestamp.
+        windows (list): (start hour, end hour) pairs; the end is exclusive and may wrap past midnight.
+        weights (dict): Weights of the 'temperature', 'precipitation', 'wind_speed' and 'humidity' sub-scores.
+        ideal_conditions (dict): Ideal 'temperature' range, 'precipitation', 'wind_speed' and 'humidity' range.
+        columns (dict): Column of each condition.
+        location_column (str): Column with the location name (optional in the data).
+        timezone (str, optional): Time zone of the window hours (see day_hour_cube).
+        dropna (bool): Leave out windows without a score.
+
+    Returns:
+        DataFrame: One row per location (if any), day and window with 'date', 'window' (e.g. '18-23'),
+        'precipitation_mm', the four sub-scores and 'score' (0-100).
+    """
+    cubes, calendar, location_names = day_hour_cube(hourly, columns, location_column, timezone)
+    n_locations, n_days = len(location_names), len(calendar)
+
+    # Hourly sub-scores in one pass, flattened per location with a day of padding for wrapping windows
+    hour_scores = {
+        'temperature_score': temperature_score(cubes['temperature'], ideal_conditions["temperature"]),
+        'wind_score': wind_score(cubes['wind_speed'], ideal_conditions["wind_speed"]),
+        'humidity_score': humidity_score(cubes['humidity'], ideal_conditions["humidity"]),
+        'precipitation_mm': cubes['precipitation']
+    }
+    padding = np.full((n_locations, 24), np.nan)
+    flat = {name: np.concatenate([values.reshape(n_locations, -1), padding], axis=1)
+            for name, values in hour_scores.items()}
+
+    frames = []
+    for start, end in windows:
+        positions = np.arange(n_days)[:, None] * 24 + _window_hours(start, end)
+        gathered = {name: values[:, positions] for name, values in flat.items()}
+        # Means and sums propagate NaN, so a window with a missing hour stays unscored
+        window = {name: gathered[name].mean(axis=-1) for name in ['temperature_score', 'wind_score', 'humidity_score']}
+        window['precipitation_mm'] = gathered['precipitation_mm'].sum(axis=-1)
+        window['precipitation_score'] = precipitation_score(window['precipitation_mm'], ideal_conditions["precipitation"])
+        window['score'] = (window['temperature_score'] * weights["temperature"] +
+                           window['precipitation_score'] * weights["precipitation"] +
+                           window['wind_score'] * weights["wind_speed"] +
+                           window['humidity_score'] * weights["humidity"]) * 100
+        frame = pd.DataFrame({name: values.ravel() for name, values in window.items()})
+        frame.insert(0, 'window', f"{start:02d}-{end:02d}")
+        frame.insert(0, 'date', np.tile(calendar, n_locations))
+        if location_column in hourly.columns:
+            frame.insert(0, 'location', np.repeat(location_names, n_days))
+        frames.append(frame)
+
+    result = pd.concat(frames, ignore_index=True)
+    columns_order = [column for column in ['location', 'date', 'window', 'precipitation_mm', 'temperature_score',
+                                           'precipitation_score', 'wind_score', 'humidity_score', 'score']
+                     if column in result.columns]
+    result = result[columns_order]
+    return result.dropna(subset=['score']).reset_index(drop=True) if dropna else result
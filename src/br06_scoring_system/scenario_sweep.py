@@ -0,0 +1,153 @@
+import itertools
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+try:
+    from .scoring_engine import calculate_scores, DEFAULT_WEIGHTS, DEFAULT_IDEAL_CONDITIONS, SCORE_COLUMNS
+except ImportError:
+    from scoring_engine import calculate_scores, DEFAULT_WEIGHTS, DEFAULT_IDEAL_CONDITIONS, SCORE_COLUMNS
+
+# One column per scoring parameter in a configurations frame
+PARAMETER_COLUMNS = ['temperature_weight', 'precipitation_weight', 'wind_speed_weight',
+                     'temperature_low', 'temperature_high', 'precipitation', 'wind_speed']
+WEIGHT_COLUMNS = PARAMETER_COLUMNS[:3]
+
+
+def config_row(weights=DEFAULT_WEIGHTS, ideal_conditions=DEFAULT_IDEAL_CONDITIONS):
+    """
+    Flattens a (weights, ideal conditions) pair into one configurations-frame row.
+
+    Args:
+        weights (dict): Weights of the sub-scores.
+        ideal_conditions (dict): Ideal conditions.
+
+    Returns:
+        dict: Values of PARAMETER_COLUMNS.
+    """
+    return {'temperature_weight': weights["temperature"], 'precipitation_weight': weights["precipitation"],
+            'wind_speed_weight': weights["wind_speed"], 'temperature_low': ideal_conditions["temperature"][0],
+            'temperature_high': ideal_conditions["temperature"][1],
+            'precipitation': ideal_conditions["precipitation"], 'wind_speed': ideal_conditions["wind_speed"]}
+
+
+def normalize_weights(configs):
+    """
+    Rescales the weights of every configuration to sum to 1, so scores stay within 0-100.
+
+    Args:
+        configs (DataFrame): One configuration per row with PARAMETER_COLUMNS.
+
+    Returns:
+        DataFrame: A copy with normalized weight columns.
+
+    Raises:
+        ValueError: If a weight is negative or all weights of a configuration are 0.
+    """
+    weights = configs[WEIGHT_COLUMNS].to_numpy(dtype=float)
+    totals = weights.sum(axis=1, keepdims=True)
+    if (weights < 0).any() or (totals <= 0).any():
+        raise ValueError("Scoring weights must be non-negative with a positive sum")
+    return configs.assign(**dict(zip(WEIGHT_COLUMNS, (weights / totals).T)))
+
+
+def config_grid(**values):
+    """
+    Every combination of the given parameter values; parameters not given keep their default.
+
+    Weights are relative: every combination is normalized to sum to 1, and combinations that only
+    differ by a common factor of their weights are kept once.
+
+    Args:
+        **values: Lists of values per parameter of PARAMETER_COLUMNS, e.g. temperature_weight=[0.3, 0.4, 0.5].
+
+    Returns:
+        DataFrame: One configuration per row (the defaults first when they are part of the grid).
+    """
+    unknown = set(values) - set(PARAMETER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown scoring parameters: {sorted(unknown)}")
+    default = config_row()
+    axes = [values.get(column, [default[column]]) for column in PARAMETER_COLUMNS]
+    grid = normalize_weights(pd.DataFrame(list(itertools.product(*axes)), columns=PARAMETER_COLUMNS))
+    # Rounding merges weights that are equal up to floating-point error after the division
+    return grid[~grid.round(12).duplicated()].reset_index(drop=True)
+
+
+def sweep_scores(data, configs, columns=SCORE_COLUMNS):
+    """
+    Scores of every day under every configuration as one configs x days array.
+
+    Args:
+        data (DataFrame): Daily data with the scored columns (rows with missing inputs give NaN).
+        configs (DataFrame): One configuration per row with PARAMETER_COLUMNS (weights are normalized
+            to sum to 1, see normalize_weights).
+        columns (dict): Column of each condition.
+
+    Returns:
+        ndarray: Scores of shape (configs, days).
+    """
+    configs = normalize_weights(configs)
+    parameter = {column: configs[column].to_numpy(dtype=float)[:, None] for column in PARAMETER_COLUMNS}
+    weights = {"temperature": parameter['temperature_weight'], "precipitation": parameter['precipitation_weight'],
+               "wind_speed": parameter['wind_speed_weight']}
+    ideal_conditions = {"temperature": (parameter['temperature_low'], parameter['temperature_high']),
+                        "precipitation": parameter['precipitation'], "wind_speed": parameter['wind_speed']}
+    return calculate_scores(data[columns["temperature"]].to_numpy(dtype=float)[None, :],
+                            data[columns["precipitation"]].to_numpy(dtype=float)[None, :],
+                            data[columns["wind_speed"]].to_numpy(dtype=float)[None, :],
+                            weights, ideal_conditions)['score']
+
+
+def sweep(data, configs, reference=None, top_k=10, threshold=70, columns=SCORE_COLUMNS, chunk_size=256):
+    """
+    Sensitivity analysis: scores all days under many configurations and summarizes each one.
+
+    Configurations are scored in chunks of broadcasted configs x days arrays, so memory stays bounded
+    for thousands of configurations. Rank stability compares each configuration's ranking of the days
+    with the reference configuration: the Spearman correlation of the full rankings and the share of
+    the reference's top-k days that stay in the configuration's top-k.
+
+    Args:
+        data (DataFrame): Daily data with the scored columns (rows with a missing input are left out).
+        configs (DataFrame): One configuration per row with PARAMETER_COLUMNS (e.g. from config_grid).
+        reference (dict, optional): Reference configuration row (config_row()); the default scoring by default.
+        top_k (int): Number of best days compared for rank stability.
+        threshold (float): Score of a "good event" day.
+        columns (dict): Column of each condition.
+        chunk_size (int): Number of configurations scored per array computation.
+
+    Returns:
+        DataFrame: Per configuration its parameters (normalized weights), 'mean', 'std', 'min', 'p10', 'median', 'p90',
+        'good_day_share', 'spearman' and 'top_k_overlap'.
+        Series: Per day, the share of configurations that put it in their top-k.
+    """
+    configs = normalize_weights(configs)
+    valid = data[[columns[name] for name in ['temperature', 'precipitation', 'wind_speed']]].notna().all(axis=1)
+    data = data[valid.to_numpy()]
+    reference_scores = sweep_scores(data, pd.DataFrame([reference or config_row()]), columns)[0]
+    reference_ranks = rankdata(reference_scores)
+    reference_top = np.zeros(len(data), dtype=bool)
+    reference_top[np.argsort(-reference_scores, kind='stable')[:top_k]] = True
+
+    statistics, top_counts = [], np.zeros(len(data))
+    for begin in range(0, len(configs), chunk_size):
+        scores = sweep_scores(data, configs.iloc[begin:begin + chunk_size], columns)
+        p10, median, p90 = np.percentile(scores, [10, 50, 90], axis=1)
+        ranks = rankdata(scores, axis=1)
+        centered, reference_centered = ranks - ranks.mean(axis=1, keepdims=True), reference_ranks - reference_ranks.mean()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            spearman = centered @ reference_centered / np.sqrt((centered ** 2).sum(axis=1) * (reference_centered ** 2).sum())
+        top = np.argsort(-scores, axis=1, kind='stable')[:, :top_k]
+        np.add.at(top_counts, top.ravel(), 1)
+        statistics.append(pd.DataFrame({
+            'mean': scores.mean(axis=1), 'std': scores.std(axis=1), 'min': scores.min(axis=1),
+            'p10': p10, 'median': median, 'p90': p90, 'good_day_share': (scores >= threshold).mean(axis=1),
+            'spearman': spearman, 'top_k_overlap': reference_top[top].sum(axis=1) / min(top_k, len(data))
+        }))
+
+    summary = pd.concat([configs.reset_index(drop=True), pd.concat(statistics, ignore_index=True)], axis=1)
+    index = pd.MultiIndex.from_arrays([data['location'].to_numpy(), data.index], names=['location', 'date']) \
+        if 'location' in data.columns else data.index.rename('date')
+    frequency = pd.Series(top_counts / len(configs), index=index, name='top_k_share')
+    return summary, frequency.sort_values(ascending=False, kind='stable')
@@ -0,0 +1,159 @@
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+try:
+    from .scoring_engine import calculate_scores, DEFAULT_WEIGHTS, DEFAULT_IDEAL_CONDITIONS, SCORE_COLUMNS
+except ImportError:
+    from scoring_engine import calculate_scores, DEFAULT_WEIGHTS, DEFAULT_IDEAL_CONDITIONS, SCORE_COLUMNS
+
+# Stored inputs (compared on every refresh to find changed days) and sub-scores
+INPUT_COLUMNS = ['temperature', 'precipitation', 'wind_speed']
+SCORE_OUTPUT_COLUMNS = ['temperature_score', 'precipitation_score', 'wind_score', 'score']
+
+
+def config_version(weights=DEFAULT_WEIGHTS, ideal_conditions=DEFAULT_IDEAL_CONDITIONS, columns=SCORE_COLUMNS):
+    """
+    Short stable identifier of a scoring configuration.
+
+    Args:
+        weights (dict): Weights of the sub-scores.
+        ideal_conditions (dict): Ideal conditions.
+        columns (dict): Column of each condition.
+
+    Returns:
+        str: 16 hex characters of the configuration's hash.
+    """
+    config = json.dumps({'weights': weights, 'ideal_conditions': ideal_conditions, 'columns': columns},
+                        sort_keys=True, default=list)
+    return hashlib.sha256(config.encode()).hexdigest()[:16]
+
+
+class ScoreStore:
+    """
+    Event suitability scores materialized in the SQLite database, keyed by (location, date, config_version).
+
+    The inputs of every scored day are stored next to its scores. A refresh compares them with the
+    current data and scores only the new or changed days, in one vectorized call; a new scoring
+    configuration gets its own version and is scored in full without touching other versions.
+    Days that are no longer in the data are removed from the refreshed version. Days with a missing
+    input are stored with a NULL score, so they are not rescored on every run.
+
+    Attributes:
+        conn (Connection): SQLite connection object.
+        table_name (str): Table holding the scores.
+        config_table (str): Table holding the configuration of every version.
+    """
+
+    def __init__(self, conn, table_name='event_scores'):
+        """
+        Creates the tables if needed.
+
+        Args:
+            conn (Connection): SQLite connection object.
+            table_name (str): Table holding the scores.
+        """
+        self.conn = conn
+        self.table_name = table_name
+        self.config_table = f"{table_name}_configs"
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} "
+                     "(location TEXT, date TEXT, config_version TEXT, temperature REAL, precipitation REAL, "
+                     "wind_speed REAL, temperature_score REAL, precipitation_score REAL, wind_score REAL, score REAL, "
+                     "PRIMARY KEY (location, date, config_version))")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {self.config_table} (config_version TEXT PRIMARY KEY, config TEXT)")
+        conn.commit()
+
+    def refresh(self, data, weights=DEFAULT_WEIGHTS, ideal_conditions=DEFAULT_IDEAL_CONDITIONS, columns=SCORE_COLUMNS,
+                location_column='location'):
+        """
+        Scores the days that are missing or whose inputs changed for the given configuration, and removes
+        the stored days of that configuration that are gone from the data.
+
+        Args:
+            data (DataFrame): Daily weather data indexed by date.
+            weights (dict): Weights of the sub-scores.
+            ideal_conditions (dict): Ideal conditions.
+            columns (dict): Column of each condition ('temperature', 'precipitation', 'wind_speed').
+            location_column (str): Column with the location name ('' is used when it is missing).
+
+        Returns:
+            dict: 'config_version', number of days 'scored', days left 'unchanged' and stale days 'removed'.
+        """
+        version = config_version(weights, ideal_conditions, columns)
+        current = pd.DataFrame({
+            'location': data[location_column].to_numpy() if location_column in data.columns else '',
+            'date': pd.DatetimeIndex(data.index).strftime('%Y-%m-%d %H:%M:%S'),
+            **{name: data[columns[name]].to_numpy(dtype=float) for name in INPUT_COLUMNS}
+        })
+        stored = pd.read_sql(f"SELECT location, date, {', '.join(INPUT_COLUMNS)} FROM {self.table_name} "
+                             "WHERE config_version = ?", self.conn, params=(version,))
+
+        merged = current.merge(stored, on=['location', 'date'], how='left', suffixes=('', '_stored'), indicator=True)
+        changed = (merged['_merge'] == 'left_only').to_numpy()
+        for name in INPUT_COLUMNS:
+            new, old = merged[name].to_numpy(dtype=float), merged[f"{name}_stored"].to_numpy(dtype=float)
+            changed |= ~((new == old) | (np.isnan(new) & np.isnan(old)))
+        to_score = merged.loc[changed, ['location', 'date'] + INPUT_COLUMNS]
+        stale = stored[['location', 'date']].merge(current[['location', 'date']], how='left', indicator=True)
+        stale = stale.loc[stale['_merge'] == 'left_only', ['location', 'date']]
+
+        if len(stale):
+            self.conn.executemany(f"DELETE FROM {self.table_name} WHERE location = ? AND date = ? AND config_version = ?",
+                                  ((location, date, version) for location, date in stale.itertuples(index=False)))
+
+        if len(to_score):
+            scores = calculate_scores(*(to_score[name].to_numpy() for name in INPUT_COLUMNS), weights, ideal_conditions)
+            rows = to_score.assign(config_version=version, **scores)
+            # NaN becomes NULL in SQLite
+            rows = rows.astype(object).where(rows.notna(), None)
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table_name} (location, date, config_version, {', '.join(INPUT_COLUMNS)}, "
+                f"{', '.join(SCORE_OUTPUT_COLUMNS)}) VALUES ({', '.join(['?'] * 10)})",
+                rows[['location', 'date', 'config_version'] + INPUT_COLUMNS + SCORE_OUTPUT_COLUMNS].itertuples(index=False))
+        self.conn.execute(f"INSERT OR IGNORE INTO {self.config_table} VALUES (?, ?)",
+                          (version, json.dumps({'weights': weights, 'ideal_conditions': ideal_conditions,
+                                                'columns': columns}, sort_keys=True, default=list)))
+        self.conn.commit()
+        return {'config_version': version, 'scored': len(to_score), 'unchanged': len(current) - len(to_score),
+                'removed': len(stale)}
+
+    def scores(self, version, start=None, end=None, locations=None):
+        """
+        Stored scores of one configuration version (days with a missing input are left out).
+
+        Args:
+            version (str): Configuration version (see config_version).
+            start (str, optional): First date (inclusive).
+            end (str, optional): End date (exclusive).
+            locations (list, optional): Locations to read; all by default.
+
+        Returns:
+            DataFrame: Indexed by date, with 'location', the sub-scores and 'score'.
+        """
+        query = (f"SELECT date, location, {', '.join(SCORE_OUTPUT_COLUMNS)} FROM {self.table_name} "
+                 "WHERE config_version = ? AND score IS NOT NULL")
+        params = [version]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(str(pd.Timestamp(start)))
+        if end is not None:
+            query += " AND date < ?"
+            params.append(str(pd.Timestamp(end)))
+        if locations is not None:
+            query += f" AND location IN ({', '.join(['?'] * len(locations))})"
+            params.extend(locations)
+        scores = pd.read_sql(query + " ORDER BY location, date", self.conn, params=params)
+        scores['date'] = pd.to_datetime(scores['date'])
+        return scores.set_index('date')
+
+    def versions(self):
+        """
+        Stored configuration versions.
+
+        Returns:
+            DataFrame: Indexed by version, with the configuration JSON and the number of stored days.
+        """
+        return pd.read_sql(f"SELECT c.config_version, c.config, COUNT(s.date) AS days FROM {self.config_table} c "
+                           f"LEFT JOIN {self.table_name} s ON s.config_version = c.config_version "
+                           "GROUP BY c.config_version", self.conn).set_index('config_version')
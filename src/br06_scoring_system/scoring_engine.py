@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+# Weights of the sub-scores in the event suitability score
+DEFAULT_WEIGHTS = {
+    "temperature": 0.4,
+    "precipitation": 0.3,
+    "wind_speed": 0.3
+}
+
+# Ideal conditions: comfortable temperature range in °C, no rain, ideal wind speed in km/h
+DEFAULT_IDEAL_CONDITIONS = {
+    "temperature": (18, 25),
+    "precipitation": 0,
+    "wind_speed": 10
+}
+
+# Daily columns scored for each condition
+SCORE_COLUMNS = {
+    "temperature": "temperature_2m_mean_C",
+    "precipitation": "precipitation_sum_mm",
+    "wind_speed": "wind_speed_10m_max_kmh"
+}
+
+
+def temperature_score(temperature, ideal_range=DEFAULT_IDEAL_CONDITIONS["temperature"]):
+    """
+    Temperature sub-score: 1 inside the ideal range, otherwise decreasing linearly with the distance
+    to the lower bound (one range width away scores 0).
+
+    Args:
+        temperature (array-like): Temperatures in °C.
+        ideal_range (tuple): Lower and upper bound of the ideal range (scalars or arrays broadcastable
+            to the temperatures, e.g. one range per location).
+
+    Returns:
+        ndarray: Sub-scores in [0, 1] (NaN where the temperature is missing).
+    """
+    temperature = np.asarray(temperature, dtype=float)
+    low, high = np.asarray(ideal_range[0], dtype=float), np.asarray(ideal_range[1], dtype=float)
+    inside = (low <= temperature) & (temperature <= high)
+    return np.where(inside, 1.0, np.clip(1 - np.abs(temperature - low) / (high - low), 0, 1))
+
+
+def precipitation_score(precipitation, ideal=DEFAULT_IDEAL_CONDITIONS["precipitation"]):
+    """
+    Precipitation sub-score: 1 up to the ideal amount, 0 above it.
+
+    Args:
+        precipitation (array-like): Precipitation sums in mm.
+        ideal (float or array-like): Highest ideal amount (broadcastable to the precipitation).
+
+    Returns:
+        ndarray: Sub-scores (NaN where the precipitation is missing).
+    """
+    precipitation = np.asarray(precipitation, dtype=float)
+    return np.where(np.isnan(precipitation), np.nan, np.where(precipitation <= ideal, 1.0, 0.0))
+
+
+def wind_score(wind_speed, ideal=DEFAULT_IDEAL_CONDITIONS["wind_speed"]):
+    """
+    Wind sub-score: 1 at the ideal speed, decreasing linearly to 0 at twice (or zero times) the ideal.
+
+    Args:
+        wind_speed (array-like): Wind speeds in km/h.
+        ideal (float or array-like): Ideal wind speed (broadcastable to the wind speeds).
+
+    Returns:
+        ndarray: Sub-scores in [0, 1] (NaN where the wind speed is missing).
+    """
+    wind_speed = np.asarray(wind_speed, dtype=float)
+    ideal = np.asarray(ideal, dtype=float)
+    return np.clip(1 - np.abs(wind_speed - ideal) / ideal, 0, 1)
+
+
+def humidity_score(humidity, ideal_range=(30, 60), tolerance=30):
+    """
+    Relative humidity sub-score: 1 inside the ideal range, decreasing linearly to 0 at `tolerance`
+    percentage points outside it.
+
+    Args:
+        humidity (array-like): Relative humidity in %.
+        ideal_range (tuple): Lower and upper bound of the ideal range (broadcastable to the humidity).
+        tolerance (float): Distance from the range at which the sub-score reaches 0.
+
+    Returns:
+        ndarray: Sub-scores in [0, 1] (NaN where the humidity is missing).
+    """
+    humidity = np.asarray(humidity, dtype=float)
+    low, high = np.asarray(ideal_range[0], dtype=float), np.asarray(ideal_range[1], dtype=float)
+    distance = np.maximum(low - humidity, 0) + np.maximum(humidity - high, 0)
+    return np.clip(1 - distance / tolerance, 0, 1)
+
+
+def calculate_scores(temperature, precipitation, wind_speed, weights=DEFAULT_WEIGHTS,
+                     ideal_conditions=DEFAULT_IDEAL_CONDITIONS):
+    """
+    Sub-scores and weighted event suitability score of whole columns at once.
+
+    The result is identical to scoring every day with the original scalar formula. Days with any
+    missing input get NaN in every output, so they can be masked out in one step.
+
+    Args:
+        temperature (array-like): Temperatures in °C.
+        precipitation (array-like): Precipitation sums in mm.
+        wind_speed (array-like): Wind speeds in km/h.
+        weights (dict): Weights of the 'temperature', 'precipitation' and 'wind_speed' sub-scores.
+        ideal_conditions (dict): Ideal 'temperature' range, 'precipitation' and 'wind_speed'.
+
+    Returns:
+        dict: 'temperature_score', 'precipitation_score', 'wind_score' and 'score' (0-100) arrays.
+    """
+    sub_scores = {
+        'temperature_score': temperature_score(temperature, ideal_conditions["temperature"]),
+        'precipitation_score': precipitation_score(precipitation, ideal_conditions["precipitation"]),
+        'wind_score': wind_score(wind_speed, ideal_conditions["wind_speed"])
+    }
+    missing = np.isnan(sub_scores['temperature_score']) | np.isnan(sub_scores['precipitation_score']) \
+        | np.isnan(sub_scores['wind_score'])
+    score = (sub_scores['temperature_score'] * weights["temperature"] +
+             sub_scores['precipitation_score'] * weights["precipitation"] +
+             sub_scores['wind_score'] * weights["wind_speed"]) * 100
+    scores = {name: np.where(missing, np.nan, values) for name, values in sub_scores.items()}
+    scores['score'] = np.where(missing, np.nan, score)
+    return scores
+
+
+def calculate_score(temperature, precipitation, wind_speed, weights=DEFAULT_WEIGHTS,
+                    ideal_conditions=DEFAULT_IDEAL_CONDITIONS):
+    """
+    Event suitability score (0-100) of one day or of whole columns.
+
+    Args:
+        temperature (float or array-like): Temperatures in °C.
+        precipitation (float or array-like): Precipitation sums in mm.
+        wind_speed (float or array-like): Wind speeds in km/h.
+        weights (dict): Weights of the sub-scores.
+        ideal_conditions (dict): Ideal conditions.
+
+    Returns:
+        float or ndarray: Scores (NaN where an input is missing).
+    """
+    return calculate_scores(temperature, precipitation, wind_speed, weights, ideal_conditions)['score'][()]
+
+
+def score_frame(data, weights=DEFAULT_WEIGHTS, ideal_conditions=DEFAULT_IDEAL_CONDITIONS, columns=SCORE_COLUMNS,
+                location_column='location', dropna=True):
+    """
+    Scores every row of daily weather data (of any number of locations).
+
+    Args:
+        data (DataFrame): Daily data indexed by date, with the scored columns.
+        weights (dict): Weights of the sub-scores.
+        ideal_conditions (dict): Ideal conditions.
+        columns (dict): Column of each condition ('temperature', 'precipitation', 'wind_speed').
+        location_column (str): Column with the location name, kept in the output if present.
+        dropna (bool): Leave out rows with a missing input (as the original per-row loop skipped them).
+
+    Returns:
+        DataFrame: Indexed like the data, with the location (if any), the three sub-scores and 'score'.
+    """
+    scores = calculate_scores(data[columns["temperature"]].to_numpy(dtype=float),
+                              data[columns["precipitation"]].to_numpy(dtype=float),
+                              data[columns["wind_speed"]].to_numpy(dtype=float), weights, ideal_conditions)
+    result = pd.DataFrame(scores, index=data.index)
+    if location_column in data.columns:
+        result.insert(0, location_column, data[location_column].to_numpy())
+    return result[~np.isnan(scores['score'])] if dropna else result
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+# Seasons are shared with the analysis stage (the stage script puts br03_data_analysis on the path)
+try:
+    from ..br03_data_analysis.seasons import SEASON_NAMES
+except ImportError:
+    from seasons import SEASON_NAMES
+
+
+def rolling_mean(values, window):
+    """
+    Mean of every contiguous window along the last axis, from cumulative sums (O(1) per window).
+
+    Args:
+        values (ndarray): Array of shape (..., days); NaN for missing days.
+        window (int): Window length in days.
+
+    Returns:
+        ndarray: Shape (..., days - window + 1); NaN for windows containing a missing day.
+    """
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    totals = np.concatenate([zeros, np.cumsum(np.where(missing, 0.0, values), axis=-1)], axis=-1)
+    gaps = np.concatenate([zeros, np.cumsum(missing, axis=-1)], axis=-1)
+    sums = totals[..., window:] - totals[..., :-window]
+    return np.where(gaps[..., window:] - gaps[..., :-window] > 0, np.nan, sums / window)
+
+
+def rolling_min(values, window):
+    """
+    Minimum of every contiguous window along the last axis with the van Herk/Gil-Werman algorithm:
+    running minima from the start and from the end of fixed blocks of `window` days give any window's
+    minimum from two lookups, so each window costs O(1) whatever its length.
+
+    Args:
+        values (ndarray): Array of shape (..., days); NaN for missing days.
+        window (int): Window length in days.
+
+    Returns:
+        ndarray: Shape (..., days - window + 1); NaN for windows containing a missing day.
+    """
+    values = np.asarray(values, dtype=float)
+    days = values.shape[-1]
+    n_blocks = -(-days // window)
+    padded = np.full(values.shape[:-1] + (n_blocks * window,), np.inf)
+    padded[..., :days] = np.where(np.isnan(values), -np.inf, values)
+    blocks = padded.reshape(values.shape[:-1] + (n_blocks, window))
+    prefix = np.minimum.accumulate(blocks, axis=-1).reshape(padded.shape)
+    suffix = np.minimum.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+    count = days - window + 1
+    minimum = np.minimum(suffix[..., :count], prefix[..., window - 1:window - 1 + count])
+    # Missing days were -inf, so they win every window they are in
+    return np.where(np.isneginf(minimum), np.nan, minimum)
+
+
+def window_scores(scores, window=3, score_column='score', location_column='location'):
+    """
+    Aggregate suitability of every contiguous N-day window, for all locations in one vectorized pass.
+
+    Scores are laid out as a locations x days matrix over the full calendar, so a day without a score
+    makes every window containing it invalid instead of silently joining non-adjacent days.
+
+    Args:
+        scores (DataFrame): Daily scores indexed by date (e.g. scoring_engine.score_frame output).
+        window (int): Window length in days.
+        score_column (str): Column with the score.
+        location_column (str): Column with the location name (optional in the data).
+
+    Returns:
+        DataFrame: One row per complete window with the location (if any), 'start', 'end' (last day),
+        'mean_score' and 'min_score' (the worst day of the window).
+    """
+    has_location = location_column in scores.columns
+    empty = pd.DataFrame(columns=(['location'] if has_location else []) + ['start', 'end', 'mean_score', 'min_score'])
+    if scores.empty:
+        return empty
+    dates = pd.DatetimeIndex(scores.index).normalize()
+    locations = scores[location_column].to_numpy() if has_location else np.zeros(len(scores), dtype=int)
+    calendar = pd.date_range(dates.min(), dates.max(), freq='D')
+    location_names, location_positions = np.unique(locations, return_inverse=True)
+
+    matrix = np.full((len(location_names), len(calendar)), np.nan)
+    matrix[location_positions, calendar.get_indexer(dates)] = scores[score_column].to_numpy(dtype=float)
+    if len(calendar) < window:
+        return empty
+    means, minima = rolling_mean(matrix, window), rolling_min(matrix, window)
+
+    rows, starts = np.nonzero(~np.isnan(means))
+    result = pd.DataFrame({
+        'start': calendar[starts],
+        'end': calendar[starts + window - 1],
+        'mean_score': means[rows, starts],
+        'min_score': minima[rows, starts]
+    })
+    if has_location:
+        result.insert(0, 'location', location_names[rows])
+    return result
+
+
+def best_windows(windows, by='month', top=1, rank_by='mean_score'):
+    """
+    Best windows per calendar period (of each year) and location.
+
+    Args:
+        windows (DataFrame): Output of window_scores.
+        by (str): 'month', 'season' (calendar quarter, see seasons.SEASON_NAMES) or 'year', of the window's
+            first day; None for the overall best.
+        top (int): Number of windows per period and location.
+        rank_by (str): 'mean_score', or 'min_score' to favour windows without a bad day.
+
+    Returns:
+        DataFrame: The best windows with a 'period' column (e.g. '2020-07', '2021-Winter', '2020'),
+        best first within each period.
+    """
+    start = windows['start']
+    # Periods are grouped by integer codes; only the selected windows get a text label
+    if by == 'month':
+        code = start.dt.year * 100 + start.dt.month
+        label = lambda codes: [f"{code // 100}-{code % 100:02d}" for code in codes]
+    elif by == 'season':
+        code = start.dt.year * 10 + start.dt.quarter
+        label = lambda codes: [f"{code // 10}-{SEASON_NAMES[code % 10]}" for code in codes]
+    elif by == 'year':
+        code = start.dt.year
+        label = lambda codes: [str(code) for code in codes]
+    elif by is None:
+        code = pd.Series(0, index=windows.index)
+        label = lambda codes: ['all'] * len(codes)
+    else:
+        raise ValueError("by must be 'month', 'season', 'year' or None")
+
+    keys = (['location'] if 'location' in windows.columns else []) + ['period']
+    # The other score breaks ties, then the earlier window
+    tie_breaker = 'min_score' if rank_by == 'mean_score' else 'mean_score'
+    ranked = windows.assign(period=code.to_numpy()).sort_values([rank_by, tie_breaker, 'start'],
+                                                                ascending=[False, False, True], kind='stable')
+    best = ranked.groupby(keys, sort=False).head(top)
+    best = best.sort_values(keys + [rank_by], ascending=[True] * len(keys) + [False], kind='stable').reset_index(drop=True)
+    return best.assign(period=label(best['period'].to_numpy()))
@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br03_data_analysis.analog_days import AnalogDayIndex
+
+@pytest.fixture
+def sample_daily_data():
+    """
+    Fixture for creating two years of daily data for two locations.
+    """
+    rng = np.random.default_rng(7)
+    frames = []
+    for location in ['Timisoara', 'Cluj']:
+        date_rng = pd.date_range(start="2022-01-01", periods=730, freq='D')
+        seasonal = 10 * np.sin(2 * np.pi * (date_rng.dayofyear - 100) / 365)
+        frames.append(pd.DataFrame({
+            'location': location,
+            'temperature_2m_max_C': seasonal + 15 + rng.normal(0, 2, 730),
+            'temperature_2m_min_C': seasonal + 5 + rng.normal(0, 2, 730),
+            'temperature_2m_mean_C': seasonal + 10 + rng.normal(0, 2, 730),
+            'precipitation_sum_mm': rng.exponential(2, 730),
+            'wind_speed_10m_max_kmh': rng.gamma(3, 4, 730),
+            'wind_gusts_10m_max_kmh': rng.gamma(4, 6, 730),
+            'wind_direction_10m_dominant_deg': rng.uniform(0, 360, 730),
+        }, index=date_rng))
+    return pd.concat(frames)
+
+def test_query_returns_exact_match_first(sample_daily_data):
+    """Test that querying with the values of an indexed day returns that day at distance 0."""
+    index = AnalogDayIndex(sample_daily_data)
+    day = sample_daily_data.iloc[200]
+    result = index.query(day, k=3)
+    assert len(result) == 3
+    assert result['date'].iloc[0] == sample_daily_data.index[200]
+    assert result['distance'].iloc[0] == pytest.approx(0)
+    assert result['distance'].is_monotonic_increasing
+
+def test_query_matches_brute_force(sample_daily_data):
+    """Test that the KD-tree answer matches a brute-force scan over all standardized vectors."""
+    index = AnalogDayIndex(sample_daily_data)
+    day = sample_daily_data.iloc[42]
+    vectors = index._to_vectors(sample_daily_data)
+    expected = np.sort(np.linalg.norm(vectors - vectors[42], axis=1))[:5]
+    result = index.query(day, k=5)
+    np.testing.assert_allclose(result['distance'], expected)
+
+def test_query_filters_season_and_location(sample_daily_data):
+    """Test that season and location filters only return matching days."""
+    index = AnalogDayIndex(sample_daily_data)
+    result = index.query_date('2022-07-15', k=10, season='Summer', reference_location='Cluj', locations=['Cluj'])
+    assert len(result) == 10
+    assert (result['location'] == 'Cluj').all()
+    assert (result['season'] == 'Summer').all()
+    assert (result['date'] != pd.Timestamp('2022-07-15')).all()
+
+def test_query_date_across_locations(sample_daily_data):
+    """Test that a reference day of one location can be matched against other locations."""
+    index = AnalogDayIndex(sample_daily_data)
+    result = index.query_date('2022-07-15', k=5, reference_location='Cluj', locations=['Timisoara'])
+    assert len(result) == 5
+    assert (result['location'] == 'Timisoara').all()
+    both = index.query_date('2022-07-15', k=20, reference_location='Cluj')
+    assert not ((both['date'] == pd.Timestamp('2022-07-15')) & (both['location'] == 'Cluj')).any()
+
+def test_query_date_requires_reference_location(sample_daily_data):
+    """Test that the reference location is required on multi-location data and optional otherwise."""
+    with pytest.raises(ValueError):
+        AnalogDayIndex(sample_daily_data).query_date('2022-07-15')
+    single = AnalogDayIndex(sample_daily_data[sample_daily_data['location'] == 'Cluj'].drop(columns='location'))
+    result = single.query_date('2022-07-15', k=3)
+    assert len(result) == 3 and (result['date'] != pd.Timestamp('2022-07-15')).all()
+
+def test_add_days_is_searchable(sample_daily_data):
+    """Test that newly added days are found both while buffered and after a rebuild."""
+    history = sample_daily_data[sample_daily_data.index < '2023-06-01']
+    new_days = sample_daily_data[sample_daily_data.index >= '2023-06-01']
+    index = AnalogDayIndex(history, rebuild_threshold=50)
+    index.add_days(new_days)
+
+    day = new_days.iloc[-1]
+    result = index.query(day, k=1, location=day['location'])
+    assert result['date'].iloc[0] == new_days.index[-1]
+    assert result['distance'].iloc[0] == pytest.approx(0)
@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+import pandas as pd
+import functools
+from src.br05_machine_learning2.backtesting import cutoff_grid, horizon_metrics, backtest, engine_version
+from src.br05_machine_learning2.harmonic_forecast import fit_harmonic_model
+
+def last_value_forecast(series, variable_name):
+    """Naive engine repeating the last value for 60 days with a +/- 1 interval."""
+    ds = pd.date_range(series.index[-1] + pd.Timedelta(days=1), periods=60, freq='D')
+    value = float(series.iloc[-1])
+    return pd.DataFrame({'ds': ds, 'yhat': value, 'yhat_lower': value - 1, 'yhat_upper': value + 1}), variable_name
+
+@pytest.fixture
+def sample_series():
+    """Fixture for 400 days of a noisy seasonal series."""
+    rng = np.random.default_rng(4)
+    date_rng = pd.date_range(start="2020-01-01", periods=400, freq='D')
+    return pd.Series(10 + 5 * np.sin(np.arange(400) / 20) + rng.normal(0, 0.5, 400), index=date_rng)
+
+def test_cutoff_grid(sample_series):
+    """Test that cutoffs are spaced by the period, leave the initial window and end one horizon before the end."""
+    cutoffs = cutoff_grid(sample_series, horizon=30, initial=200, period=50)
+    assert cutoffs[-1] == sample_series.index[-1] - pd.Timedelta(days=30)
+    assert cutoffs[0] >= sample_series.index[0] + pd.Timedelta(days=200)
+    assert all((later - earlier).days == 50 for earlier, later in zip(cutoffs, cutoffs[1:]))
+    assert cutoff_grid(sample_series.iloc[:50], horizon=30) == []
+
+def test_horizon_metrics():
+    """Test the per-horizon metrics on hand-made predictions."""
+    cutoff = pd.Timestamp("2020-01-01")
+    predictions = pd.DataFrame({'engine': 'naive', 'variable': 'Temperature', 'cutoff': cutoff,
+                                'ds': [cutoff + pd.Timedelta(days=1)] * 2 + [cutoff + pd.Timedelta(days=2)],
+                                'y': [1.0, 3.0, 0.0], 'yhat': [2.0, 2.0, 4.0],
+                                'yhat_lower': [1.5, 0.0, 3.0], 'yhat_upper': [2.5, 4.0, 5.0]})
+    metrics = horizon_metrics(predictions)
+    assert metrics.loc[('naive', 'Temperature', 1)].tolist() == [1.0, 1.0, 0.5, 2]
+    assert metrics.loc[('naive', 'Temperature', 2), 'rmse'] == 4.0
+
+def test_backtest_with_cache(sample_series, tmp_path):
+    """Test a two-engine backtest, then that extending it with new data only fits the new cutoffs."""
+    engines = {"naive": last_value_forecast, "harmonic": fit_harmonic_model}
+    history = sample_series.iloc[:-20]
+    metrics, predictions, jobs = backtest({"Temperature": history}, engines, horizon=30, initial=200,
+                                          period=20, cache_dir=tmp_path, max_workers=2)
+    assert (jobs['status'] == 'fitted').all()
+    assert sorted(metrics.index.get_level_values('horizon_days').unique()) == list(range(1, 31))
+    assert set(predictions['engine']) == {"naive", "harmonic"}
+    naive = metrics.loc[('naive', 'Temperature')]
+    assert naive.loc[1, 'mae'] < naive.loc[30, 'mae']
+
+    _, extended, jobs = backtest({"Temperature": sample_series}, engines, horizon=30, initial=200,
+                                 period=20, cache_dir=tmp_path, max_workers=2)
+    assert (jobs['status'] == 'cached').sum() == 2 * len(cutoff_grid(history, 30, 200, 20))
+    assert (jobs['status'] == 'fitted').sum() == 2
+    assert len(extended) > len(predictions)
+
+def test_short_forecasts_fail_and_engine_changes_refit(sample_series, tmp_path):
+    """Test that a forecast shorter than the horizon fails and that a changed engine is not served from the cache."""
+    _, predictions, jobs = backtest({"Temperature": sample_series}, {"naive": last_value_forecast}, horizon=90,
+                                    initial=200, period=50, cache_dir=tmp_path, max_workers=1)
+    assert (jobs['status'] == 'failed').all() and predictions.empty
+    assert jobs['error'].str.contains('60 of 90').all()
+    assert not any(tmp_path.rglob('*.pkl'))
+
+    short = functools.partial(fit_harmonic_model, periods=30)
+    assert engine_version(short) != engine_version(functools.partial(fit_harmonic_model, periods=60))
+    backtest({"Temperature": sample_series}, {"harmonic": short}, horizon=30, initial=300, period=50,
+             cache_dir=tmp_path, max_workers=1)
+    _, _, jobs = backtest({"Temperature": sample_series}, {"harmonic": functools.partial(fit_harmonic_model, periods=60)},
+                          horizon=30, initial=300, period=50, cache_dir=tmp_path, max_workers=1)
+    assert (jobs['status'] == 'fitted').all()
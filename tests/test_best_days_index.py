@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br06_scoring_system.best_days_index import BestDaysIndex
+
+@pytest.fixture
+def sample_scores():
+    """Fixture for two years of daily scores of three locations, with ties and a missing score."""
+    rng = np.random.default_rng(6)
+    date_rng = pd.date_range(start="2022-01-01", periods=730, freq='D')
+    frames = []
+    for location in ["Cluj", "Iasi", "Timisoara"]:
+        scores = np.round(rng.uniform(0, 100, len(date_rng)), 0)
+        frames.append(pd.DataFrame({'location': location, 'score': scores}, index=date_rng))
+    scores = pd.concat(frames)
+    scores.iloc[5, 1] = np.nan
+    return scores
+
+def brute_force(scores, start, end, locations):
+    """Selects the scored days of a query directly."""
+    selected = scores[(scores.index >= start) & (scores.index < end) & scores['location'].isin(locations)].dropna()
+    return selected.rename_axis('date').reset_index()
+
+def test_top_k_matches_sorting(sample_scores):
+    """Test top-k against sorting the selected days for random ranges and location sets."""
+    index = BestDaysIndex(sample_scores)
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        start, end = sorted(rng.choice(sample_scores.index.unique(), 2, replace=False))
+        locations = list(rng.choice(index.locations, rng.integers(1, 4), replace=False))
+        k = int(rng.integers(1, 25))
+        expected = brute_force(sample_scores, start, end, locations)
+        expected = expected.sort_values('score', ascending=False, kind='stable').head(k)
+        result = index.top_k(k, start, end, locations)
+        np.testing.assert_array_equal(result['score'].to_numpy(), expected['score'].to_numpy())
+        assert (result['date'] >= start).all() and (result['date'] < end).all()
+        assert result['location'].isin(locations).all()
+
+def test_count_at_least_matches_brute_force(sample_scores):
+    """Test threshold counts per location against direct counting, including the threshold itself."""
+    index = BestDaysIndex(sample_scores)
+    for start, end, threshold in [("2022-03-01", "2022-09-15", 70), ("2022-01-01", "2024-01-01", 50), ("2023-05-05", "2023-05-06", 0)]:
+        expected = brute_force(sample_scores, start, end, index.locations)
+        expected = expected[expected['score'] >= threshold].groupby('location').size()
+        counts = index.count_at_least(threshold, start, end)
+        assert counts.to_dict() == expected.reindex(index.locations, fill_value=0).to_dict()
+
+def test_best_day_and_months(sample_scores):
+    """Test the best day of a range and the per-month top-k."""
+    index = BestDaysIndex(sample_scores)
+    best = index.best_day("2022-06-01", "2022-07-01", ["Iasi"])
+    june = sample_scores[(sample_scores['location'] == "Iasi")].loc["2022-06"]
+    assert best['score'] == june['score'].max() and best['date'] == june['score'].idxmax()
+    assert index.best_day("2030-01-01", "2030-02-01") is None
+
+    months = index.top_k_by_month(2, "2022-01-15", "2022-04-01")
+    assert months.groupby('month').size().to_dict() == {'2022-01': 2, '2022-02': 2, '2022-03': 2}
+    assert months['date'].min() >= pd.Timestamp("2022-01-15")
+
+def test_scores_without_location(sample_scores, tmp_path):
+    """Test an index over a scores CSV without a location column."""
+    path = tmp_path / "scores.csv"
+    sample_scores[sample_scores['location'] == "Cluj"][['score']].rename_axis('date').reset_index().to_csv(path, index=False)
+    index = BestDaysIndex.from_csv(path)
+    top = index.top_k(3)
+    assert list(top.columns) == ['date', 'score']
+    assert index.count_at_least(0).to_dict() == {'all': 729}
+
+def test_months_without_scored_days(sample_scores):
+    """Test that the per-month top-k is empty when no selected location has a scored day."""
+    months = BestDaysIndex(sample_scores).top_k_by_month(2, locations=[])
+    assert months.empty and list(months.columns) == ['location', 'date', 'score', 'month']
+    unscored = BestDaysIndex(sample_scores[['score']].iloc[:10] * np.nan)
+    assert list(unscored.top_k_by_month(2).columns) == ['date', 'score', 'month']
@@ -0,0 +1,62 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br03_data_analysis.calendar_matrix import day_hour_matrix, year_period_matrix, clear_cache, MONTH_NAMES
+
+@pytest.fixture
+def sample_hourly_series():
+    """
+    Fixture for an hourly series with a missing day and a few missing hours.
+    """
+    rng = np.random.default_rng(6)
+    date_rng = pd.date_range(start="2023-01-01", end="2023-01-10 23:00", freq='h', tz='UTC')
+    series = pd.Series(rng.integers(0, 2, len(date_rng)).astype(float), index=date_rng)
+    series = series[(series.index.day != 4)]
+    return series.drop(series.index[[5, 30, 31]])
+
+@pytest.fixture
+def sample_daily_series():
+    """
+    Fixture for five years of daily temperatures.
+    """
+    rng = np.random.default_rng(7)
+    date_rng = pd.date_range(start="2015-01-01", end="2019-12-31", freq='D')
+    return pd.Series(10 + rng.normal(0, 5, len(date_rng)), index=date_rng)
+
+def test_day_hour_matrix_matches_pivot_table(sample_hourly_series):
+    """Test the matrix against the pivot_table used in 04-ML1, including gaps."""
+    frame = sample_hourly_series.to_frame('value')
+    expected = frame.pivot_table(values='value', index=frame.index.date, columns=frame.index.hour)
+    matrix = day_hour_matrix(sample_hourly_series, cache=False)
+
+    assert matrix.shape == (9, 24)
+    np.testing.assert_array_equal(matrix.index, expected.index)
+    np.testing.assert_allclose(matrix.to_numpy(), expected.to_numpy())
+    assert np.isnan(matrix.iloc[0, 5])
+
+def test_month_matrix_matches_groupby(sample_daily_series):
+    """Test the (month x year) matrix against resample + pivot as in plot_trend."""
+    monthly = sample_daily_series.resample('ME').mean().reset_index()
+    monthly.columns = ['date', 'value']
+    monthly['year'], monthly['month'] = monthly['date'].dt.year, monthly['date'].dt.month_name()
+    expected = monthly.pivot(index='month', columns='year', values='value').reindex(MONTH_NAMES)
+    np.testing.assert_allclose(year_period_matrix(sample_daily_series, 'month', cache=False).to_numpy(),
+                               expected.to_numpy())
+
+def test_week_matrix_matches_groupby(sample_daily_series):
+    """Test the (ISO week x year) matrix against resample + groupby + pivot as in plot_trend."""
+    weekly = sample_daily_series.resample('W').mean().reset_index()
+    weekly.columns = ['date', 'value']
+    weekly['year'], weekly['week'] = weekly['date'].dt.year, weekly['date'].dt.isocalendar().week
+    weekly = weekly.groupby(['year', 'week'])['value'].mean().reset_index()
+    expected = weekly.pivot(index='week', columns='year', values='value')
+    matrix = year_period_matrix(sample_daily_series, 'week', cache=False)
+    np.testing.assert_array_equal(matrix.index, expected.index)
+    np.testing.assert_allclose(matrix.to_numpy(), expected.to_numpy())
+
+def test_cache_is_shared_by_content(sample_hourly_series):
+    """Test that an identical series returns the cached matrix and changed values do not."""
+    clear_cache()
+    first = day_hour_matrix(sample_hourly_series)
+    assert day_hour_matrix(sample_hourly_series.copy()) is first
+    assert day_hour_matrix(sample_hourly_series + 1) is not first
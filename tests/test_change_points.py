@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br03_data_analysis.change_points import pelt, detect_regime_shifts
+from src.br03_data_analysis.analyze_data import ExtremeWeatherAnalyzer
+
+@pytest.fixture
+def sample_frequency():
+    """
+    Fixture for yearly event counts: one series with a level shift in 2010 and an outlier year, one flat series.
+    """
+    rng = np.random.default_rng(11)
+    years = pd.Index(range(2000, 2024), name='date')
+    shifted = np.where(years < 2010, rng.poisson(5, len(years)), rng.poisson(25, len(years)))
+    shifted[years.get_loc(2004)] = 60
+    return pd.DataFrame({
+        'extreme_high_temp': shifted,
+        'extreme_low_temp': rng.poisson(10, len(years)),
+    }, index=years)
+
+def test_pelt_finds_mean_shift():
+    """Test that a clear level shift is found at the right position for several series at once."""
+    values = np.array([
+        [2.0] * 10 + [20.0] * 10,
+        [5.0] * 20,
+        [10.0] * 5 + [30.0] * 10 + [10.0] * 5,
+    ])
+    assert pelt(values) == [[10], [], [5, 15]]
+
+def test_pelt_normal_cost():
+    """Test the mean-shift cost on noisy data."""
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.normal(0, 1, 30), rng.normal(8, 1, 30)])
+    assert pelt(values, cost='normal') == [[30]]
+
+def test_detect_regime_shifts(sample_frequency):
+    """Test that the shift year and the outlier year are reported for the right event only."""
+    detected = detect_regime_shifts(sample_frequency)
+    high_temp = detected[detected['event'] == 'extreme_high_temp']
+    change_points = high_temp[high_temp['kind'] == 'change_point']
+    assert 2010 in change_points['year'].tolist()
+    assert 2004 in high_temp.loc[high_temp['kind'] == 'outlier', 'year'].tolist()
+    assert (detected.loc[detected['event'] == 'extreme_low_temp', 'kind'] != 'change_point').all()
+    assert change_points['date'].iloc[0] == pd.Timestamp('2010-01-01')
+
+def test_detect_change_points_per_location():
+    """Test the ExtremeWeatherAnalyzer entry point on data with several locations."""
+    date_rng = pd.date_range(start="2000-01-01", end="2019-12-31", freq='D')
+    frames = []
+    for location, shift_year in [('Timisoara', 2008), ('Cluj', 2014)]:
+        hot = np.where(date_rng.year < shift_year, 20.0, 30.0) + np.tile([0.0, 5.0], len(date_rng))[:len(date_rng)]
+        frames.append(pd.DataFrame({
+            'location': location,
+            'temperature_2m_max_C': hot,
+            'temperature_2m_min_C': 5.0,
+            'precipitation_sum_mm': 1.0,
+            'wind_speed_10m_max_kmh': 10.0,
+        }, index=date_rng))
+    analyzer = ExtremeWeatherAnalyzer(daily_data=pd.concat(frames))
+    analyzer.temperature_high, analyzer.temperature_low = 32.0, 0.0
+    analyzer.precipitation_high, analyzer.precipitation_low = 10.0, 0.0
+    analyzer.wind_speed_high, analyzer.wind_speed_low = 20.0, 0.0
+    analyzer.flag_extreme_events()
+
+    detected = analyzer.detect_change_points()
+    shifts = detected[(detected['event'] == 'extreme_high_temp') & (detected['kind'] == 'change_point')]
+    assert dict(zip(shifts['location'], shifts['year'])) == {'Timisoara': 2008, 'Cluj': 2014}
+
+def test_calculate_frequency_keeps_year_index_for_one_location():
+    """Test that single-location data keeps the yearly index the plots expect."""
+    date_rng = pd.date_range(start="2000-01-01", end="2004-12-31", freq='D')
+    data = pd.DataFrame({'location': 'Timisoara', 'temperature_2m_max_C': 35.0, 'temperature_2m_min_C': 5.0,
+                         'precipitation_sum_mm': 1.0, 'wind_speed_10m_max_kmh': 10.0}, index=date_rng)
+    analyzer = ExtremeWeatherAnalyzer(daily_data=data)
+    analyzer.temperature_high, analyzer.temperature_low = 32.0, 0.0
+    analyzer.precipitation_high, analyzer.precipitation_low = 10.0, 0.0
+    analyzer.wind_speed_high, analyzer.wind_speed_low = 20.0, 0.0
+    analyzer.flag_extreme_events()
+    frequency = analyzer.calculate_frequency()
+    assert not isinstance(frequency.index, pd.MultiIndex)
+    assert frequency.index.tolist() == list(range(2000, 2005))
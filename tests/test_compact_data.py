@@ -0,0 +1,95 @@
+import sqlite3
+import pytest
+import numpy as np
+import pandas as pd
+from src.br01_02_fetch_data.store_data.compact_data import (
+    summarize_hourly_days,
+    diurnal_profiles,
+    compact_hourly_history,
+    load_hourly_summary
+)
+from src.br03_data_analysis.analyze_data import WeatherAnalyzer
+
+@pytest.fixture
+def sample_hourly_data():
+    """
+    Fixture for creating 20 days of hourly data indexed by UTC timestamps.
+    """
+    rng = np.random.default_rng(42)
+    date_rng = pd.date_range(start="2023-01-01", periods=24 * 20, freq='h', tz='UTC', name='date')
+    data = {
+        'temperature_2m_C': rng.normal(10, 5, len(date_rng)),
+        'relative_humidity_2m_percent': rng.uniform(30, 90, len(date_rng)),
+        'precipitation_mm': rng.exponential(0.2, len(date_rng)),
+        'wind_speed_10m_kmh': rng.gamma(2, 5, len(date_rng)),
+        'wind_direction_10m_deg': rng.uniform(0, 360, len(date_rng)),
+        'wind_gusts_10m_kmh': rng.gamma(3, 5, len(date_rng)),
+    }
+    return pd.DataFrame(data, index=date_rng)
+
+@pytest.fixture
+def hourly_connection(sample_hourly_data):
+    """
+    Fixture for an in-memory database holding the sample data the way fetch_weather stores it.
+    """
+    conn = sqlite3.connect(":memory:")
+    sample_hourly_data.reset_index().to_sql('hourly_data', conn)
+    yield conn
+    conn.close()
+
+def test_summarize_hourly_days(sample_hourly_data):
+    """Test that every day gets one summary row with count 24."""
+    summary = summarize_hourly_days(sample_hourly_data)
+    assert len(summary) == 20
+    assert (summary['temperature_2m_C_count'] == 24).all()
+    assert 'wind_gusts_10m_kmh_std' in summary.columns
+
+def test_diurnal_profiles(sample_hourly_data):
+    """Test that the profile has 24 hours for the month in the sample."""
+    profile = diurnal_profiles(sample_hourly_data)
+    assert len(profile) == 24
+    assert sorted(profile['hour']) == list(range(24))
+    assert (profile['count'] == 20).all()
+
+def test_compact_hourly_history(hourly_connection):
+    """Test that old raw rows are replaced by summaries and the recent window stays raw."""
+    result = compact_hourly_history(hourly_connection, keep_days=5)
+    remaining = hourly_connection.execute("SELECT COUNT(*) FROM hourly_data").fetchone()[0]
+
+    assert result['summary_days'] == 14
+    assert result['compacted_rows'] == 14 * 24
+    assert remaining == 6 * 24
+    assert len(load_hourly_summary(hourly_connection)) == 14
+
+    # A second run has nothing new to compact
+    assert compact_hourly_history(hourly_connection, keep_days=5)['compacted_rows'] == 0
+
+def test_aggregate_hourly_combines_tiers(sample_hourly_data, hourly_connection):
+    """Test that aggregating raw + compacted tiers matches aggregating the full raw data."""
+    compact_hourly_history(hourly_connection, keep_days=5)
+    raw = pd.read_sql("SELECT * FROM hourly_data", hourly_connection).drop(columns='index')
+    raw['date'] = pd.to_datetime(raw['date'])
+    raw = raw.set_index('date')
+
+    tiered = WeatherAnalyzer(hourly_data=raw, hourly_summary=load_hourly_summary(hourly_connection))
+    expected = WeatherAnalyzer(hourly_data=sample_hourly_data).aggregate_hourly('week')
+    result = tiered.aggregate_hourly('week')
+
+    pd.testing.assert_frame_equal(result, expected, check_freq=False, check_dtype=False)
+
+def test_compaction_after_full_refetch(sample_hourly_data, hourly_connection):
+    """Test that a refetch restoring compacted raw days neither duplicates summaries nor double-counts days."""
+    compact_hourly_history(hourly_connection, keep_days=5)
+    # fetch_weather replaces the raw table with the full history
+    sample_hourly_data.reset_index().to_sql('hourly_data', hourly_connection, if_exists='replace')
+    raw = pd.read_sql("SELECT * FROM hourly_data", hourly_connection).drop(columns='index')
+    raw['date'] = pd.to_datetime(raw['date'])
+    tiered = WeatherAnalyzer(hourly_data=raw.set_index('date'), hourly_summary=load_hourly_summary(hourly_connection))
+    expected = WeatherAnalyzer(hourly_data=sample_hourly_data).aggregate_hourly('week')
+    pd.testing.assert_frame_equal(tiered.aggregate_hourly('week'), expected, check_freq=False, check_dtype=False)
+
+    result = compact_hourly_history(hourly_connection, keep_days=5)
+    assert result['compacted_rows'] == 14 * 24 and result['summary_days'] == 0
+    summary = load_hourly_summary(hourly_connection)
+    assert len(summary) == 14 and summary.index.is_unique
+    assert hourly_connection.execute("SELECT COUNT(*) FROM hourly_data").fetchone()[0] == 6 * 24
@@ -0,0 +1,84 @@
+import sqlite3
+import pytest
+import numpy as np
+import pandas as pd
+from src.br04_machine_learning1.feature_store import FeatureStore, EVENT_FEATURE_SPEC
+
+def make_hourly(start, periods, seed):
+    """Creates hourly rows shaped like the hourly_data table."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range(start=start, periods=periods, freq='h', tz='UTC'),
+        'temperature_2m_C': rng.uniform(5, 35, periods),
+        'relative_humidity_2m_percent': rng.uniform(20, 90, periods),
+        'precipitation_mm': rng.exponential(0.5, periods),
+        'wind_speed_10m_kmh': rng.uniform(0, 30, periods),
+    })
+
+@pytest.fixture
+def conn():
+    """Fixture for an in-memory database with two days of hourly data."""
+    conn = sqlite3.connect(':memory:')
+    make_hourly("2023-01-01", 48, 0).to_sql('hourly_data', conn)
+    return conn
+
+def expected_target(hourly):
+    """The event suitability target exactly as 04-ML1 builds it."""
+    return ((hourly['temperature_2m_C'] > 20) & (hourly['temperature_2m_C'] < 30) &
+            (hourly['relative_humidity_2m_percent'] > 30) & (hourly['relative_humidity_2m_percent'] < 70) &
+            (hourly['wind_speed_10m_kmh'] < 15) & (hourly['precipitation_mm'] < 1)).astype(int).to_numpy()
+
+def test_build_and_reuse(conn, tmp_path):
+    """Test that features match the script's definitions and a second store reuses them."""
+    store = FeatureStore(conn, tmp_path)
+    assert store.refresh() == 'rebuilt'
+    hourly = pd.read_sql("SELECT * FROM hourly_data", conn)
+    np.testing.assert_array_equal(store.target(), expected_target(hourly))
+    np.testing.assert_allclose(store.matrix(), hourly[EVENT_FEATURE_SPEC['inputs']].to_numpy())
+    assert isinstance(store.column('temperature_2m_C'), np.memmap)
+    assert store.dates()[0] == pd.Timestamp("2023-01-01", tz='UTC')
+
+    reopened = FeatureStore(conn, tmp_path)
+    assert reopened.refresh() == 'cached'
+    assert reopened.data_version == store.data_version
+
+def test_incremental_append(conn, tmp_path):
+    """Test that appended rows are engineered on their own and version the store like a full rebuild."""
+    store = FeatureStore(conn, tmp_path)
+    store.refresh()
+    version = store.data_version
+    make_hourly("2023-01-03", 24, 1).to_sql('hourly_data', conn, if_exists='append')
+
+    assert store.refresh() == 'appended'
+    hourly = pd.read_sql("SELECT * FROM hourly_data", conn)
+    assert len(store.target()) == 72
+    np.testing.assert_array_equal(store.target(), expected_target(hourly))
+    assert store.frame().index[-1] == pd.Timestamp("2023-01-03 23:00", tz='UTC')
+    assert store.data_version != version
+
+    rebuilt = FeatureStore(conn, tmp_path / 'rebuilt')
+    assert rebuilt.refresh() == 'rebuilt'
+    assert rebuilt.data_version == store.data_version
+
+def test_rebuild_on_changed_rows_or_spec(conn, tmp_path):
+    """Test that deleted rows and a different spec lead to a full rebuild."""
+    store = FeatureStore(conn, tmp_path)
+    store.refresh()
+    conn.execute("DELETE FROM hourly_data WHERE rowid <= 5")
+    assert store.refresh() == 'rebuilt'
+    assert len(store.target()) == 43
+
+    spec = {**EVENT_FEATURE_SPEC, 'thresholds': {'wind_threshold': ['wind_speed_10m_kmh', None, 10]}}
+    other = FeatureStore(conn, tmp_path, spec=spec)
+    assert other.path != store.path
+    assert other.refresh() == 'rebuilt'
+
+def test_rebuild_on_rows_updated_in_place(conn, tmp_path):
+    """Test that an in-place update, which keeps the row count and last rowid, is detected."""
+    store = FeatureStore(conn, tmp_path)
+    store.refresh()
+    conn.execute("UPDATE hourly_data SET temperature_2m_C = 25, relative_humidity_2m_percent = 50, "
+                 "wind_speed_10m_kmh = 5, precipitation_mm = 0 WHERE rowid = 10")
+    assert store.refresh() == 'rebuilt'
+    assert store.target()[9] == 1
+    assert store.refresh() == 'cached'
@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br05_machine_learning2.forecast_cache import ForecastCache, series_version
+
+@pytest.fixture
+def sample_series():
+    """Fixture for two years of daily temperatures with a yearly cycle."""
+    rng = np.random.default_rng(9)
+    date_rng = pd.date_range(start="2021-01-01", periods=730, freq='D')
+    day = np.arange(len(date_rng))
+    return pd.Series(12 + 10 * np.sin(2 * np.pi * day / 365.25) + rng.normal(0, 1, len(date_rng)), index=date_rng)
+
+def test_series_version(sample_series):
+    """Test that the data version follows the content of the series."""
+    assert series_version(sample_series) == series_version(sample_series.copy())
+    assert series_version(sample_series) != series_version(sample_series.iloc[:-1])
+
+def test_cache_warm_start_and_reuse(sample_series, tmp_path):
+    """Test cold start, reuse of an unchanged series and a warm-started refit after new days."""
+    cache = ForecastCache(tmp_path, periods=30)
+    history = sample_series.iloc[:-7]
+    first, status = cache.forecast(history, "Temperature")
+    assert status == 'cold_start'
+    assert list(first.columns) == ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+    assert len(first) == len(history) + 30
+
+    again, status = cache.forecast(history.copy(), "Temperature")
+    assert status == 'cached'
+    pd.testing.assert_frame_equal(again, first)
+
+    updated, status = cache.forecast(sample_series, "Temperature")
+    assert status == 'warm_start'
+    assert len(updated) == len(sample_series) + 30
+    overlap = first['ds'].isin(updated['ds'])
+    assert np.abs(first.loc[overlap, 'yhat'].to_numpy()
+                  - updated.set_index('ds').loc[first.loc[overlap, 'ds'], 'yhat'].to_numpy()).mean() < 1.0
+    assert cache.report().loc["Temperature", 'status'] == 'warm_start'
+
+def test_new_horizon_reuses_the_fitted_model(sample_series, tmp_path, capsys):
+    """Test that a different forecast horizon predicts from the cached model without refitting."""
+    ForecastCache(tmp_path, periods=30).forecast(sample_series, "Temperature")
+    fitted_at = ForecastCache(tmp_path).metadata("Temperature")['fitted_at']
+    capsys.readouterr()
+    forecast, name = ForecastCache(tmp_path, periods=60)(sample_series, "Temperature")
+    assert name == "Temperature" and len(forecast) == len(sample_series) + 60
+    assert capsys.readouterr().out == ''
+    metadata = ForecastCache(tmp_path).metadata("Temperature")
+    assert metadata['status'] == 'cached_model' and metadata['fitted_at'] == fitted_at
+    assert ForecastCache(tmp_path, periods=60).forecast(sample_series, "Temperature")[1] == 'cached'
+
+def test_changed_prophet_arguments_refit_from_scratch(sample_series, tmp_path):
+    """Test that different Prophet arguments do not reuse the cached model."""
+    ForecastCache(tmp_path, periods=30).forecast(sample_series, "Temperature")
+    cache = ForecastCache(tmp_path, periods=30, prophet_kwargs={'weekly_seasonality': False})
+    assert cache.forecast(sample_series, "Temperature")[1] == 'cold_start'
@@ -0,0 +1,43 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br05_machine_learning2.forecast_runner import run_forecasts
+
+def mean_forecast(series, variable_name):
+    """A cheap stand-in for fit_prophet_model: forecasts the series mean for the next 10 days."""
+    if series.empty:
+        raise ValueError(f"No data for {variable_name}")
+    ds = pd.date_range(series.index[-1] + pd.Timedelta(days=1), periods=10, freq='D')
+    mean, std = series.mean(), series.std()
+    forecast = pd.DataFrame({'ds': ds, 'yhat': mean, 'yhat_lower': mean - std, 'yhat_upper': mean + std})
+    return forecast, variable_name
+
+@pytest.fixture
+def sample_series():
+    """Fixture for daily series of two variables at two locations."""
+    rng = np.random.default_rng(8)
+    date_rng = pd.date_range(start="2020-01-01", periods=365, freq='D')
+    return {
+        (location, variable): pd.Series(offset + rng.normal(0, 1, len(date_rng)), index=date_rng)
+        for location, offset in [('Timisoara', 0.0), ('Cluj', 5.0)]
+        for variable in ['Temperature', 'Wind Speed']
+    }
+
+def test_tidy_forecasts_per_location(sample_series):
+    """Test that every job's forecast lands in one tidy frame, in the order of the input."""
+    forecasts, timings = run_forecasts(sample_series, mean_forecast, max_workers=2)
+    assert list(forecasts.columns) == ['location', 'variable', 'ds', 'yhat', 'yhat_lower', 'yhat_upper']
+    assert len(forecasts) == 4 * 10
+    assert list(timings[['location', 'variable']].itertuples(index=False, name=None)) == list(sample_series)
+    cluj = forecasts[(forecasts['location'] == 'Cluj') & (forecasts['variable'] == 'Temperature')]
+    assert cluj['yhat'].iloc[0] == pytest.approx(sample_series[('Cluj', 'Temperature')].mean())
+    assert (timings['wall_time_s'] > 0).all() and timings['error'].isna().all()
+
+def test_failing_job_is_reported():
+    """Test that one failing job is reported without stopping the other jobs."""
+    date_rng = pd.date_range(start="2020-01-01", periods=30, freq='D')
+    series_map = {'Temperature': pd.Series(np.arange(30.0), index=date_rng), 'Precipitation': pd.Series(dtype=float)}
+    forecasts, timings = run_forecasts(series_map, mean_forecast)
+    assert list(forecasts.columns) == ['variable', 'ds', 'yhat', 'yhat_lower', 'yhat_upper']
+    assert set(forecasts['variable']) == {'Temperature'}
+    assert timings.set_index('variable').loc['Precipitation', 'error'].startswith('ValueError')
@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br05_machine_learning2.harmonic_forecast import (harmonic_design, HarmonicForecaster, fit_harmonic_model,
+                                                          compare_engines)
+
+def make_series(seed, periods=1460, trend=0.5, noise=1.0):
+    """Creates a daily series with a trend (per year), a yearly cycle and Gaussian noise."""
+    rng = np.random.default_rng(seed)
+    date_rng = pd.date_range(start="2020-01-01", periods=periods, freq='D')
+    days = np.arange(periods)
+    values = 10 + trend * days / 365.25 + 8 * np.sin(2 * np.pi * days / 365.25) + rng.normal(0, noise, periods)
+    return pd.Series(values, index=date_rng)
+
+def test_design_matrix():
+    """Test the shape and the trend column of the design matrix."""
+    ds = pd.date_range("2020-01-01", periods=10, freq='D')
+    X = harmonic_design(ds, ds[0], yearly_order=10, weekly_order=3)
+    assert X.shape == (10, 28)
+    np.testing.assert_allclose(X[:, 1], np.arange(10) / 365.25)
+
+def test_batched_fit_matches_single_fits():
+    """Test that fitting many series together gives the same forecasts as fitting them one by one."""
+    series_map = {f"Series {i}": make_series(i) for i in range(5)}
+    series_map["Short"] = make_series(9, periods=900)
+    batched = HarmonicForecaster().fit(series_map)
+    assert len(batched.groups) == 2
+    forecast = batched.predict(periods=30)
+    for name, series in series_map.items():
+        single, _ = fit_harmonic_model(series, name, periods=30)
+        pd.testing.assert_frame_equal(forecast[forecast['variable'] == name].drop(columns='variable').reset_index(drop=True),
+                                      single.reset_index(drop=True))
+
+def test_accuracy_and_interval_coverage():
+    """Test that the held-out error is close to the noise level and the 80% intervals cover about 80%."""
+    report = compare_engines({"Temperature": make_series(1, periods=2190)}, {"harmonic": fit_harmonic_model}, horizon=365)
+    row = report.loc[("Temperature", "harmonic")]
+    assert row['mae'] < 1.0
+    assert row['coverage'] == pytest.approx(0.8, abs=0.07)
+
+def test_many_series_with_shared_dates():
+    """Test that hundreds of series with shared dates are fitted and forecast together."""
+    base = make_series(0)
+    rng = np.random.default_rng(1)
+    series_map = {(f"City {i}", "Temperature"): base + rng.normal(0, 1, len(base)) for i in range(300)}
+    forecast = HarmonicForecaster().fit(series_map).predict(periods=365)
+    assert list(forecast.columns) == ['location', 'variable', 'ds', 'yhat', 'yhat_lower', 'yhat_upper']
+    assert (forecast.groupby('location').size() == len(base) + 365).all() and forecast['location'].nunique() == 300
+    assert np.isfinite(forecast['yhat']).all()
+    assert (forecast['yhat_lower'] <= forecast['yhat']).all() and (forecast['yhat'] <= forecast['yhat_upper']).all()
+    fitted = forecast[forecast['ds'].isin(base.index)].groupby('ds')['yhat'].mean()
+    assert np.abs(fitted.to_numpy() - base.to_numpy()).mean() < 1.5
+
+def test_auto_seasonality_on_short_history():
+    """Test that yearly seasonality is left out for less than two years of data, keeping forecasts bounded."""
+    series = make_series(3, periods=300)
+    forecaster = HarmonicForecaster().fit({"Temperature": series})
+    assert forecaster.groups[0]['orders'] == (0, 3)
+    forecast = forecaster.predict(periods=365)
+    assert forecast['yhat'].abs().max() < 100
@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br06_scoring_system.scoring_engine import humidity_score
+from src.br06_scoring_system.hourly_scoring import day_hour_cube, score_hour_windows, hourly_coverage
+
+@pytest.fixture
+def sample_hourly():
+    """Fixture for 10 days of hourly UTC data of two locations, with a missing hour."""
+    rng = np.random.default_rng(12)
+    date_rng = pd.date_range(start="2023-06-01", periods=240, freq='h', tz='UTC')
+    frames = [pd.DataFrame({
+        'location': location,
+        'temperature_2m_C': rng.uniform(10, 32, 240),
+        'relative_humidity_2m_percent': rng.uniform(20, 95, 240),
+        'precipitation_mm': np.where(rng.random(240) < 0.8, 0.0, rng.exponential(1, 240)),
+        'wind_speed_10m_kmh': rng.uniform(0, 25, 240)
+    }, index=date_rng) for location in ["Cluj", "Timisoara"]]
+    hourly = pd.concat(frames)
+    return hourly[np.arange(len(hourly)) != 5 * 24 + 20]
+
+def brute_force(hourly, location, hours):
+    """Scores one window directly from its hourly rows."""
+    rows = hourly[(hourly['location'] == location) & hourly.index.isin(hours)]
+    temperature = np.where((rows['temperature_2m_C'] >= 18) & (rows['temperature_2m_C'] <= 25), 1.0,
+                           np.clip(1 - np.abs(rows['temperature_2m_C'] - 18) / 7, 0, 1)).mean()
+    wind = np.clip(1 - np.abs(rows['wind_speed_10m_kmh'] - 10) / 10, 0, 1).mean()
+    humidity = humidity_score(rows['relative_humidity_2m_percent']).mean()
+    dry = float(rows['precipitation_mm'].sum() <= 0)
+    return (temperature * 0.35 + dry * 0.3 + wind * 0.2 + humidity * 0.15) * 100
+
+def test_humidity_score():
+    """Test the humidity sub-score inside, around and far from the ideal range."""
+    np.testing.assert_allclose(humidity_score([45, 15, 75, 100, np.nan]), [1.0, 0.5, 0.5, 0.0, np.nan])
+
+def test_day_hour_cube(sample_hourly):
+    """Test the (locations, days, 24) layout, the missing hour and the time zone shift."""
+    cubes, calendar, locations = day_hour_cube(sample_hourly)
+    assert cubes['temperature'].shape == (2, 10, 24) and list(locations) == ["Cluj", "Timisoara"]
+    assert np.isnan(cubes['temperature'][0, 5, 20]) and not np.isnan(cubes['temperature'][1, 5, 20])
+    local, local_calendar, _ = day_hour_cube(sample_hourly, timezone='Europe/Bucharest')
+    assert local_calendar[0] == pd.Timestamp("2023-06-01") and len(local_calendar) == 11
+    assert local['temperature'][0, 0, 3] == cubes['temperature'][0, 0, 0]
+
+def test_windows_match_brute_force(sample_hourly):
+    """Test evening, morning and midnight-wrapping windows against scoring their hours directly."""
+    scores = score_hour_windows(sample_hourly, windows=[(18, 23), (9, 13), (22, 2)])
+    assert set(scores['window']) == {'18-23', '09-13', '22-02'}
+    for location, day, window, hours in [("Cluj", 2, '18-23', range(18, 23)), ("Timisoara", 7, '09-13', range(9, 13)),
+                                         ("Cluj", 3, '22-02', range(22, 26))]:
+        date = pd.Timestamp("2023-06-01") + pd.Timedelta(days=day)
+        row = scores[(scores['location'] == location) & (scores['date'] == date) & (scores['window'] == window)].iloc[0]
+        timestamps = [(date + pd.Timedelta(hours=hour)).tz_localize('UTC') for hour in hours]
+        assert row['score'] == pytest.approx(brute_force(sample_hourly, location, timestamps))
+
+def test_missing_hours_leave_windows_unscored(sample_hourly):
+    """Test that windows touching the missing hour or the end of the data are not scored."""
+    scores = score_hour_windows(sample_hourly, windows=[(18, 23), (22, 2)], dropna=False)
+    cluj = scores[(scores['location'] == "Cluj")].set_index(['date', 'window'])['score']
+    assert np.isnan(cluj[(pd.Timestamp("2023-06-06"), '18-23')])
+    assert np.isnan(cluj[(pd.Timestamp("2023-06-10"), '22-02')])
+    assert len(score_hour_windows(sample_hourly, windows=[(18, 23)])) == 2 * 10 - 1
+    with pytest.raises(ValueError):
+        score_hour_windows(sample_hourly, windows=[(18, 25)])
+
+def test_hourly_coverage_warns_about_compacted_days(sample_hourly):
+    """Test the raw coverage and the warning when compacted days have no raw hours."""
+    coverage = hourly_coverage(sample_hourly)
+    assert coverage['first_day'] == pd.Timestamp("2023-06-01") and coverage['last_day'] == pd.Timestamp("2023-06-10")
+    assert coverage['raw_days'] == 10 and coverage['compacted_days'] == 0
+
+    summary = pd.DataFrame({'location': "Cluj"}, index=pd.date_range("2023-05-20", "2023-05-31", freq='D'))
+    with pytest.warns(UserWarning, match="12 compacted days"):
+        assert hourly_coverage(sample_hourly, summary)['compacted_days'] == 12
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br04_machine_learning1.hyperparameter_search import halving_forest_search
+
+@pytest.fixture
+def sample_features():
+    """Fixture for creating hourly weather features and the event suitability target."""
+    rng = np.random.default_rng(1)
+    n = 400
+    X = pd.DataFrame({
+        'temperature_2m_C': rng.uniform(5, 35, n),
+        'relative_humidity_2m_percent': rng.uniform(20, 90, n),
+        'wind_speed_10m_kmh': rng.uniform(0, 30, n),
+        'precipitation_mm': rng.exponential(0.5, n),
+    })
+    y = ((X['temperature_2m_C'].between(20, 30)) & (X['wind_speed_10m_kmh'] < 15)).astype(int)
+    return X, y
+
+@pytest.fixture
+def param_grid():
+    """Fixture for a small Random Forest grid."""
+    return {'n_estimators': [10, 30], 'max_depth': [1, 5, None], 'min_samples_split': [2, 10, 50]}
+
+def test_halving_over_trees(sample_features, param_grid):
+    """Test that candidates are halved each round and the last round uses all trees."""
+    X, y = sample_features
+    result = halving_forest_search(X, y, param_grid, cv=3, n_jobs=2)
+    history = result['history']
+
+    assert result['completed']
+    assert list(history.groupby('round').size()) == [9, 3, 1]
+    assert history['n_estimators'].iloc[-1] == 30
+    assert result['best_params']['n_estimators'] == 30
+    assert result['best_params']['max_depth'] != 1
+    assert result['best_score'] > 0.8
+
+def test_halving_over_samples(sample_features, param_grid):
+    """Test the sample-count resource: the training rows grow up to the full fold."""
+    X, y = sample_features
+    result = halving_forest_search(X, y, param_grid, cv=3, resource='n_samples', n_jobs=2)
+    resources = result['history'].groupby('round')['n_samples'].first()
+    assert resources.is_monotonic_increasing
+    assert resources.iloc[-1] == 266
+    assert len(result['history']) == 18 + 6 + 2 + 1
+
+def test_cache_and_time_budget(sample_features, param_grid, tmp_path):
+    """Test that a completed search is cached per data version and a budget-stopped one is not."""
+    X, y = sample_features
+    stopped = halving_forest_search(X, y, param_grid, cv=3, n_jobs=1, time_budget=0, cache_dir=tmp_path)
+    assert not stopped['completed']
+    assert stopped['history']['round'].max() == 0
+    assert not list(tmp_path.iterdir())
+
+    first = halving_forest_search(X, y, param_grid, cv=3, n_jobs=1, cache_dir=tmp_path, data_version='v1')
+    again = halving_forest_search(X, y, param_grid, cv=3, n_jobs=1, cache_dir=tmp_path, data_version='v1')
+    assert not first['from_cache'] and again['from_cache']
+    assert again['best_params'] == first['best_params']
+    pd.testing.assert_frame_equal(again['history'][['round', 'mean_score']], first['history'][['round', 'mean_score']])
+    assert not halving_forest_search(X, y, param_grid, cv=3, n_jobs=1, cache_dir=tmp_path,
+                                     data_version='v2')['from_cache']
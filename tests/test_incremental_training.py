@@ -0,0 +1,56 @@
+import sqlite3
+import pytest
+import numpy as np
+import pandas as pd
+from src.br04_machine_learning1.feature_store import EVENT_FEATURE_SPEC
+from src.br04_machine_learning1.incremental_training import is_test_row, iter_feature_chunks, IncrementalTrainer
+
+def make_hourly(start, periods, seed):
+    """Creates hourly rows shaped like the hourly_data table."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range(start=start, periods=periods, freq='h'),
+        'temperature_2m_C': rng.uniform(5, 35, periods),
+        'relative_humidity_2m_percent': rng.uniform(20, 90, periods),
+        'precipitation_mm': rng.exponential(0.5, periods),
+        'wind_speed_10m_kmh': rng.uniform(0, 30, periods),
+    })
+
+@pytest.fixture
+def conn():
+    """Fixture for an in-memory database with 100 days of hourly data."""
+    conn = sqlite3.connect(':memory:')
+    make_hourly("2023-01-01", 2400, 0).to_sql('hourly_data', conn)
+    return conn
+
+def test_split_is_stable():
+    """Test that the rowid split holds out the requested fraction and does not depend on chunking."""
+    rowids = np.arange(1, 100_001)
+    test = is_test_row(rowids, 0.2)
+    assert test.mean() == pytest.approx(0.2, abs=0.01)
+    np.testing.assert_array_equal(np.concatenate([is_test_row(part) for part in np.array_split(rowids, 7)]), test)
+
+def test_chunks_are_bounded(conn):
+    """Test that the table is streamed in chunks of at most chunk_size rows."""
+    chunks = list(iter_feature_chunks(conn, chunk_size=500))
+    assert [len(rowids) for rowids, _, _ in chunks] == [500, 500, 500, 500, 400]
+    assert chunks[0][1].shape == (500, 4)
+
+def test_fit_evaluate_and_update(conn):
+    """Test out-of-core training on the event spec, streaming evaluation and an incremental update."""
+    trainer = IncrementalTrainer().fit(conn, chunk_size=300, epochs=10)
+    metrics = trainer.evaluate(conn, chunk_size=300)
+    # The banded target is rare, so always predicting "unsuitable" is already accurate
+    assert metrics['accuracy'] > metrics['majority_baseline'] + 0.02
+    assert metrics['tp'] > metrics['fn']
+    assert metrics['n_test'] == pytest.approx(480, abs=60)
+    assert trainer.last_rowid == 2400
+    assert trainer.n_trained == 2400 - metrics['n_test']
+
+    scale = trainer.scaler.scale_.copy()
+    make_hourly("2023-04-11", 24, 1).to_sql('hourly_data', conn, if_exists='append')
+    assert trainer.update(conn) == 24
+    assert trainer.n_trained == 2424 - int(is_test_row(np.arange(1, 2425)).sum())
+    np.testing.assert_array_equal(trainer.scaler.scale_, scale)
+    assert trainer.update(conn) == 0
+    assert trainer.predict_proba(np.zeros((3, 4))).shape == (3, 2)
@@ -0,0 +1,39 @@
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier, GradientBoostingClassifier
+from sklearn.svm import SVC
+from sklearn.model_selection import train_test_split
+from src.br04_machine_learning1.model_engines import select_models, parity_report, SUBSTITUTED_MODELS
+
+@pytest.fixture
+def sample_features():
+    """Fixture for creating hourly weather features and the event suitability target."""
+    rng = np.random.default_rng(2)
+    n = 3000
+    X = pd.DataFrame({
+        'temperature_2m_C': rng.uniform(5, 35, n),
+        'relative_humidity_2m_percent': rng.uniform(20, 90, n),
+        'wind_speed_10m_kmh': rng.uniform(0, 30, n),
+        'precipitation_mm': rng.exponential(0.5, n),
+    })
+    y = ((X['temperature_2m_C'].between(20, 30)) & (X['relative_humidity_2m_percent'].between(30, 70))).astype(int)
+    return train_test_split(X, y, test_size=0.3, random_state=42)
+
+def test_select_models_by_row_count():
+    """Test that the engines switch above the row threshold and keep the same model names."""
+    small, large = select_models(1000), select_models(200_000)
+    assert list(small) == list(large)
+    assert isinstance(small["Gradient Boosting"], GradientBoostingClassifier)
+    assert isinstance(small["Support Vector Machine"], SVC)
+    assert isinstance(large["Gradient Boosting"], HistGradientBoostingClassifier)
+    assert large["K-Nearest Neighbors"].get_params() == small["K-Nearest Neighbors"].get_params()
+
+def test_parity_report(sample_features):
+    """Test that the large-data engines are not less accurate than the exact models."""
+    X_train, X_test, y_train, y_test = sample_features
+    report = parity_report(X_train, y_train, X_test, y_test, sample_size=1500)
+    assert list(report.index) == SUBSTITUTED_MODELS
+    assert (report['large_accuracy'] > 0.85).all()
+    assert (report['accuracy_difference'] > -0.05).all()
+    assert (report[['exact_fit_s', 'large_fit_s']] > 0).all().all()
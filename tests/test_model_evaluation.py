@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import cross_val_score
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from src.br04_machine_learning1.model_evaluation import evaluate_models
+
+@pytest.fixture
+def sample_features():
+    """Fixture for creating hourly weather features and the event suitability target."""
+    rng = np.random.default_rng(0)
+    n = 600
+    X = pd.DataFrame({
+        'temperature_2m_C': rng.uniform(5, 35, n),
+        'relative_humidity_2m_percent': rng.uniform(20, 90, n),
+        'wind_speed_10m_kmh': rng.uniform(0, 30, n),
+        'precipitation_mm': rng.exponential(0.5, n),
+    })
+    y = ((X['temperature_2m_C'].between(20, 30)) & (X['wind_speed_10m_kmh'] < 15)).astype(int)
+    return X, y
+
+def test_scores_match_cross_val_score(sample_features):
+    """Test that the parallel runner reproduces cross_val_score for deterministic models."""
+    X, y = sample_features
+    models = {
+        "Logistic Regression": LogisticRegression(max_iter=1000, random_state=42),
+        "K-Nearest Neighbors": KNeighborsClassifier(n_neighbors=5),
+    }
+    report, _ = evaluate_models(models, X, y, cv=5, n_jobs=2)
+    for model_name, model in models.items():
+        expected = cross_val_score(model, X.to_numpy(), y, cv=5)
+        np.testing.assert_allclose(report.loc[model_name, 'fold_scores'], expected)
+        assert report.loc[model_name, 'mean_score'] == pytest.approx(expected.mean())
+
+def test_report_and_refitted_models(sample_features):
+    """Test that the timing columns are filled and every model is refitted on all rows."""
+    X, y = sample_features
+    models = {"Random Forest": RandomForestClassifier(n_estimators=10, random_state=42)}
+    report, fitted = evaluate_models(models, X, y, cv=3, n_jobs=2, track_memory=True)
+
+    assert list(report.index) == ["Random Forest"]
+    assert (report[['wall_time_s', 'cpu_time_s', 'peak_memory_mb']] > 0).all().all()
+    assert len(report.loc["Random Forest", 'fold_scores']) == 3
+    expected = RandomForestClassifier(n_estimators=10, random_state=42).fit(X.to_numpy(), y)
+    np.testing.assert_array_equal(fitted["Random Forest"].predict(X.to_numpy()), expected.predict(X.to_numpy()))
+
+def test_memory_tracking_is_opt_in(sample_features):
+    """Test that tracemalloc only runs when asked for."""
+    X, y = sample_features
+    report, _ = evaluate_models({"K-Nearest Neighbors": KNeighborsClassifier()}, X, y, cv=3, n_jobs=1)
+    assert np.isnan(report.loc["K-Nearest Neighbors", 'peak_memory_mb'])
@@ -0,0 +1,59 @@
+import sqlite3
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from src.br04_machine_learning1.feature_store import FeatureStore, EVENT_FEATURE_SPEC
+from src.br04_machine_learning1.model_registry import save_model, load_model, list_models, BatchPredictor
+
+@pytest.fixture
+def feature_store(tmp_path):
+    """Fixture for a feature store over ten days of hourly data."""
+    rng = np.random.default_rng(4)
+    periods = 240
+    hourly = pd.DataFrame({
+        'date': pd.date_range(start="2023-06-01", periods=periods, freq='h', tz='UTC'),
+        'temperature_2m_C': rng.uniform(5, 35, periods),
+        'relative_humidity_2m_percent': rng.uniform(20, 90, periods),
+        'precipitation_mm': rng.exponential(0.5, periods),
+        'wind_speed_10m_kmh': rng.uniform(0, 30, periods),
+    })
+    conn = sqlite3.connect(':memory:')
+    hourly.to_sql('hourly_data', conn)
+    store = FeatureStore(conn, tmp_path / 'features')
+    store.refresh()
+    return store
+
+@pytest.fixture
+def trained_model(feature_store):
+    """Fixture for a small forest trained on the feature store."""
+    return RandomForestClassifier(n_estimators=5, random_state=0).fit(feature_store.matrix(), feature_store.target())
+
+def test_save_and_load(feature_store, trained_model, tmp_path):
+    """Test that a saved model round-trips with its metadata and identical predictions."""
+    features = EVENT_FEATURE_SPEC['inputs']
+    save_model(trained_model, tmp_path / 'models', "Random Forest", features,
+               data_version=feature_store.data_version, metrics={'accuracy': 0.9})
+    model, metadata = load_model(tmp_path / 'models', "Random Forest")
+
+    assert metadata['features'] == features
+    assert metadata['data_version'] == feature_store.data_version
+    np.testing.assert_array_equal(model.predict(feature_store.matrix()), trained_model.predict(feature_store.matrix()))
+    listed = list_models(tmp_path / 'models')
+    assert listed.loc["Random Forest", 'accuracy'] == 0.9
+
+def test_batch_predictions(feature_store, trained_model, tmp_path):
+    """Test chunked scoring of date ranges and of new rows against direct predictions."""
+    save_model(trained_model, tmp_path / 'models', "Random Forest", EVENT_FEATURE_SPEC['inputs'])
+    predictor = BatchPredictor.load(tmp_path / 'models', "Random Forest", chunk_size=7)
+    expected = trained_model.predict(feature_store.matrix())
+
+    day = predictor.predict_range(feature_store, "2023-06-03", "2023-06-04")
+    assert len(day) == 24
+    assert day.index[0] == pd.Timestamp("2023-06-03", tz='UTC')
+    np.testing.assert_array_equal(day.to_numpy(), expected[48:72])
+
+    frame = feature_store.frame()
+    np.testing.assert_array_equal(predictor.predict_frame(frame).to_numpy(), expected)
+    probabilities = predictor.predict_range(feature_store, probability=True)
+    assert probabilities.between(0, 1).all() and len(probabilities) == 240
@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br03_data_analysis.precipitation_spells import PrecipitationSpells
+
+@pytest.fixture
+def sample_hourly_data():
+    """
+    Fixture for three days of hourly precipitation with known wet/dry spells.
+    Day 1: wet 06-08h (3 hours), day 2: dry, day 3: wet 22-23h plus a missing hour at 12h.
+    """
+    date_rng = pd.date_range(start="2023-01-01", periods=72, freq='h')
+    precipitation = np.zeros(72)
+    precipitation[6:9] = [0.5, 1.0, 1.5]
+    precipitation[70:72] = [2.0, 4.0]
+    precipitation[60] = np.nan
+    return pd.DataFrame({'precipitation_mm': precipitation}, index=date_rng)
+
+def test_run_length_encoding(sample_hourly_data):
+    """Test that runs are split on state changes and missing values, with their totals."""
+    spells = PrecipitationSpells(sample_hourly_data)
+    assert spells.length.tolist() == [6, 3, 51, 9, 2]
+    assert spells.wet.tolist() == [False, True, False, False, True]
+    assert spells.total[1] == pytest.approx(3.0)
+    assert spells.length.sum() == 71
+
+def test_spell_statistics(sample_hourly_data):
+    """Test distribution, wet frequency, wet-day frequency and intensity."""
+    spells = PrecipitationSpells(sample_hourly_data)
+    distribution = spells.spell_length_distribution()
+    assert distribution.loc[3, 'wet'] == 1
+    assert distribution.loc[51, 'dry'] == 1
+    assert spells.wet_frequency().loc[2023] == pytest.approx(5 / 71)
+    assert spells.wet_day_frequency().loc[2023] == pytest.approx(2 / 3)
+    assert spells.intensity().loc[2023] == pytest.approx(9.0 / 5)
+
+def test_longest_spells_per_location():
+    """Test longest spells per year and location on daily data, with a gap breaking a dry spell."""
+    date_rng = pd.date_range(start="2022-12-25", periods=20, freq='D')
+    rain = np.array([0, 0, 5, 5, 5, 0, 0, 0, 0, 0, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0], dtype=float)
+    frames = [pd.DataFrame({'location': 'Timisoara', 'precipitation_sum_mm': rain}, index=date_rng),
+              pd.DataFrame({'location': 'Cluj', 'precipitation_sum_mm': rain[::-1]}, index=date_rng)]
+    data = pd.concat(frames).drop(index=date_rng[16])  # gap splits the last dry spell
+
+    spells = PrecipitationSpells(data, column='precipitation_sum_mm', wet_threshold=1.0)
+    longest = spells.longest_spells('year')
+    assert longest.loc[('Timisoara', 2022), 'longest_wet'] == 3
+    assert longest.loc[('Timisoara', 2022), 'longest_dry'] == 8
+    assert longest.loc[('Timisoara', 2023), 'longest_dry'] == 3
+    assert longest.loc[('Cluj', 2022), 'longest_dry'] == 6
+    assert longest.loc[('Timisoara', 2022), 'longest_wet_start'] == pd.Timestamp('2022-12-27')
+
+def test_monthly_statistics_split_spells_at_month_boundaries():
+    """Test that a wet spell crossing a month boundary counts each day in its own month."""
+    date_rng = pd.date_range(start="2023-01-28", periods=7, freq='D')
+    data = pd.DataFrame({'precipitation_sum_mm': [0, 0, 4, 4, 6, 0, 0]}, index=date_rng, dtype=float)
+    spells = PrecipitationSpells(data, column='precipitation_sum_mm', wet_threshold=1.0)
+    frequency = spells.wet_frequency('month')
+    assert frequency.loc[(2023, 1)] == pytest.approx(2 / 4)
+    assert frequency.loc[(2023, 2)] == pytest.approx(1 / 3)
+    pd.testing.assert_series_equal(frequency, spells.wet_day_frequency('month'), check_names=False)
+    intensity = spells.intensity('month')
+    assert intensity.loc[(2023, 1)] == pytest.approx(4.0)
+    assert intensity.loc[(2023, 2)] == pytest.approx(6.0)
+    assert spells.longest_spells('month').loc[(2023, 1), 'longest_wet'] == 3
+
+def test_hourly_spell_split_at_month_boundary_with_timezone():
+    """Test splitting an hourly spell at local midnight of a new month."""
+    date_rng = pd.date_range(start="2023-03-31 20:00", periods=8, freq='h', tz='Europe/Bucharest')
+    data = pd.DataFrame({'precipitation_mm': [0, 1, 1, 1, 2, 2, 0, 0]}, index=date_rng, dtype=float)
+    spells = PrecipitationSpells(data)
+    assert spells.wet_frequency('month').tolist() == pytest.approx([3 / 4, 2 / 4])
+    intensity = spells.intensity('season')
+    assert intensity.loc[(2023, 'Winter')] == pytest.approx(1.0)
+    assert intensity.loc[(2023, 'Spring')] == pytest.approx(2.0)
+
+def test_wet_day_frequency_across_daylight_saving_change():
+    """Test that days after a 23-hour DST day keep their calendar date and month."""
+    date_rng = pd.date_range(start="2023-03-25 00:00", end="2023-04-02 23:00", freq='h', tz='Europe/Bucharest')
+    data = pd.DataFrame({'precipitation_mm': 0.0}, index=date_rng)
+    data.loc["2023-04-01 00:00":"2023-04-01 02:00", 'precipitation_mm'] = 1.5
+    frequency = PrecipitationSpells(data).wet_day_frequency('month')
+    assert frequency.loc[(2023, 3)] == pytest.approx(0.0)
+    assert frequency.loc[(2023, 4)] == pytest.approx(1 / 2)
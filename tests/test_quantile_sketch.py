@@ -0,0 +1,83 @@
+import sqlite3
+import pytest
+import numpy as np
+import pandas as pd
+from src.br03_data_analysis.quantile_sketch import KLLSketch, QuantileSketchStore
+from src.br03_data_analysis.analyze_data import ExtremeWeatherAnalyzer
+
+@pytest.fixture
+def sample_daily_data():
+    """
+    Fixture for creating 30 years of daily data for two locations.
+    """
+    rng = np.random.default_rng(5)
+    date_rng = pd.date_range(start="1990-01-01", end="2019-12-31", freq='D')
+    frames = []
+    for location, offset in [('Berlin', 0.0), ('Munich', 3.0)]:
+        frames.append(pd.DataFrame({
+            'location': location,
+            'temperature_2m_max_C': 15 + offset + rng.normal(0, 8, len(date_rng)),
+            'temperature_2m_min_C': 5 + offset + rng.normal(0, 6, len(date_rng)),
+            'precipitation_sum_mm': rng.exponential(2, len(date_rng)),
+            'wind_speed_10m_max_kmh': rng.gamma(4, 5, len(date_rng)),
+        }, index=date_rng))
+    return pd.concat(frames)
+
+def test_sketch_quantiles_within_error_bound():
+    """Test that sketch quantiles fall within the documented rank error, while staying small."""
+    values = np.random.default_rng(0).normal(size=200_000)
+    sketch = KLLSketch(k=200, seed=1)
+    for chunk in np.array_split(values, 50):
+        sketch.update(chunk)
+    assert sketch.n == len(values)
+    assert sum(len(level) for level in sketch.levels) < 1000
+    for q in [0.01, 0.05, 0.5, 0.95, 0.99]:
+        true_rank = np.mean(values <= sketch.quantile(q))
+        assert abs(true_rank - q) < 0.0165
+    assert sketch.quantile(0) == values.min()
+    assert sketch.quantile(1) == values.max()
+
+def test_merge_and_serialization():
+    """Test that merged sketches behave like one sketch over all values and survive a round trip."""
+    rng = np.random.default_rng(2)
+    first_values, second_values = rng.uniform(0, 1, 50_000), rng.uniform(1, 2, 50_000)
+    first, second = KLLSketch(seed=3), KLLSketch(seed=4)
+    first.update(first_values)
+    second.update(second_values)
+    merged = KLLSketch.from_dict(first.to_dict()).merge(second)
+    assert merged.n == 100_000
+    assert merged.quantile(0.5) == pytest.approx(1.0, abs=0.03)
+    assert merged.rank(1.5) == pytest.approx(0.75, abs=0.0165)
+
+def test_store_is_incremental(sample_daily_data):
+    """Test that the store only ingests new rows and persists sketches between runs."""
+    conn = sqlite3.connect(':memory:')
+    variables = ['temperature_2m_max_C', 'precipitation_sum_mm']
+    first_part = sample_daily_data[sample_daily_data.index < '2010-01-01']
+    assert QuantileSketchStore(conn, seed=0).update(first_part, variables) == 2 * len(first_part)
+
+    store = QuantileSketchStore(conn, seed=0)
+    assert store.update(sample_daily_data, variables) == 2 * (len(sample_daily_data) - len(first_part))
+    assert store.update(sample_daily_data, variables) == 0
+    berlin = sample_daily_data[sample_daily_data['location'] == 'Berlin']
+    assert store.sketches[('Berlin', 'temperature_2m_max_C')].n == len(berlin)
+    assert store.merged('temperature_2m_max_C').n == len(sample_daily_data)
+
+def test_define_thresholds_from_sketches(sample_daily_data):
+    """Test that thresholds from sketches are close to the exact percentiles."""
+    conn = sqlite3.connect(':memory:')
+    variables = ['temperature_2m_max_C', 'temperature_2m_min_C', 'precipitation_sum_mm', 'wind_speed_10m_max_kmh']
+    store = QuantileSketchStore(conn, seed=0)
+    store.update(sample_daily_data, variables)
+
+    exact = ExtremeWeatherAnalyzer(daily_data=sample_daily_data)
+    exact.define_thresholds()
+    approximate = ExtremeWeatherAnalyzer(daily_data=sample_daily_data)
+    approximate.define_thresholds(sketches=store.sketches_for(variables))
+    thresholds = {'temperature_high': 'temperature_2m_max_C', 'temperature_low': 'temperature_2m_min_C',
+                  'precipitation_high': 'precipitation_sum_mm', 'wind_speed_high': 'wind_speed_10m_max_kmh',
+                  'wind_speed_low': 'wind_speed_10m_max_kmh'}
+    for name, column in thresholds.items():
+        rank = np.mean(sample_daily_data[column] <= getattr(approximate, name))
+        exact_rank = np.mean(sample_daily_data[column] <= getattr(exact, name))
+        assert abs(rank - exact_rank) < 0.0165
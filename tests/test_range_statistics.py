@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br03_data_analysis.range_statistics import RangeStatisticsIndex
+from src.br03_data_analysis.analyze_data import WeatherAnalyzer
+
+@pytest.fixture
+def sample_daily_data():
+    """
+    Fixture for creating three years of daily data with a few missing values.
+    """
+    rng = np.random.default_rng(5)
+    date_rng = pd.date_range(start="2021-01-01", end="2023-12-31", freq='D')
+    data = {
+        'temperature_2m_mean_C': 200 + rng.normal(10, 5, len(date_rng)),
+        'precipitation_sum_mm': rng.exponential(2, len(date_rng)),
+    }
+    frame = pd.DataFrame(data, index=date_rng)
+    frame.iloc[::17, 0] = np.nan
+    return frame
+
+def expected_statistics(frame, start, end):
+    """Reference statistics computed by filtering the frame."""
+    window = frame[(frame.index >= start) & (frame.index < end)]
+    return window.agg(['count', 'sum', 'mean', 'std', 'min', 'max']).T
+
+def test_query_matches_filtering(sample_daily_data):
+    """Test single windows of different lengths (inside one block and across many blocks)."""
+    index = RangeStatisticsIndex(sample_daily_data, block_size=8)
+    for start, end in [('2021-03-02', '2021-03-05'), ('2021-01-01', '2023-12-31'), ('2022-02-10', '2022-07-01')]:
+        result = index.query(start, end)
+        expected = expected_statistics(sample_daily_data, start, end)
+        pd.testing.assert_frame_equal(result[expected.columns], expected, check_names=False, check_dtype=False)
+
+def test_query_batch_random_windows(sample_daily_data):
+    """Test many random windows in one call against filtering."""
+    rng = np.random.default_rng(1)
+    index = RangeStatisticsIndex(sample_daily_data, block_size=16)
+    bounds = np.sort(rng.integers(0, len(sample_daily_data), size=(200, 2)), axis=1)
+    starts = sample_daily_data.index[bounds[:, 0]]
+    ends = sample_daily_data.index[bounds[:, 1]]
+    result = index.query_batch(starts, ends)
+    for row in range(0, 200, 7):
+        expected = expected_statistics(sample_daily_data, starts[row], ends[row])
+        for column in sample_daily_data.columns:
+            for stat in ['count', 'mean', 'min', 'max']:
+                assert result[(column, stat)].iloc[row] == pytest.approx(expected.loc[column, stat], nan_ok=True)
+
+def test_query_recurring(sample_daily_data):
+    """Test pooling the same calendar window over all years."""
+    index = RangeStatisticsIndex(sample_daily_data)
+    result = index.query_recurring('07-03', '07-18')
+    window = sample_daily_data[(sample_daily_data.index.month == 7) & sample_daily_data.index.day.isin(range(3, 18))]
+    assert result.loc['precipitation_sum_mm', 'count'] == 45
+    assert result.loc['precipitation_sum_mm', 'mean'] == pytest.approx(window['precipitation_sum_mm'].mean())
+    assert result.loc['temperature_2m_mean_C', 'std'] == pytest.approx(window['temperature_2m_mean_C'].std())
+    assert len(index.query_recurring('12-20', '01-10', by_year=True)) == 3
+
+def test_weather_analyzer_range_index(sample_daily_data):
+    """Test that the analyzer builds the index once and reuses it."""
+    analyzer = WeatherAnalyzer(daily_data=sample_daily_data)
+    index = analyzer.range_index('daily')
+    assert analyzer.range_index('daily') is index
+    assert index.query('2022-01-01', '2022-01-08').loc['precipitation_sum_mm', 'count'] == 7
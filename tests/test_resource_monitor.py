@@ -0,0 +1,57 @@
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from src.br05_machine_learning2.resource_monitor import ResourceMonitor
+
+def test_stages_are_sampled_in_background(tmp_path):
+    """Test that samples are tagged per stage and summarized, including a short stage."""
+    with ResourceMonitor(interval=0.01, include_children=False) as monitor:
+        with monitor.stage("allocate"):
+            block = np.ones((2000, 2000))
+        with monitor.stage("short"):
+            del block
+
+    summary = monitor.summary()
+    assert list(summary.index) == ["allocate", "short"]
+    assert (summary['n_samples'] >= 2).all()
+    assert set(monitor.to_frame()['stage'].dropna()) == {"allocate", "short"}
+    assert (summary['duration_s'] >= 0).all()
+    assert (summary['max_rss_mb'] > 0).all()
+    assert (summary['lifetime_peak_rss_mb'] >= 0).all()
+
+def test_short_stage_and_export(tmp_path):
+    """Test that a stage shorter than the interval is sampled and that samples can be exported."""
+    monitor = ResourceMonitor(interval=1.0).start()
+    with monitor.stage("fit"):
+        pass
+    monitor.stop()
+    assert len(monitor.samples) >= 2
+
+    monitor.export(tmp_path / 'usage.csv')
+    monitor.export(tmp_path / 'usage.json')
+    exported = pd.read_csv(tmp_path / 'usage.csv')
+    assert len(exported) == len(monitor.samples)
+    assert set(exported['stage'].dropna()) == {"fit"}
+    assert len(pd.read_json(tmp_path / 'usage.json')) == len(exported)
+
+def test_samples_from_both_threads_are_serialized():
+    """Test that stage samples from the main thread and the sampling thread never overlap."""
+    monitor = ResourceMonitor(interval=0.001, include_children=False)
+    active, overlaps = [0], []
+    original = monitor._sample
+
+    def checked_sample():
+        active[0] += 1
+        overlaps.append(active[0] > 1)
+        time.sleep(0.0005)
+        active[0] -= 1
+        return original()
+
+    monitor._sample = checked_sample
+    with monitor:
+        for _ in range(50):
+            with monitor.stage("busy"):
+                pass
+    assert len(overlaps) >= 100
+    assert not any(overlaps)
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br06_scoring_system.scoring_engine import score_frame
+from src.br06_scoring_system.scenario_sweep import config_row, config_grid, normalize_weights, sweep_scores, sweep
+
+@pytest.fixture
+def sample_data():
+    """Fixture for 3 years of daily weather with a few missing values."""
+    rng = np.random.default_rng(8)
+    n = 1095
+    data = pd.DataFrame({
+        'temperature_2m_mean_C': rng.uniform(-5, 35, n),
+        'precipitation_sum_mm': np.where(rng.random(n) < 0.5, 0.0, rng.exponential(2, n)),
+        'wind_speed_10m_max_kmh': rng.uniform(0, 30, n)
+    }, index=pd.date_range("2020-01-01", periods=n, freq='D'))
+    data.iloc[[4, 40], 0] = np.nan
+    return data
+
+def test_config_grid():
+    """Test that the grid covers every combination and keeps defaults for other parameters."""
+    grid = config_grid(temperature_weight=[0.3, 0.4], temperature_low=[16, 18, 20])
+    assert len(grid) == 6
+    assert (grid['wind_speed'] == 10).all() and (grid['temperature_high'] == 25).all()
+    with pytest.raises(ValueError):
+        config_grid(humidity=[50])
+
+def test_sweep_scores_match_engine(sample_data):
+    """Test that every row of the broadcasted sweep equals scoring with that configuration."""
+    configs = pd.DataFrame([config_row(), config_row({"temperature": 0.6, "precipitation": 0.2, "wind_speed": 0.2},
+                                                     {"temperature": (15, 22), "precipitation": 1, "wind_speed": 5})])
+    scores = sweep_scores(sample_data, configs)
+    expected = score_frame(sample_data, {"temperature": 0.6, "precipitation": 0.2, "wind_speed": 0.2},
+                           {"temperature": (15, 22), "precipitation": 1, "wind_speed": 5}, dropna=False)
+    np.testing.assert_array_equal(scores[1], expected['score'].to_numpy())
+    np.testing.assert_array_equal(scores[0], score_frame(sample_data, dropna=False)['score'].to_numpy())
+
+def test_sweep_summary_and_rank_stability(sample_data):
+    """Test the per-configuration summary, and that the reference configuration is perfectly stable."""
+    configs = config_grid(temperature_weight=[0.4, 0.8], wind_speed=[10, 25])
+    summary, frequency = sweep(sample_data, configs, top_k=20, chunk_size=3)
+    default = summary.iloc[0]
+    expected = score_frame(sample_data)['score']
+    assert default['mean'] == pytest.approx(expected.mean())
+    assert default['good_day_share'] == pytest.approx((expected >= 70).mean())
+    assert default['spearman'] == pytest.approx(1.0) and default['top_k_overlap'] == 1.0
+    assert (summary['spearman'].iloc[1:] < 1).all()
+    assert len(frequency) == len(sample_data) - 2
+    assert frequency.sum() == pytest.approx(20)
+
+def test_thousands_of_configurations(sample_data):
+    """Test a sweep over thousands of configurations in bounded chunks."""
+    configs = config_grid(temperature_weight=np.linspace(0.2, 0.6, 10), temperature_low=np.arange(14, 22),
+                          temperature_high=np.arange(24, 29), wind_speed=[5, 10, 15, 20, 25])
+    summary, _ = sweep(sample_data, configs)
+    assert len(summary) == 2000
+
+def test_weights_are_normalized(sample_data):
+    """Test that weights not summing to 1 are rescaled, so scores stay within 0-100."""
+    configs = config_grid(temperature_weight=[0.2, 0.4], precipitation_weight=[0.2, 0.4], wind_speed_weight=[0.3, 0.6])
+    np.testing.assert_allclose(configs[['temperature_weight', 'precipitation_weight', 'wind_speed_weight']].sum(axis=1), 1)
+    # (0.2, 0.2, 0.3) and (0.4, 0.4, 0.6) are the same configuration
+    assert len(configs) == 7
+    scores = sweep_scores(sample_data, pd.DataFrame([config_row({"temperature": 0.6, "precipitation": 0.4,
+                                                                 "wind_speed": 0.6})]))
+    assert np.nanmin(scores) >= 0 and np.nanmax(scores) <= 100
+    summary, _ = sweep(sample_data, configs)
+    assert (summary['min'] >= 0).all() and (summary[['mean', 'p90']].max() <= 100).all()
+    with pytest.raises(ValueError):
+        normalize_weights(pd.DataFrame([config_row({"temperature": 0.5, "precipitation": -0.1, "wind_speed": 0.6})]))
@@ -0,0 +1,68 @@
+import sqlite3
+import pytest
+import numpy as np
+import pandas as pd
+from src.br06_scoring_system.scoring_engine import score_frame, DEFAULT_IDEAL_CONDITIONS
+from src.br06_scoring_system.score_store import ScoreStore, config_version
+
+def make_daily(start, periods, seed):
+    """Creates daily rows of two locations shaped like the daily_data table."""
+    rng = np.random.default_rng(seed)
+    date_rng = pd.date_range(start=start, periods=periods, freq='D')
+    return pd.DataFrame({
+        'location': np.repeat(["Cluj", "Timisoara"], periods),
+        'temperature_2m_mean_C': rng.uniform(-5, 35, 2 * periods),
+        'precipitation_sum_mm': np.where(rng.random(2 * periods) < 0.5, 0.0, rng.exponential(2, 2 * periods)),
+        'wind_speed_10m_max_kmh': rng.uniform(0, 30, 2 * periods)
+    }, index=date_rng.append(date_rng))
+
+@pytest.fixture
+def store():
+    """Fixture for a score store in an in-memory database."""
+    return ScoreStore(sqlite3.connect(':memory:'))
+
+def test_refresh_scores_only_new_and_changed_days(store):
+    """Test a full first refresh, a no-op refresh, and refreshes after new and revised days."""
+    data = make_daily("2020-01-01", 100, 0)
+    data.iloc[3, 1] = np.nan
+    result = store.refresh(data)
+    assert result['scored'] == 200 and result['unchanged'] == 0
+    assert store.refresh(data)['scored'] == 0
+
+    stored = store.scores(result['config_version'])
+    assert len(stored) == 199
+    expected = score_frame(data).rename_axis('date').reset_index().sort_values(['location', 'date'])
+    np.testing.assert_allclose(stored['score'].to_numpy(), expected['score'].to_numpy())
+
+    revised = pd.concat([data, make_daily("2020-04-10", 5, 1)])
+    revised.iloc[10, 1] += 1.0
+    result = store.refresh(revised)
+    assert result['scored'] == 11 and result['unchanged'] == 199 and result['removed'] == 0
+
+def test_refresh_removes_days_gone_from_the_data(store):
+    """Test that days dropped from the source are removed from the refreshed version only."""
+    data = make_daily("2020-01-01", 20, 4)
+    version = store.refresh(data)['config_version']
+    other = store.refresh(data, weights={"temperature": 0.5, "precipitation": 0.25, "wind_speed": 0.25})
+    trimmed = data[data.index >= "2020-01-06"]
+    result = store.refresh(trimmed)
+    assert result['removed'] == 10 and result['scored'] == 0
+    assert store.scores(version).index.min() == pd.Timestamp("2020-01-06")
+    assert len(store.scores(other['config_version'])) == 40
+
+def test_config_change_rescores_only_its_version(store):
+    """Test that a new configuration is scored in full as its own version, leaving the old one intact."""
+    data = make_daily("2020-01-01", 50, 2)
+    default = store.refresh(data)
+    warmer = store.refresh(data, ideal_conditions={**DEFAULT_IDEAL_CONDITIONS, "temperature": (20, 28)})
+    assert warmer['config_version'] != default['config_version'] and warmer['scored'] == 100
+    assert store.refresh(data)['scored'] == 0
+    assert store.versions()['days'].to_dict() == {default['config_version']: 100, warmer['config_version']: 100}
+    assert config_version() == default['config_version']
+
+def test_scores_filters(store):
+    """Test reading one location and a date range."""
+    version = store.refresh(make_daily("2020-01-01", 30, 3))['config_version']
+    scores = store.scores(version, "2020-01-10", "2020-01-20", ["Cluj"])
+    assert len(scores) == 10 and (scores['location'] == "Cluj").all()
+    assert scores.index.min() == pd.Timestamp("2020-01-10")
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br06_scoring_system.scoring_engine import calculate_score, calculate_scores, score_frame
+
+def reference_score(temperature, precipitation, wind_speed):
+    """The original per-day formula of 06-scoring_system."""
+    if 18 <= temperature <= 25:
+        temp_score = 1
+    else:
+        temp_score = max(0, min(1, 1 - abs(temperature - 18) / (25 - 18)))
+    precip_score = 1 if precipitation <= 0 else 0
+    wind_score = max(0, min(1, 1 - abs(wind_speed - 10) / 10))
+    score = (temp_score * 0.4 + precip_score * 0.3 + wind_score * 0.3)
+    return score * 100
+
+@pytest.fixture
+def sample_data():
+    """Fixture for daily data of two locations, with boundary values and missing values."""
+    rng = np.random.default_rng(5)
+    n = 2000
+    temperature = rng.uniform(-10, 40, n)
+    temperature[:6] = [18, 25, 11, 32, 17.999, 25.001]
+    precipitation = np.where(rng.random(n) < 0.5, 0.0, rng.exponential(2, n))
+    wind_speed = rng.uniform(0, 30, n)
+    wind_speed[:3] = [0, 10, 20]
+    temperature[10], precipitation[11], wind_speed[12] = np.nan, np.nan, np.nan
+    return pd.DataFrame({
+        'location': np.repeat(["Timisoara", "Cluj"], n // 2),
+        'temperature_2m_mean_C': temperature,
+        'precipitation_sum_mm': precipitation,
+        'wind_speed_10m_max_kmh': wind_speed
+    }, index=pd.date_range("2020-01-01", periods=n, freq='D'))
+
+def test_matches_original_formula(sample_data):
+    """Test that the vectorized scores are identical to the original scalar formula."""
+    scores = score_frame(sample_data)
+    valid = sample_data.dropna()
+    expected = [reference_score(t, p, w) for t, p, w in valid[['temperature_2m_mean_C', 'precipitation_sum_mm',
+                                                                'wind_speed_10m_max_kmh']].itertuples(index=False)]
+    np.testing.assert_array_equal(scores['score'].to_numpy(), expected)
+    assert calculate_score(20, 0, 10) == reference_score(20, 0, 10) == 100
+
+def test_missing_values_are_masked(sample_data):
+    """Test that rows with a missing input are dropped, or NaN throughout when kept."""
+    assert len(score_frame(sample_data)) == len(sample_data) - 3
+    kept = score_frame(sample_data, dropna=False)
+    assert kept.iloc[10:13].isna().drop(columns='location').all().all()
+    assert list(kept.columns) == ['location', 'temperature_score', 'precipitation_score', 'wind_score', 'score']
+
+def test_broadcast_ideal_conditions():
+    """Test per-location ideal conditions given as arrays."""
+    scores = calculate_scores([20, 20], [0, 0], [10, 10],
+                              ideal_conditions={"temperature": (np.array([18, 21]), np.array([25, 28])),
+                                                "precipitation": 0, "wind_speed": np.array([10, 5])})
+    assert scores['temperature_score'].tolist() == [1.0, pytest.approx(1 - 1 / 7)]
+    assert scores['wind_score'].tolist() == [1.0, 0.0]
+
+def test_scores_a_million_rows():
+    """Test that a million rows are scored in one call, within the 0-100 range."""
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    scores = calculate_scores(rng.uniform(-10, 40, n), rng.exponential(1, n), rng.uniform(0, 30, n))
+    assert scores['score'].shape == (n,)
+    assert scores['score'].min() >= 0 and scores['score'].max() <= 100
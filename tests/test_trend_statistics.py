@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br03_data_analysis.trend_statistics import mann_kendall, sens_slope, trend_table
+from src.br03_data_analysis.analyze_data import WeatherAnalyzer
+
+@pytest.fixture
+def sample_daily_data():
+    """
+    Fixture for creating 20 years of daily data with a warming trend in the maximum temperature.
+    """
+    rng = np.random.default_rng(3)
+    date_rng = pd.date_range(start="2000-01-01", end="2019-12-31", freq='D')
+    years = date_rng.year - 2000
+    data = {
+        'temperature_2m_max_C': 15 + 0.5 * years + rng.normal(0, 1, len(date_rng)),
+        'precipitation_sum_mm': rng.exponential(2, len(date_rng)),
+    }
+    return pd.DataFrame(data, index=date_rng)
+
+def naive_mann_kendall(series):
+    """Reference Mann-Kendall S statistic and tie-corrected variance for one series."""
+    series = series[~np.isnan(series)]
+    n = len(series)
+    s = sum(np.sign(series[j] - series[i]) for i in range(n) for j in range(i + 1, n))
+    _, counts = np.unique(series, return_counts=True)
+    var_s = (n * (n - 1) * (2 * n + 5) - np.sum(counts * (counts - 1) * (2 * counts + 5))) / 18
+    return s, var_s
+
+def test_mann_kendall_matches_reference():
+    """Test the vectorized statistic against a per-series loop, including ties and missing years."""
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 6, size=(30, 12)).astype(float)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    result = mann_kendall(values)
+    for row, series in enumerate(values):
+        s, var_s = naive_mann_kendall(series)
+        assert result['s'][row] == s
+        assert result['var_s'][row] == pytest.approx(var_s)
+
+def test_sens_slope_linear_series():
+    """Test that Sen's slope recovers the slope of a line and ignores a single outlier."""
+    values = np.array([[2.0 * x + 1 for x in range(10)]])
+    values[0, 4] = 100.0
+    assert sens_slope(values)[0] == pytest.approx(2.0)
+
+def test_trend_table_detects_trend(sample_daily_data):
+    """Test that the warming variable is flagged in every season and precipitation mostly is not."""
+    table = trend_table(sample_daily_data, ['temperature_2m_max_C', 'precipitation_sum_mm'], period='season')
+    temperature = table[table['variable'] == 'temperature_2m_max_C']
+    assert len(table) == 8
+    assert (temperature['trend'] == 'increasing').all()
+    assert temperature['sen_slope'].between(0.4, 0.6).all()
+    assert (temperature['n_years'] == 20).all()
+
+def test_weather_analyzer_trend_statistics(sample_daily_data):
+    """Test the WeatherAnalyzer entry point for monthly series."""
+    analyzer = WeatherAnalyzer(daily_data=sample_daily_data)
+    table = analyzer.trend_statistics(period='month')
+    assert len(table) == 2 * 12
+    assert {'p_value', 'sen_slope', 'trend'} <= set(table.columns)
@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.br06_scoring_system.window_scoring import rolling_mean, rolling_min, window_scores, best_windows
+
+@pytest.fixture
+def sample_scores():
+    """Fixture for two years of daily scores of two locations, with a missing day."""
+    rng = np.random.default_rng(10)
+    date_rng = pd.date_range(start="2020-01-01", periods=731, freq='D')
+    frames = [pd.DataFrame({'location': location, 'score': rng.uniform(0, 100, len(date_rng))}, index=date_rng)
+              for location in ["Cluj", "Timisoara"]]
+    scores = pd.concat(frames)
+    return scores.drop(scores.index[100])
+
+def test_rolling_aggregates_match_pandas():
+    """Test the O(1) rolling mean and minimum against pandas for several window lengths, with gaps."""
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 100, (3, 200))
+    values[1, 50] = np.nan
+    for window in [1, 2, 3, 7, 30, 200]:
+        expected = pd.DataFrame(values.T)
+        np.testing.assert_allclose(rolling_mean(values, window), expected.rolling(window).mean().to_numpy().T[:, window - 1:])
+        np.testing.assert_array_equal(rolling_min(values, window), expected.rolling(window).min().to_numpy().T[:, window - 1:])
+
+def test_window_scores(sample_scores):
+    """Test that windows span consecutive days and skip the missing day."""
+    windows = window_scores(sample_scores, window=3)
+    cluj = windows[windows['location'] == "Cluj"]
+    assert len(cluj) == 729 - 3
+    assert ((cluj['end'] - cluj['start']).dt.days == 2).all()
+    first = sample_scores[sample_scores['location'] == "Cluj"]['score'].iloc[:3]
+    assert cluj.iloc[0]['mean_score'] == pytest.approx(first.mean())
+    assert cluj.iloc[0]['min_score'] == first.min()
+
+def test_best_windows_per_month_and_season(sample_scores):
+    """Test the best window of every month and location against a brute-force search."""
+    windows = window_scores(sample_scores, window=3)
+    monthly = best_windows(windows, by='month')
+    assert len(monthly) == 2 * 24
+    july = windows[(windows['location'] == "Timisoara") & (windows['start'].dt.strftime('%Y-%m') == "2021-07")]
+    best = monthly[(monthly['location'] == "Timisoara") & (monthly['period'] == "2021-07")].iloc[0]
+    assert best['mean_score'] == july['mean_score'].max()
+
+    seasons = best_windows(windows, by='season', top=2, rank_by='min_score')
+    assert set(seasons['period']) == {'2020-Winter', '2020-Spring', '2020-Summer', '2020-Autumn', '2021-Winter',
+                                      '2021-Spring', '2021-Summer', '2021-Autumn'}
+    december = seasons[seasons['start'].dt.month == 12]
+    assert december['period'].str.endswith('Autumn').all()
+    assert (seasons.groupby(['location', 'period']).size() == 2).all()
+    with pytest.raises(ValueError):
+        best_windows(windows, by='week')
+
+def test_window_scores_of_empty_input():
+    """Test that empty scores give an empty frame with the usual columns."""
+    empty = pd.DataFrame({'location': pd.Series(dtype=object), 'score': pd.Series(dtype=float)},
+                         index=pd.DatetimeIndex([]))
+    windows = window_scores(empty, window=3)
+    assert windows.empty and list(windows.columns) == ['location', 'start', 'end', 'mean_score', 'min_score']